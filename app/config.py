@@ -1,4 +1,111 @@
+import os
+
 MARLINS_TEAM_ID = 146
 MLB_SPORT_ID = 1
-BASE_URL = "https://statsapi.mlb.com/api/v1"
-LIVE_FEED_BASE_URL = "https://statsapi.mlb.com/api/v1.1" 
\ No newline at end of file
+# Upstream roots; override to point at a stand-in such as loadtest/fake_statsapi.py
+BASE_URL = os.environ.get("MLB_API_BASE_URL", "https://statsapi.mlb.com/api/v1")
+LIVE_FEED_BASE_URL = os.environ.get("MLB_LIVE_FEED_BASE_URL", "https://statsapi.mlb.com/api/v1.1")
+
+# Shared upstream HTTP client (connection pooling / keep-alive)
+HTTP2_ENABLED = True
+HTTP_TIMEOUT_SECONDS = 10.0
+HTTP_CONNECT_TIMEOUT_SECONDS = 5.0
+HTTP_MAX_CONNECTIONS = 100
+HTTP_MAX_KEEPALIVE_CONNECTIONS = 20
+HTTP_KEEPALIVE_EXPIRY_SECONDS = 30.0
+
+# Maximum concurrent per-game detail requests while formatting a schedule
+DETAIL_FETCH_CONCURRENCY = 16
+
+# Affiliate lists change about once a season
+AFFILIATES_CACHE_TTL_SECONDS = 24 * 60 * 60
+AFFILIATES_REFRESH_AFTER_SECONDS = 6 * 60 * 60
+
+# Upstream response cache: TTL by the game's abstractGameState, LRU-bounded by payload size
+GAME_STATE_CACHE_TTL_SECONDS = {
+    "Final": 30 * 24 * 60 * 60,
+    "Preview": 5 * 60,
+    "Live": 5,
+}
+RESPONSE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# Rendered /schedule responses, keyed by date; Cache-Control by the day's most volatile game
+SCHEDULE_RESPONSE_CACHE_MAX_BYTES = 16 * 1024 * 1024
+SCHEDULE_CACHE_CONTROL = {
+    "Final": "public, max-age=86400",
+    "Preview": "public, max-age=60",
+    "Live": "public, max-age=5",
+}
+
+# Build live-game details from the v1.1 feed alone; boxscore/plays endpoints only as fallbacks
+LIVE_FEED_ONLY = True
+
+# Refresh stored live feeds with feed/live/diffPatch instead of re-downloading them
+LIVE_FEED_DIFF_PATCH = True
+LIVE_FEED_STORE_MAX_GAMES = 64
+
+# SQLite file keeping completed-game results across restarts ("" keeps them in memory only)
+FINAL_STORE_PATH = os.environ.get("FINAL_STORE_PATH", "final_games.sqlite3")
+
+# backfill_season.py: boxscore requests in flight, upstream request rate, and archive directory
+BACKFILL_CONCURRENCY = 8
+BACKFILL_RATE_PER_SECOND = 10.0
+ARCHIVE_DIR = os.environ.get("ARCHIVE_DIR", "archive")
+
+# /standings: how often a season's results are refreshed, and how many (season, orgs) sets are kept
+STANDINGS_REFRESH_SECONDS = 60.0
+STANDINGS_MAX_ENTRIES = 32
+# The first season of organized professional baseball the Stats API covers
+STANDINGS_FIRST_SEASON = 1876
+
+# Background poller serving today's /schedule from an in-memory snapshot
+LIVE_POLLER_ENABLED = os.environ.get("LIVE_POLLER_ENABLED", "1") != "0"
+LIVE_POLL_INTERVAL_SECONDS = 5.0
+IDLE_POLL_INTERVAL_SECONDS = 60.0
+SNAPSHOT_GRACE_SECONDS = 10.0
+
+# /schedule/stream (Server-Sent Events) fan-out
+STREAM_QUEUE_SIZE = 64
+STREAM_HEARTBEAT_SECONDS = 15.0
+
+# /schedule/range: longest accepted range, and days covered by each upstream schedule request
+RANGE_MAX_DAYS = 366
+RANGE_CHUNK_DAYS = 31
+
+# Live feeds keep only the fields the formatter reads ("full" keeps the whole document)
+LIVE_FEED_PARSE_MODE = "pruned"
+LIVE_FEED_FIELDS = [
+    "metaData.timeStamp",
+    "gameData.status",
+    "liveData.linescore",
+    "liveData.plays.currentPlay",
+    "liveData.plays.allPlays",
+    "liveData.boxscore.info",
+    "liveData.boxscore.teams.*.players",
+    "liveData.boxscore.teams.*.pitchers",
+    "liveData.boxscore.teams.*.batters",
+    "liveData.boxscore.teams.*.teamStats",
+    "liveData.decisions",
+]
+
+# Logging: level for the "app" loggers, and DEBUG sampling (1 = keep every record)
+LOG_LEVEL = "INFO"
+LOG_DEBUG_SAMPLE_EVERY = 10
+
+# Metrics: upstream/formatter latency histogram bounds (seconds) and event-loop lag sampling
+METRICS_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+EVENT_LOOP_LAG_INTERVAL_SECONDS = 0.5
+
+# Upstream resilience: bounded retries with jittered backoff, per-endpoint circuit breakers,
+# and a deadline for the upstream work behind one /schedule request
+UPSTREAM_RETRY_ATTEMPTS = 3
+UPSTREAM_RETRY_BASE_SECONDS = 0.1
+UPSTREAM_RETRY_MAX_SECONDS = 1.0
+CIRCUIT_FAILURE_THRESHOLD = 5
+CIRCUIT_RESET_SECONDS = 30.0
+SCHEDULE_DEADLINE_SECONDS = 5.0
+
+# Expired responses stay available this long, served (marked stale) while the upstream is failing
+STALE_IF_ERROR_SECONDS = 10 * 60
+AFFILIATES_STALE_IF_ERROR_SECONDS = 7 * 24 * 60 * 60
+SCHEDULE_STALE_CACHE_CONTROL = "no-cache"
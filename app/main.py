@@ -1,11 +1,44 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from app.routes import schedule
+from app.config import FINAL_STORE_PATH, LIVE_POLLER_ENABLED
+from app.routes import schedule, standings, metrics
+from app.services.final_store import final_store
+from app.services.http_client import create_http_client, set_http_client, close_http_client
+from app.services.metrics import loop_lag_monitor
+from app.services.poller import live_poller
+from app.utils.logging_utils import configure_logging, shutdown_logging
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Log records are written off the event loop
+    configure_logging()
+    # One pooled upstream client for the lifetime of the app
+    set_http_client(create_http_client())
+    # Finished games from earlier runs are served without upstream calls
+    if FINAL_STORE_PATH:
+        final_store.open(FINAL_STORE_PATH)
+    # Sample event loop lag for /metrics
+    loop_lag_monitor.start()
+    # Keep today's schedule warm in the background
+    if LIVE_POLLER_ENABLED:
+        live_poller.start()
+    try:
+        yield
+    finally:
+        await live_poller.stop()
+        await loop_lag_monitor.stop()
+        await close_http_client()
+        final_store.close()
+        shutdown_logging()
 
 app = FastAPI(
     title="Marlins Affiliate Schedule API",
     description="An internal API to fetch daily schedules and results for the Marlins and their minor league affiliates.",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Register route(s)
-app.include_router(schedule.router) 
\ No newline at end of file
+app.include_router(schedule.router)
+app.include_router(standings.router)
+app.include_router(metrics.router) 
@@ -41,4 +41,11 @@ class ScheduleResponse(RootModel):
     root: Dict[int, Union[TeamGame, Dict]] = Field(
         ..., 
         description="Schedule data keyed by team ID. Empty dict {} means no game for that team."
-    ) 
\ No newline at end of file
+    )
+
+class MultiOrgScheduleResponse(RootModel):
+    """Response model for the schedule endpoint when several organizations are requested."""
+    root: Dict[int, Dict[int, Union[TeamGame, Dict]]] = Field(
+        ...,
+        description="Schedule data keyed by parent club ID, then by affiliate team ID."
+    )
@@ -0,0 +1,10 @@
+from fastapi import APIRouter
+from fastapi.responses import Response
+from app.services.metrics import registry, CONTENT_TYPE
+
+router = APIRouter()
+
+@router.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    # Prometheus text format: upstream latency, formatter timing, cache efficiency, loop lag
+    return Response(content=registry.render(), media_type=CONTENT_TYPE)
@@ -1,33 +1,246 @@
-from fastapi import APIRouter, Query, HTTPException
-from typing import Optional
+import asyncio
+import json
+import httpx
+from datetime import date as date_type, timedelta
+from fastapi import APIRouter, Query, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
+from typing import Any, Dict, Optional, Tuple, Union
+from app.config import MARLINS_TEAM_ID, STREAM_HEARTBEAT_SECONDS, RANGE_MAX_DAYS, SCHEDULE_DEADLINE_SECONDS, SCHEDULE_STALE_CACHE_CONTROL
 from app.utils.date_utils import parse_date
-from app.services.mlb_api import get_affiliates, get_schedule_for_teams
-from app.services.formatter import format_schedule_with_details
-from app.models.game_response import ScheduleResponse
+from app.services.mlb_api import get_affiliates_for_orgs, get_schedule_for_teams, schedule_cache_state
+from app.services.formatter import format_schedule_with_details, format_org_schedules
+from app.services.resilience import UpstreamUnavailable, request_scope, request_is_incomplete, request_is_stale
+from app.services.schedule_cache import (
+    RenderedSchedule,
+    render_schedule,
+    get_rendered,
+    get_stale_rendered,
+    store_rendered,
+    etag_matches,
+    schedule_key,
+)
+from app.services.poller import live_poller
+from app.services.schedule_range import iter_schedule_range
+from app.services.export import EXPORT_MEDIA_TYPES, available_formats, open_export
+from app.utils.json_utils import dumps
+from app.models.game_response import ScheduleResponse, MultiOrgScheduleResponse
 
 router = APIRouter()
 
-@router.get("/schedule", response_model=ScheduleResponse)
-async def get_schedule(date: Optional[str] = Query(None, description="Date in YYYY-MM-DD format")):
+def parse_org_ids(org: Optional[str]) -> Tuple[int, ...]:
+    """
+    Parse a comma-separated list of parent club ids (defaults to the Marlins).
+    """
+    if not org:
+        return (MARLINS_TEAM_ID,)
     try:
-        parsed_date = parse_date(date)
-        date_str = parsed_date.isoformat()
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
+        org_ids = [int(part) for part in org.split(",") if part.strip()]
+    except ValueError:
+        raise ValueError("Invalid org. Expected comma-separated MLB team IDs.")
+    if not org_ids:
+        raise ValueError("Invalid org. Expected comma-separated MLB team IDs.")
+    # De-duplicate, keeping the requested order
+    return tuple(dict.fromkeys(org_ids))
 
-    # Step 1: Get affiliates
-    affiliates = await get_affiliates()
+async def build_schedule(parsed_date: date_type, org_ids: Tuple[int, ...]) -> Optional[RenderedSchedule]:
+    """
+    Fetch and render a schedule from the upstream (None when the orgs have no affiliates).
+    The render is marked stale if any upstream call fell back to expired data, and
+    incomplete if any per-game detail call failed.
+    """
+    date_str = parsed_date.isoformat()
+
+    # Step 1: Get affiliates for the requested date's season (cached, one batched call for new orgs)
+    affiliates_by_org = await get_affiliates_for_orgs(list(org_ids), parsed_date.year)
+    affiliates = [team for teams in affiliates_by_org.values() for team in teams]
 
     if not affiliates:
-        return {"message": "No affiliates found."}
+        return None
 
-    # Step 2: Extract team and sport IDs
-    team_ids = [team["id"] for team in affiliates]
+    # Step 2: Extract team and sport IDs across every requested org
+    team_ids = list(dict.fromkeys(team["id"] for team in affiliates))
     sport_ids = list(set(team["sport"]["id"] for team in affiliates))
 
-    # Step 3: Fetch schedule
+    # Step 3: Fetch one combined schedule
     schedule_data = await get_schedule_for_teams(team_ids, sport_ids, date_str)
 
     # Step 4: Format the response with detailed game data
-    formatted = await format_schedule_with_details(affiliates, schedule_data)
-    return formatted 
\ No newline at end of file
+    state = schedule_cache_state(schedule_data)
+    if len(org_ids) == 1:
+        formatted = await format_schedule_with_details(affiliates, schedule_data)
+        return render_schedule(formatted, state, stale=request_is_stale(), incomplete=request_is_incomplete())
+    else:
+        formatted = await format_org_schedules(affiliates_by_org, schedule_data)
+        return render_schedule(formatted, state, MultiOrgScheduleResponse, stale=request_is_stale(), incomplete=request_is_incomplete())
+
+@router.get("/schedule", response_model=Union[ScheduleResponse, MultiOrgScheduleResponse])
+async def get_schedule(
+    request: Request,
+    date: Optional[str] = Query(None, description="Date in YYYY-MM-DD format"),
+    org: Optional[str] = Query(None, description="Parent MLB team ID(s), comma-separated. Several IDs return one schedule per org."),
+):
+    try:
+        parsed_date = parse_date(date)
+        date_str = parsed_date.isoformat()
+        org_ids = parse_org_ids(org)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    cache_key = schedule_key(date_str, org_ids)
+
+    # Today's default schedule comes from the background poller's snapshot when it is current
+    snapshot = live_poller.get_snapshot(date_str) if org_ids == (MARLINS_TEAM_ID,) else None
+    rendered = snapshot.rendered if snapshot is not None else get_rendered(cache_key)
+    if rendered is None:
+        try:
+            # Every upstream call behind this request shares one deadline
+            with request_scope(SCHEDULE_DEADLINE_SECONDS):
+                rendered = await build_schedule(parsed_date, org_ids)
+        except (httpx.HTTPError, UpstreamUnavailable):
+            # The upstream is failing: fall back to the last schedule we rendered, marked stale
+            rendered = get_stale_rendered(cache_key)
+            if rendered is None:
+                raise HTTPException(status_code=503, detail="MLB Stats API is unavailable.")
+        if rendered is None:
+            raise HTTPException(status_code=404, detail="No affiliates found.")
+        store_rendered(cache_key, rendered)
+
+    # Step 5: Answer conditional requests without a body
+    if etag_matches(request.headers.get("if-none-match"), rendered.etag):
+        return Response(status_code=304, headers=rendered.headers)
+    return Response(rendered.body, media_type="application/json", headers=rendered.headers)
+
+@router.get("/schedule/range")
+async def get_schedule_range(
+    start: str = Query(..., description="First date in YYYY-MM-DD format"),
+    end: str = Query(..., description="Last date (inclusive) in YYYY-MM-DD format"),
+):
+    """
+    Schedules for every date in a range, streamed day by day as one JSON object keyed by date.
+    The first window is fetched before the response starts, so an unavailable upstream is a 503.
+    If a later window fails, the object ends with an "error" member naming the first missing
+    date, and any days served from expired renders are listed in a trailing "stale" member.
+    """
+    try:
+        start_date = parse_date(start)
+        end_date = parse_date(end)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if end_date < start_date:
+        raise HTTPException(status_code=400, detail="end must not be before start.")
+    if (end_date - start_date).days + 1 > RANGE_MAX_DAYS:
+        raise HTTPException(status_code=400, detail=f"Range is limited to {RANGE_MAX_DAYS} days.")
+
+    windows = iter_schedule_range(start_date, end_date)
+    try:
+        first = await windows.__anext__()
+    except (httpx.HTTPError, UpstreamUnavailable):
+        await windows.aclose()
+        raise HTTPException(status_code=503, detail="MLB Stats API is unavailable.")
+
+    async def body():
+        stale = []
+        separator = "{"
+        rendered_days, expected = first, start_date
+        try:
+            while True:
+                for date_str, rendered in rendered_days:
+                    yield f'{separator}"{date_str}":'.encode() + rendered.body
+                    separator = ","
+                    if rendered.stale:
+                        stale.append(date_str)
+                expected = date_type.fromisoformat(date_str) + timedelta(days=1)
+                rendered_days = await windows.__anext__()
+        except StopAsyncIteration:
+            pass
+        except (httpx.HTTPError, UpstreamUnavailable):
+            # The status line is long gone; say where the data stops instead
+            error = {"detail": "MLB Stats API is unavailable.", "missing_from": expected.isoformat()}
+            yield f'{separator}"error":'.encode() + dumps(error)
+            separator = ","
+        if stale:
+            yield f'{separator}"stale":'.encode() + dumps(stale)
+        yield b"}"
+
+    stale = any(rendered.stale for _, rendered in first)
+    headers = {"Cache-Control": SCHEDULE_STALE_CACHE_CONTROL, "Warning": '110 - "Response is Stale"'} if stale else {}
+    return StreamingResponse(body(), media_type="application/json", headers=headers)
+
+@router.get("/schedule/export")
+async def export_schedule(
+    start: str = Query(..., description="First date in YYYY-MM-DD format"),
+    end: str = Query(..., description="Last date (inclusive) in YYYY-MM-DD format"),
+    org: Optional[str] = Query(None, description="Parent MLB team ID(s), comma-separated"),
+    format: str = Query("ndjson", description="ndjson, or arrow/parquet when pyarrow is installed"),
+):
+    """
+    Every affiliate game in a date range as flat rows (one per affiliate team and game),
+    streamed one schedule window at a time. The first window is fetched before the response
+    starts, so an unavailable upstream is a 503. If a later window fails, an NDJSON body ends
+    with an error line; Arrow and Parquet bodies are broken off.
+    """
+    try:
+        start_date = parse_date(start)
+        end_date = parse_date(end)
+        org_ids = parse_org_ids(org)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if end_date < start_date:
+        raise HTTPException(status_code=400, detail="end must not be before start.")
+    if (end_date - start_date).days + 1 > RANGE_MAX_DAYS:
+        raise HTTPException(status_code=400, detail=f"Range is limited to {RANGE_MAX_DAYS} days.")
+    if format not in available_formats():
+        raise HTTPException(status_code=400, detail=f"Invalid format. Expected one of: {', '.join(available_formats())}.")
+
+    extension = {"ndjson": "ndjson", "arrow": "arrows", "parquet": "parquet"}[format]
+    filename = f"affiliate-games-{start_date.isoformat()}-{end_date.isoformat()}.{extension}"
+    try:
+        chunks = await open_export(start_date, end_date, org_ids, format)
+    except (httpx.HTTPError, UpstreamUnavailable):
+        raise HTTPException(status_code=503, detail="MLB Stats API is unavailable.")
+    return StreamingResponse(
+        chunks,
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+def format_sse(event: Dict[str, Any]) -> str:
+    return f"event: {event['event']}\ndata: {json.dumps(event['data'], separators=(',', ':'))}\n\n"
+
+@router.get("/schedule/stream")
+async def stream_schedule(request: Request):
+    """
+    Server-Sent Events stream of today's affiliate games: a full snapshot first,
+    then per-team deltas (score, inning, outs, runners, pitcher/batter) as they change.
+    All subscribers share the background poller, so viewers add no upstream load.
+    """
+    broadcaster = live_poller.broadcaster
+    subscriber = broadcaster.subscribe()
+
+    async def events():
+        try:
+            snapshot = live_poller.snapshot
+            if snapshot is not None:
+                yield format_sse({"event": "snapshot", "data": snapshot.formatted})
+            while True:
+                try:
+                    event = await asyncio.wait_for(subscriber.queue.get(), STREAM_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        break
+                    # Comment line keeps proxies from closing an idle stream
+                    yield ": keep-alive\n\n"
+                    continue
+                if event is None:
+                    # Dropped as a slow consumer; the client should reconnect and resync
+                    yield "event: overflow\ndata: {}\n\n"
+                    break
+                yield format_sse(event)
+        finally:
+            broadcaster.unsubscribe(subscriber)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,35 @@
+import httpx
+from datetime import date
+from fastapi import APIRouter, Query, HTTPException, Response
+from typing import Optional
+from app.config import SCHEDULE_STALE_CACHE_CONTROL, STANDINGS_FIRST_SEASON
+from app.routes.schedule import parse_org_ids
+from app.services.resilience import UpstreamUnavailable
+from app.services.standings import get_standings
+
+router = APIRouter()
+
+@router.get("/standings")
+async def standings(
+    season: Optional[int] = Query(
+        None, ge=STANDINGS_FIRST_SEASON, le=date.max.year, description="Season year (defaults to the current season)"
+    ),
+    org: Optional[str] = Query(None, description="Parent MLB team ID(s), comma-separated"),
+):
+    """
+    Season records for every affiliate of the requested orgs: wins, losses, run differential,
+    home/away splits, last 10 and current streak, plus level-wide and org-wide totals.
+    """
+    try:
+        org_ids = parse_org_ids(org)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if season is None:
+        season = date.today().year
+
+    try:
+        body, stale = await get_standings(season, org_ids)
+    except (httpx.HTTPError, UpstreamUnavailable):
+        raise HTTPException(status_code=503, detail="MLB Stats API is unavailable.")
+    headers = {"Cache-Control": SCHEDULE_STALE_CACHE_CONTROL, "Warning": '110 - "Response is Stale"'} if stale else {}
+    return Response(body, media_type="application/json", headers=headers)
@@ -0,0 +1,117 @@
+import json
+import os
+from typing import Any, Dict, List, Optional
+import numpy as np
+from app.config import ARCHIVE_DIR
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # optional Parquet support
+    pyarrow = None
+
+# One row per (affiliate team, game); column name -> numpy dtype ("U" sizes to the longest value)
+ARCHIVE_COLUMNS = {
+    "game_pk": np.int64,
+    "date": "datetime64[D]",
+    "org_id": np.int32,
+    "team_id": np.int32,
+    "team_name": "U",
+    "level": "U",
+    "opponent_id": np.int32,
+    "opponent_name": "U",
+    "is_home": np.bool_,
+    "game_state": "U",
+    "detailed_state": "U",
+    "team_score": np.int16,
+    "opponent_score": np.int16,
+    "winning_pitcher": "U",
+    "losing_pitcher": "U",
+    "save_pitcher": "U",
+}
+
+def archive_row(
+    org_id: int,
+    game: Dict[str, Any],
+    team_info: Dict[int, Dict[str, str]],
+    game_state: str,
+    completed: Dict[str, Any],
+) -> Dict[str, Any]:
+    """
+    Flatten one affiliate game (and its CompletedDetails, if any) into an archive row.
+    """
+    home, away = game["teams"]["home"], game["teams"]["away"]
+    is_home = home["team"]["id"] in team_info
+    team, opponent = (home, away) if is_home else (away, home)
+    return {
+        "game_pk": game["gamePk"],
+        "date": game.get("officialDate") or game["gameDate"][:10],
+        "org_id": org_id,
+        "team_id": team["team"]["id"],
+        "team_name": team_info[team["team"]["id"]]["team_name"],
+        "level": team_info[team["team"]["id"]]["level"],
+        "opponent_id": opponent["team"]["id"],
+        "opponent_name": opponent["team"]["name"],
+        "is_home": is_home,
+        "game_state": game_state,
+        "detailed_state": game["status"].get("detailedState", ""),
+        "team_score": team.get("score", 0),
+        "opponent_score": opponent.get("score", 0),
+        "winning_pitcher": completed.get("winning_pitcher", "N/A"),
+        "losing_pitcher": completed.get("losing_pitcher", "N/A"),
+        "save_pitcher": completed.get("save_pitcher") or "N/A",
+    }
+
+def rows_to_columns(rows: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+    """
+    Transpose rows into one typed array per column, sorted by date, org and team.
+    """
+    columns = {name: np.array([row[name] for row in rows], dtype=dtype) for name, dtype in ARCHIVE_COLUMNS.items()}
+    if rows:
+        order = np.lexsort((columns["game_pk"], columns["team_id"], columns["org_id"], columns["date"]))
+        columns = {name: values[order] for name, values in columns.items()}
+    return columns
+
+def write_archive(path: str, rows: List[Dict[str, Any]], **meta: Any) -> Dict[str, np.ndarray]:
+    """
+    Write rows as a compressed .npz (one array per column plus a JSON "_meta" entry), or as
+    Parquet when `path` ends in .parquet and pyarrow is installed.
+    """
+    columns = rows_to_columns(rows)
+    if path.endswith(".parquet"):
+        if pyarrow is None:
+            raise RuntimeError("Writing Parquet archives requires pyarrow (pip install pyarrow)")
+        table = pyarrow.table(columns).replace_schema_metadata({"archive": json.dumps(meta)})
+        pyarrow.parquet.write_table(table, path, compression="zstd")
+    else:
+        with open(path, "wb") as f:
+            np.savez_compressed(f, _meta=np.array(json.dumps(meta)), **columns)
+    return columns
+
+def load_archive(path: str) -> Dict[str, Any]:
+    """
+    Read an archive back as {"columns": {name: array}, "meta": {...}}.
+    """
+    if path.endswith(".parquet"):
+        if pyarrow is None:
+            raise RuntimeError("Reading Parquet archives requires pyarrow (pip install pyarrow)")
+        table = pyarrow.parquet.read_table(path)
+        meta = json.loads((table.schema.metadata or {}).get(b"archive", b"{}"))
+        columns = {name: table.column(name).to_numpy() for name in ARCHIVE_COLUMNS}
+        columns["date"] = columns["date"].astype("datetime64[D]")
+        return {"columns": columns, "meta": meta}
+    with np.load(path, allow_pickle=False) as data:
+        return {
+            "columns": {name: data[name] for name in ARCHIVE_COLUMNS},
+            "meta": json.loads(str(data["_meta"])),
+        }
+
+def season_archive_path(season: int, directory: str = ARCHIVE_DIR) -> Optional[str]:
+    """
+    The archive backfill_season.py writes for `season` by default, if there is one.
+    """
+    for extension in (".npz", ".parquet") if pyarrow is not None else (".npz",):
+        path = os.path.join(directory, f"{season}{extension}")
+        if os.path.exists(path):
+            return path
+    return None
@@ -0,0 +1,113 @@
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+BASES = ("1B", "2B", "3B")
+
+def _runner_key(runner: Dict[str, Any]) -> Tuple[Any, str]:
+    person = runner.get("details", {}).get("runner", {})
+    name = person.get("fullName", "")
+    return person.get("id", name), name
+
+def half_inning(play: Dict[str, Any]) -> Tuple[Any, Any]:
+    about = play.get("about", {})
+    return about.get("inning"), about.get("halfInning")
+
+def apply_play(bases: Dict[str, str], play: Dict[str, Any]) -> None:
+    """
+    Move runners on `bases` (base -> runner name) through one play's runners[].movement.
+
+    A runner can appear several times in one play (a steal, then the batted ball), so each
+    runner's first start and last end are taken, every starting base is vacated, and then
+    the final bases are filled. This keeps the result independent of the order in which
+    the API lists the runners.
+    """
+    moves: Dict[Any, List[Any]] = {}
+    for runner in play.get("runners", []):
+        movement = runner.get("movement", {})
+        key, name = _runner_key(runner)
+        move = moves.get(key)
+        if move is None:
+            move = moves[key] = [movement.get("start"), None, name]
+        move[1] = None if movement.get("isOut") else movement.get("end")
+
+    for start, _, _ in moves.values():
+        if start in BASES:
+            bases.pop(start, None)
+    for _, end, name in moves.values():
+        if end in BASES:
+            bases[end] = name
+
+    if play.get("about", {}).get("isComplete", True) and play.get("count", {}).get("outs", 0) >= 3:
+        bases.clear()
+
+class GameBaseState:
+    """
+    Base occupancy for a game's current half-inning after its completed plays.
+    `next_index` is the position in allPlays to resume from and `last_at_bat` the
+    atBatIndex found just before it, used to check the play list still lines up.
+    """
+    __slots__ = ("half_inning", "bases", "next_index", "last_at_bat")
+
+    def __init__(self):
+        self.half_inning: Optional[Tuple[Any, Any]] = None
+        self.bases: Dict[str, str] = {}
+        self.next_index = 0
+        self.last_at_bat: Optional[int] = None
+
+    def lines_up(self, plays: List[Dict[str, Any]]) -> bool:
+        if self.next_index == 0:
+            return True
+        if len(plays) < self.next_index:
+            return False
+        return plays[self.next_index - 1].get("atBatIndex") == self.last_at_bat
+
+class BaseStateEngine:
+    """
+    Rebuilds who is on base from play-by-play in one forward pass, memoised per game.
+    Each call only processes plays appended since the previous one; the trailing
+    in-progress play is applied to a copy so it is re-read when it completes.
+    Bounded to the most recently used games.
+    """
+
+    def __init__(self, max_games: int):
+        self.max_games = max_games
+        self._games: "OrderedDict[int, GameBaseState]" = OrderedDict()
+
+    def runners(self, game_pk: int, plays: List[Dict[str, Any]]) -> Dict[str, str]:
+        """
+        Current occupancy (base -> runner name) for a game's allPlays list.
+        """
+        state = self._games.get(game_pk)
+        if state is None or not state.lines_up(plays):
+            # First sight of the game, or the play list was revised: start over
+            state = GameBaseState()
+        self._games[game_pk] = state
+        self._games.move_to_end(game_pk)
+        while len(self._games) > self.max_games:
+            self._games.popitem(last=False)
+
+        for index in range(state.next_index, len(plays)):
+            play = plays[index]
+            half = half_inning(play)
+            # A new half-inning starts with the bases empty
+            bases = state.bases if half == state.half_inning else {}
+            if not play.get("about", {}).get("isComplete", True):
+                # Only the last play is ever in progress; don't memoise it
+                bases = dict(bases)
+                apply_play(bases, play)
+                return bases
+            apply_play(bases, play)
+            state.bases = bases
+            state.half_inning = half
+            state.next_index = index + 1
+            state.last_at_bat = play.get("atBatIndex")
+        return dict(state.bases)
+
+    def discard(self, game_pk: int) -> None:
+        self._games.pop(game_pk, None)
+
+    def clear(self) -> None:
+        self._games.clear()
+
+    def __len__(self) -> int:
+        return len(self._games)
@@ -0,0 +1,83 @@
+import asyncio
+from typing import Any, Dict, List, Optional, Set
+from app.config import STREAM_QUEUE_SIZE
+
+# Fields of a TeamGame whose changes are pushed to stream subscribers
+TOP_LEVEL_FIELDS = ("game_state", "opponent_name")
+DETAIL_FIELDS = ("score", "final_score", "inning", "outs", "runners_on_base", "current_pitcher", "batter",
+                 "winning_pitcher", "losing_pitcher", "save_pitcher", "probable_pitchers", "game_time")
+
+def schedule_deltas(old: Optional[Dict[int, dict]], new: Dict[int, dict]) -> List[Dict[str, Any]]:
+    """
+    Per-team changes between two formatted schedules: [{"team_id": ..., "changes": {...}}].
+    """
+    old = old or {}
+    deltas = []
+    for team_id, game in new.items():
+        previous = old.get(team_id) or {}
+        if game == previous:
+            continue
+        changes = {}
+        for field in TOP_LEVEL_FIELDS:
+            if game.get(field) != previous.get(field):
+                changes[field] = game.get(field)
+        details = game.get("details") or {}
+        previous_details = previous.get("details") or {}
+        for field in DETAIL_FIELDS:
+            if field in details and details.get(field) != previous_details.get(field):
+                changes[field] = details[field]
+        if not game:
+            # Team no longer has a game listed
+            changes = {"game_state": None}
+        if changes:
+            deltas.append({"team_id": team_id, "changes": changes})
+    return deltas
+
+class Subscriber:
+    """
+    One stream client: a bounded queue of pending events.
+    """
+    __slots__ = ("queue", "closed")
+
+    def __init__(self, queue_size: int):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.closed = False
+
+class ScheduleBroadcaster:
+    """
+    Fans events out to every subscriber without awaiting any of them.
+    A subscriber whose queue is full is disconnected (slow-consumer policy) so it can
+    reconnect and resync from a fresh snapshot instead of stalling the publisher.
+    """
+
+    def __init__(self, queue_size: int = STREAM_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self._subscribers: Set[Subscriber] = set()
+        self.dropped = 0
+
+    def subscribe(self) -> Subscriber:
+        subscriber = Subscriber(self.queue_size)
+        self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        self._subscribers.discard(subscriber)
+
+    def publish(self, event: Dict[str, Any]) -> None:
+        for subscriber in list(self._subscribers):
+            try:
+                subscriber.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                self._drop(subscriber)
+
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def _drop(self, subscriber: Subscriber) -> None:
+        self._subscribers.discard(subscriber)
+        subscriber.closed = True
+        self.dropped += 1
+        # Make room for the close marker so the stream ends promptly
+        while not subscriber.queue.empty():
+            subscriber.queue.get_nowait()
+        subscriber.queue.put_nowait(None)
@@ -0,0 +1,185 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+from app.services.singleflight import SingleFlight
+
+class TTLCache:
+    """
+    In-process async cache with a fixed TTL.
+    Concurrent misses for the same key share one load (single-flight), and entries
+    past `refresh_after` seconds are refreshed in the background while the cached
+    value keeps being served.
+    """
+
+    def __init__(self, ttl: float, refresh_after: Optional[float] = None):
+        self.ttl = ttl
+        self.refresh_after = refresh_after if refresh_after is not None else ttl * 0.8
+        self._entries: Dict[Hashable, Tuple[Any, float]] = {}
+        self._flight = SingleFlight()
+        self._refreshing: Dict[Hashable, asyncio.Task] = {}
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Return the cached value for `key`, calling `loader` when it is missing or expired.
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            value, stored_at = entry
+            age = time.monotonic() - stored_at
+            if age < self.ttl:
+                if age >= self.refresh_after and key not in self._refreshing:
+                    self._start_refresh(key, loader)
+                self.hits += 1
+                return value
+
+        self.misses += 1
+        return await self._flight.do(key, lambda: self._load(key, loader))
+
+    def peek(self, key: Hashable) -> Optional[Any]:
+        """
+        Return the cached value if it is still within its TTL, without loading.
+        """
+        entry = self._entries.get(key)
+        if entry is not None and time.monotonic() - entry[1] < self.ttl:
+            return entry[0]
+        return None
+
+    def peek_stale(self, key: Hashable, max_stale: float) -> Optional[Any]:
+        """
+        Return the cached value even if expired, as long as it expired less than `max_stale` seconds ago.
+        """
+        entry = self._entries.get(key)
+        if entry is not None and time.monotonic() - entry[1] < self.ttl + max_stale:
+            return entry[0]
+        return None
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """
+        Store a value loaded elsewhere (e.g. as part of a batched request).
+        """
+        self._entries[key] = (value, time.monotonic())
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """
+        Drop one key, or every key when called without arguments.
+        """
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+    async def _load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        value = await loader()
+        self._entries[key] = (value, time.monotonic())
+        return value
+
+    def _start_refresh(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> None:
+        task = asyncio.ensure_future(self._flight.do(key, lambda: self._load(key, loader)))
+        self._refreshing[key] = task
+
+        def done(finished: asyncio.Task) -> None:
+            self._refreshing.pop(key, None)
+            # A failed background refresh keeps serving the current value
+            if not finished.cancelled():
+                finished.exception()
+
+        task.add_done_callback(done)
+
+class ResponseCache:
+    """
+    LRU cache of parsed upstream responses, bounded by total payload size in bytes.
+    Each entry carries its own TTL; hits, misses and evictions are counted.
+    Expired entries stored with a `stale_ttl` stay available to get_stale() for that much
+    longer, as a fallback while the upstream is failing.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, Tuple[Any, int, float, float]]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.stale_hits = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Return the cached value, or None if missing or expired.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        value, size, expires_at, stale_until = entry
+        now = time.monotonic()
+        if now >= expires_at:
+            if now >= stale_until:
+                self._remove(key)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def get_stale(self, key: Hashable) -> Optional[Any]:
+        """
+        Return the value even if expired, as long as it is within its stale window.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, size, expires_at, stale_until = entry
+        if time.monotonic() >= stale_until:
+            self._remove(key)
+            return None
+        self.stale_hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, size: int, ttl: float, stale_ttl: float = 0) -> None:
+        """
+        Store a value whose serialized size is `size` bytes, evicting least recently used entries.
+        """
+        if key in self._entries:
+            self._remove(key)
+        if size > self.max_bytes or ttl <= 0:
+            return
+        expires_at = time.monotonic() + ttl
+        self._entries[key] = (value, size, expires_at, expires_at + stale_ttl)
+        self._bytes += size
+        while self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "stale_hits": self.stale_hits,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+    def _remove(self, key: Hashable) -> None:
+        size = self._entries.pop(key)[1]
+        self._bytes -= size
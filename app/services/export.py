@@ -0,0 +1,186 @@
+import logging
+from datetime import date, timedelta
+from typing import Any, AsyncIterator, Dict, List, Tuple
+import httpx
+from app.services.archive import archive_row, rows_to_columns
+from app.services.final_store import final_store
+from app.services.formatter import build_team_info, extract_games, map_game_state, match_affiliate
+from app.services.mlb_api import get_affiliates_for_orgs, get_schedule_for_teams
+from app.services.resilience import UpstreamUnavailable
+from app.services.schedule_range import split_range
+from app.utils.json_utils import dumps
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:  # Arrow/Parquet exports are only offered with pyarrow installed
+    pyarrow = None
+
+logger = logging.getLogger(__name__)
+
+# Export format -> media type
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "arrow": "application/vnd.apache.arrow.stream",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+# (first date, last date, archive rows) of one schedule window
+ExportWindow = Tuple[date, date, List[Dict[str, Any]]]
+
+def available_formats() -> List[str]:
+    return list(EXPORT_MEDIA_TYPES) if pyarrow is not None else ["ndjson"]
+
+async def iter_export_rows(start: date, end: date, org_ids: Tuple[int, ...]) -> AsyncIterator[ExportWindow]:
+    """
+    Yield archive rows (one per affiliate team and game) a schedule window at a time,
+    with the window's dates (every window is yielded, even one without games).
+    Rows come straight from the schedule payload; pitching decisions are filled in from
+    the completed game store, without boxscore calls.
+    """
+    for window_start, window_end in split_range(start, end):
+        affiliates_by_org = await get_affiliates_for_orgs(list(org_ids), window_start.year)
+        team_info_by_org = {org_id: build_team_info(affiliates) for org_id, affiliates in affiliates_by_org.items()}
+        affiliates = [team for teams in affiliates_by_org.values() for team in teams]
+        if not affiliates:
+            yield window_start, window_end, []
+            continue
+        team_ids = list(dict.fromkeys(team["id"] for team in affiliates))
+        sport_ids = list(set(team["sport"]["id"] for team in affiliates))
+        schedule_data = await get_schedule_for_teams(
+            team_ids, sport_ids, start_date=window_start.isoformat(), end_date=window_end.isoformat()
+        )
+
+        rows = []
+        for game in extract_games(schedule_data):
+            game_state = map_game_state(game["status"]["abstractGameState"])
+            completed = final_store.get(game["gamePk"]) or {}
+            for org_id, team_info in team_info_by_org.items():
+                if match_affiliate(game, team_info):
+                    rows.append(archive_row(org_id, game, team_info, game_state, completed))
+        yield window_start, window_end, rows
+
+class ChunkSink:
+    """
+    Write-only file object that collects what pyarrow writes so it can be streamed out.
+    """
+
+    def __init__(self):
+        self.closed = False
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+def rows_to_table(rows: List[Dict[str, Any]]) -> "pyarrow.Table":
+    return pyarrow.table(rows_to_columns(rows))
+
+async def ndjson_chunks(windows: AsyncIterator[ExportWindow]) -> AsyncIterator[bytes]:
+    """
+    One JSON row per line. If a window fails, the body ends with an error line naming
+    the first date whose rows are missing.
+    """
+    missing_from = None
+    try:
+        async for window_start, window_end, rows in windows:
+            missing_from = window_end + timedelta(days=1)
+            if rows:
+                yield b"".join(dumps(row) + b"\n" for row in rows)
+    except (httpx.HTTPError, UpstreamUnavailable):
+        # The status line is long gone; say where the data stops instead
+        error = {"error": "MLB Stats API is unavailable.", "missing_from": missing_from.isoformat() if missing_from else None}
+        yield dumps(error) + b"\n"
+
+async def arrow_chunks(windows: AsyncIterator[ExportWindow]) -> AsyncIterator[bytes]:
+    """
+    One Arrow IPC stream, one record batch per schedule window.
+    """
+    sink = ChunkSink()
+    writer = None
+    async for _, _, rows in windows:
+        if not rows:
+            continue
+        table = rows_to_table(rows)
+        if writer is None:
+            writer = pyarrow.ipc.new_stream(sink, table.schema)
+        writer.write_table(table.cast(writer.schema) if table.schema != writer.schema else table)
+        yield sink.drain()
+    if writer is None:
+        writer = pyarrow.ipc.new_stream(sink, rows_to_table([]).schema)
+    writer.close()
+    yield sink.drain()
+
+async def parquet_chunks(windows: AsyncIterator[ExportWindow]) -> AsyncIterator[bytes]:
+    """
+    One Parquet file, one row group per schedule window (the footer comes last).
+    """
+    sink = ChunkSink()
+    writer = None
+    async for _, _, rows in windows:
+        if not rows:
+            continue
+        table = rows_to_table(rows)
+        if writer is None:
+            writer = pyarrow.parquet.ParquetWriter(sink, table.schema, compression="zstd")
+        writer.write_table(table.cast(writer.schema) if table.schema != writer.schema else table)
+        yield sink.drain()
+    if writer is None:
+        writer = pyarrow.parquet.ParquetWriter(sink, rows_to_table([]).schema)
+    writer.close()
+    yield sink.drain()
+
+EXPORT_WRITERS = {
+    "ndjson": ndjson_chunks,
+    "arrow": arrow_chunks,
+    "parquet": parquet_chunks,
+}
+
+async def abort_on_error(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """
+    Let an upstream failure break the response off, so a binary export without its
+    end-of-stream marker or footer can't be mistaken for a complete one.
+    """
+    try:
+        async for chunk in chunks:
+            yield chunk
+    except (httpx.HTTPError, UpstreamUnavailable) as e:
+        logger.warning("Aborting export: %s: %s", type(e).__name__, e)
+        raise
+
+async def prepend(first: ExportWindow, rest: AsyncIterator[ExportWindow]) -> AsyncIterator[ExportWindow]:
+    yield first
+    async for window in rest:
+        yield window
+
+async def open_export(start: date, end: date, org_ids: Tuple[int, ...], format: str) -> AsyncIterator[bytes]:
+    """
+    The export body for a date range in `format` (one of available_formats()). The first
+    window is fetched here, so an unavailable upstream raises before the response starts.
+    """
+    windows = iter_export_rows(start, end, org_ids)
+    try:
+        first = await windows.__anext__()
+    except BaseException:
+        await windows.aclose()
+        raise
+    chunks = EXPORT_WRITERS[format](prepend(first, windows))
+    return chunks if format == "ndjson" else abort_on_error(chunks)
@@ -0,0 +1,116 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+class PlayerEntry:
+    """
+    One boxscore player, reduced to the fields the formatter reads.
+    """
+    __slots__ = ("id", "side", "name", "person", "is_pitcher", "pitching", "data")
+
+    def __init__(self, side: str, data: Dict[str, Any]):
+        person = data.get("person", {})
+        self.id = person.get("id")
+        self.side = side
+        self.name = person.get("fullName", "N/A")
+        self.person = person
+        self.is_pitcher = data.get("position", {}).get("abbreviation") == "P"
+        self.pitching = data.get("stats", {}).get("pitching", {})
+        # The raw entry, for code paths that still need the full record
+        self.data = data
+
+class BoxscoreIndex:
+    """
+    A boxscore decoded once into O(1) lookups: players by "ID{n}" key, pitchers in
+    boxscore order, the first listed pitcher per side, and the players flagged as
+    current pitcher/batter.
+    """
+    __slots__ = ("players", "pitcher_ids", "probable", "first_pitcher", "current_players", "info")
+
+    def __init__(self, boxscore: Dict[str, Any]):
+        teams = boxscore.get("teams", {})
+        self.players: Dict[str, PlayerEntry] = {}
+        self.pitcher_ids: List[int] = []
+        self.probable: Dict[str, Dict[str, Any]] = {}
+        self.first_pitcher: Dict[str, Dict[str, Any]] = {}
+        self.current_players: List[Tuple[str, Dict[str, Any]]] = []
+        self.info = boxscore.get("info", [])
+
+        for side in ("home", "away"):
+            team_data = teams.get(side, {})
+            self.pitcher_ids.extend(team_data.get("pitchers", []))
+            if team_data.get("probablePitcher"):
+                self.probable[side] = team_data["probablePitcher"]
+            for key, data in team_data.get("players", {}).items():
+                entry = PlayerEntry(side, data)
+                # Home entries win, matching the home-then-away lookup order
+                self.players.setdefault(key, entry)
+                if entry.is_pitcher and side not in self.first_pitcher:
+                    self.first_pitcher[side] = entry.person
+                game_status = data.get("gameStatus", {})
+                if game_status.get("isCurrentPitcher") or game_status.get("isCurrentBatter"):
+                    self.current_players.append((side, data))
+
+    def player(self, player_id: int) -> Optional[PlayerEntry]:
+        return self.players.get(f"ID{player_id}")
+
+    def pitchers(self) -> List[PlayerEntry]:
+        """
+        Every pitcher who appeared (home first, then away), skipping ids without a player entry.
+        """
+        entries = []
+        for pitcher_id in self.pitcher_ids:
+            entry = self.player(pitcher_id)
+            if entry is not None:
+                entries.append(entry)
+        return entries
+
+class IndexedBoxscore(dict):
+    """
+    A boxscore payload that keeps its index once one is built. The index lives (and is
+    evicted) with the cached payload, rather than in a memo of its own.
+    """
+    __slots__ = ("index",)
+
+    def __init__(self, payload: Dict[str, Any]):
+        super().__init__(payload)
+        self.index: Optional[BoxscoreIndex] = None
+
+def index_boxscore(boxscore: Dict[str, Any]) -> BoxscoreIndex:
+    """
+    The index for a boxscore payload: built once per IndexedBoxscore, or afresh for a plain dict.
+    """
+    if not isinstance(boxscore, IndexedBoxscore):
+        return BoxscoreIndex(boxscore)
+    if boxscore.index is None:
+        boxscore.index = BoxscoreIndex(boxscore)
+    return boxscore.index
+
+def pitching_decisions(boxscore: Dict[str, Any]) -> Dict[str, str]:
+    """
+    Winning, losing and save pitcher names credited in a boxscore ("N/A" until credited).
+    """
+    decisions = {"winning_pitcher": "N/A", "losing_pitcher": "N/A", "save_pitcher": "N/A"}
+    # Via the precomputed player index (one dict lookup per pitcher)
+    for pitcher in index_boxscore(boxscore).pitchers():
+        stats = pitcher.pitching
+        if stats.get("wins", 0) > 0:
+            decisions["winning_pitcher"] = pitcher.name
+        elif stats.get("losses", 0) > 0:
+            decisions["losing_pitcher"] = pitcher.name
+        elif stats.get("saves", 0) > 0:
+            decisions["save_pitcher"] = pitcher.name
+    return decisions
+
+def current_players(boxscore: Dict[str, Any]) -> List[Tuple[str, Dict[str, Any]]]:
+    """
+    (side, player) for the players flagged as current pitcher or batter, found by a plain
+    scan of the players; an existing index is used, but none is built.
+    """
+    if isinstance(boxscore, IndexedBoxscore) and boxscore.index is not None:
+        return boxscore.index.current_players
+    found = []
+    for side in ("home", "away"):
+        for data in boxscore.get("teams", {}).get(side, {}).get("players", {}).values():
+            game_status = data.get("gameStatus", {})
+            if game_status.get("isCurrentPitcher") or game_status.get("isCurrentBatter"):
+                found.append((side, data))
+    return found
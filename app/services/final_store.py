@@ -0,0 +1,123 @@
+import logging
+import sqlite3
+import struct
+import threading
+from typing import Any, Dict, Optional
+from app.services.metrics import CallbackGauge, registry
+
+logger = logging.getLogger(__name__)
+
+# detailedState prefixes of a game that was played to the end; postponed and suspended games
+# are also abstractGameState "Final" but keep their gamePk when they are made up later
+FINAL_DETAILED_STATES = ("Final", "Game Over", "Completed Early")
+
+_SCORE = struct.Struct("<HH")
+_SEPARATOR = "\x1f"
+
+def is_final_result(game: Dict[str, Any]) -> bool:
+    """
+    True when a schedule game's result can no longer change.
+    """
+    status = game.get("status", {})
+    return status.get("abstractGameState") == "Final" and status.get("detailedState", "").startswith(FINAL_DETAILED_STATES)
+
+def has_decisions(details: Dict[str, Any]) -> bool:
+    """
+    True when CompletedDetails name both the winning and the losing pitcher. Until the
+    boxscore credits them, a result is served but not stored, so a later request retries.
+    """
+    return details.get("winning_pitcher", "N/A") != "N/A" and details.get("losing_pitcher", "N/A") != "N/A"
+
+def encode_details(details: Dict[str, Any]) -> bytes:
+    """
+    Pack CompletedDetails as home/away score (two uint16) followed by the winning,
+    losing and save pitcher names, unit-separator delimited.
+    """
+    score = details["final_score"]
+    names = (details["winning_pitcher"], details["losing_pitcher"], details.get("save_pitcher") or "N/A")
+    return _SCORE.pack(score["home"], score["away"]) + _SEPARATOR.join(names).encode("utf-8")
+
+def decode_details(blob: bytes) -> Dict[str, Any]:
+    home, away = _SCORE.unpack_from(blob)
+    winning, losing, save = blob[_SCORE.size:].decode("utf-8").split(_SEPARATOR)
+    return {
+        "final_score": {"home": home, "away": away},
+        "winning_pitcher": winning,
+        "losing_pitcher": losing,
+        "save_pitcher": save,
+    }
+
+class FinalGameStore:
+    """
+    Completed-game details keyed by game_pk, persisted in SQLite so finished games
+    survive restarts. Every row is loaded into memory when the store is opened, so
+    lookups never touch the disk; new results are written in one transaction per batch.
+    Until `open` is called the store only holds what is saved in this process.
+    """
+
+    def __init__(self):
+        self.path: Optional[str] = None
+        self._connection: Optional[sqlite3.Connection] = None
+        self._details: Dict[int, Dict[str, Any]] = {}
+        # Saves run in worker threads; sqlite3 connections aren't safe to share unguarded
+        self._lock = threading.Lock()
+
+    def open(self, path: str) -> int:
+        """
+        Open (creating if needed) the database at `path` and preload every stored game.
+        Returns the number of games loaded.
+        """
+        connection = sqlite3.connect(path, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute("CREATE TABLE IF NOT EXISTS final_games (game_pk INTEGER PRIMARY KEY, details BLOB NOT NULL) WITHOUT ROWID")
+        loaded = {game_pk: decode_details(blob) for game_pk, blob in connection.execute("SELECT game_pk, details FROM final_games")}
+        with self._lock:
+            self.path = path
+            self._connection = connection
+            self._details.update(loaded)
+        logger.info("Loaded %s final games from %s", len(loaded), path)
+        return len(loaded)
+
+    def get(self, game_pk: int) -> Optional[Dict[str, Any]]:
+        return self._details.get(game_pk)
+
+    def save(self, results: Dict[int, Dict[str, Any]]) -> None:
+        """
+        Store several games' details at once (blocking; call through asyncio.to_thread).
+        """
+        if not results:
+            return
+        with self._lock:
+            self._details.update(results)
+            if self._connection is None:
+                return
+            with self._connection:
+                self._connection.executemany(
+                    "INSERT OR REPLACE INTO final_games (game_pk, details) VALUES (?, ?)",
+                    [(game_pk, encode_details(details)) for game_pk, details in results.items()],
+                )
+
+    def clear(self) -> None:
+        """
+        Forget the in-memory copy (the database is left as is).
+        """
+        with self._lock:
+            self._details.clear()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+            self._connection = None
+            self.path = None
+
+    def __len__(self) -> int:
+        return len(self._details)
+
+final_store = FinalGameStore()
+registry.register(CallbackGauge(
+    "final_store_games",
+    "Completed games held by the persistent final-result store.",
+    lambda: len(final_store),
+))
@@ -1,77 +1,48 @@
-from typing import List, Dict, Any, Union
+import asyncio
+import logging
+import re
+from typing import List, Dict, Any, Union, Optional
+from app.config import DETAIL_FETCH_CONCURRENCY, LIVE_FEED_ONLY, LIVE_FEED_STORE_MAX_GAMES
 from app.services.mlb_api import get_live_game_data, get_game_boxscore, get_live_feed_data, get_game_plays
-
-def analyze_recent_plays_for_runners(plays_data: Dict[str, Any], current_inning: int, current_outs: int) -> List[str]:
+from app.services.base_state import BaseStateEngine
+from app.services.extractors import current_players, index_boxscore, pitching_decisions
+from app.services.final_store import final_store, has_decisions, is_final_result
+from app.services.metrics import format_game_seconds, schedule_stage_seconds
+from app.services.resilience import mark_incomplete, request_is_stale
+from app.utils.logging_utils import lazy
+
+logger = logging.getLogger(__name__)
+
+# Level mapping
+LEVEL_MAP = {
+    "Major League Baseball": "MLB",
+    "Triple-A": "AAA",
+    "Double-A": "AA",
+    "High-A": "A+",
+    "Single-A": "A",
+    "Rookie": "R"
+}
+
+# Base occupancy per live game, rebuilt incrementally from play-by-play
+base_states = BaseStateEngine(LIVE_FEED_STORE_MAX_GAMES)
+
+# Upstream calls needed per game state, keyed by the name used in the fetched-data dict
+DETAIL_FETCHERS = {
+    "boxscore": get_game_boxscore,
+    "live_feed": get_live_feed_data,
+    "plays": get_game_plays,
+}
+
+def format_runners(occupancy: Dict[str, str]) -> List[str]:
     """
-    Analyze recent plays to determine who's currently on base.
+    Render base occupancy as sorted "1B: Name" entries, the format the live feed path uses.
     """
-    runners_on_base = []
-    
-    if not plays_data or "plays" not in plays_data:
-        return runners_on_base
-    
-    plays = plays_data.get("plays", [])
-    if not plays:
-        return runners_on_base
-    
-    # Track base runners through recent plays
-    current_runners = {"1B": None, "2B": None, "3B": None}
-    
-    # Look at plays from the current inning
-    for play in reversed(plays):  # Start from most recent
-        play_data = play.get("playEvents", [])
-        inning = play.get("about", {}).get("inning", 0)
-        
-        # Only look at current inning plays
-        if inning != current_inning:
-            continue
-            
-        for event in play_data:
-            event_type = event.get("details", {}).get("type", {})
-            event_code = event_type.get("code", "")
-            
-            # Track base running events
-            if "runner" in event:
-                runner_data = event["runner"]
-                runner_name = runner_data.get("details", {}).get("runner", {}).get("fullName", "")
-                movement = runner_data.get("movement", {})
-                start_base = movement.get("start", "")
-                end_base = movement.get("end", "")
-                
-                # Update current runners based on movement
-                if start_base == "1B" and end_base != "1B":
-                    current_runners["1B"] = None
-                if start_base == "2B" and end_base != "2B":
-                    current_runners["2B"] = None
-                if start_base == "3B" and end_base != "3B":
-                    current_runners["3B"] = None
-                    
-                if end_base == "1B":
-                    current_runners["1B"] = runner_name
-                elif end_base == "2B":
-                    current_runners["2B"] = runner_name
-                elif end_base == "3B":
-                    current_runners["3B"] = runner_name
-    
-    # Convert current runners to base positions
-    for base, runner in current_runners.items():
-        if runner:
-            runners_on_base.append(base)
-    
-    return sorted(runners_on_base)
-
-def format_schedule(affiliates: List[Dict[str, Any]], schedule_data: List[Dict[str, Any]]) -> Dict[int, dict]:
-    # Level mapping
-    LEVEL_MAP = {
-        "Major League Baseball": "MLB",
-        "Triple-A": "AAA",
-        "Double-A": "AA",
-        "High-A": "A+",
-        "Single-A": "A",
-        "Rookie": "R"
-    }
+    return [f"{base}: {name}" if name else base for base, name in sorted(occupancy.items())]
 
-    # Step 1: Create team lookup
+def build_team_info(affiliates: List[Dict[str, Any]]) -> Dict[int, Dict[str, str]]:
+    """
+    Build the affiliate lookup (team id -> name and level).
+    """
     team_info = {}
     for team in affiliates:
         sport = team.get("sport", {})
@@ -82,6 +53,45 @@ def format_schedule(affiliates: List[Dict[str, Any]], schedule_data: List[Dict[s
             "team_name": team["name"],
             "level": level
         }
+    return team_info
+
+def map_game_state(status: str) -> str:
+    """
+    Map the upstream abstractGameState to the response game state.
+    """
+    if status == "Preview":
+        return "Not Started"
+    elif status == "Live":
+        return "In Progress"
+    elif status == "Final":
+        return "Completed"
+    return status
+
+def extract_games(schedule_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Flatten the schedule "dates" list into a list of games.
+    """
+    games = []
+    for day in schedule_data:
+        games.extend(day.get("games", []))
+    return games
+
+def match_affiliate(game: Dict[str, Any], team_info: Dict[int, Dict[str, str]]) -> Optional[tuple]:
+    """
+    Return (affiliate team, opponent team) for a game, or None if no affiliate is playing.
+    """
+    home_team = game["teams"]["home"]["team"]
+    away_team = game["teams"]["away"]["team"]
+
+    if home_team["id"] in team_info:
+        return home_team, away_team
+    elif away_team["id"] in team_info:
+        return away_team, home_team
+    return None
+
+def format_schedule(affiliates: List[Dict[str, Any]], schedule_data: List[Dict[str, Any]]) -> Dict[int, dict]:
+    # Step 1: Create team lookup
+    team_info = build_team_info(affiliates)
 
     # Step 2: Initialize base response
     response = {team_id: {} for team_id in team_info}
@@ -127,14 +137,7 @@ def format_schedule(affiliates: List[Dict[str, Any]], schedule_data: List[Dict[s
         venue = game["venue"]["name"]
         
         # Map game state to required format
-        if status == "Preview":
-            game_state = "Not Started"
-        elif status == "Live":
-            game_state = "In Progress"
-        elif status == "Final":
-            game_state = "Completed"
-        else:
-            game_state = status
+        game_state = map_game_state(status)
 
         # Format by game state
         if game_state == "Not Started":
@@ -183,627 +186,656 @@ def format_schedule(affiliates: List[Dict[str, Any]], schedule_data: List[Dict[s
 
     return response
 
-async def format_schedule_with_details(affiliates: List[Dict[str, Any]], schedule_data: List[Dict[str, Any]]) -> Dict[int, dict]:
+def plan_game_fetches(game: Dict[str, Any]) -> List[str]:
     """
-    Enhanced formatter that fetches detailed game data.
+    Decide which upstream detail calls a game needs, based on its state.
     """
-    # Level mapping
-    LEVEL_MAP = {
-        "Major League Baseball": "MLB",
-        "Triple-A": "AAA",
-        "Double-A": "AA",
-        "High-A": "A+",
-        "Single-A": "A",
-        "Rookie": "R"
+    game_state = map_game_state(game["status"]["abstractGameState"])
+    if game_state == "Not Started":
+        # Probable pitchers
+        return ["boxscore"]
+    elif game_state == "In Progress":
+        if LIVE_FEED_ONLY:
+            # The v1.1 feed embeds boxscore and plays; extra calls only if they're missing
+            return ["live_feed"]
+        # Current game state, current players, and plays for base runner analysis
+        return ["live_feed", "boxscore", "plays"]
+    elif game_state == "Completed":
+        # Final pitching decisions, unless the result is already stored
+        if final_store.get(game["gamePk"]) is not None:
+            return []
+        return ["boxscore"]
+    return []
+
+def plan_live_feed_fallbacks(live_feed_data: Optional[Dict[str, Any]]) -> List[str]:
+    """
+    Endpoints still needed for a live game after its v1.1 feed has been fetched.
+    """
+    live_data = (live_feed_data or {}).get("liveData", {})
+    fallbacks = []
+    if not live_data.get("boxscore"):
+        fallbacks.append("boxscore")
+    if not live_data.get("plays"):
+        fallbacks.append("plays")
+    return fallbacks
+
+async def fetch_game_details(games: List[Dict[str, Any]], concurrency: int = DETAIL_FETCH_CONCURRENCY) -> Dict[int, Dict[str, Any]]:
+    """
+    Run every planned per-game detail call concurrently, at most `concurrency` at a time.
+    Returns {game_pk: {"boxscore": ..., "live_feed": ..., "plays": ...}}.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    fetched: Dict[int, Dict[str, Any]] = {}
+
+    async def run(fetcher, game_pk: int, status: str):
+        async with semaphore:
+            return await fetcher(game_pk, game_state=status)
+
+    async def run_planned(planned: List[tuple]) -> None:
+        results = await asyncio.gather(*(run(DETAIL_FETCHERS[name], game_pk, status) for game_pk, name, status in planned))
+        for (game_pk, name, _), result in zip(planned, results):
+            fetched.setdefault(game_pk, {})[name] = result
+            if result is None:
+                # Failed, timed out or circuit open: the render must not be cached as complete
+                mark_incomplete()
+
+    # Plan: one entry per (game, call), deduplicated by game_pk
+    planned = []
+    statuses = {}
+    for game in games:
+        game_pk = game["gamePk"]
+        if game_pk in statuses:
+            continue
+        statuses[game_pk] = game["status"]["abstractGameState"]
+        for name in plan_game_fetches(game):
+            planned.append((game_pk, name, statuses[game_pk]))
+
+    await run_planned(planned)
+
+    # Live games whose feed lacked boxscore/plays (or failed) get those endpoints in one more round
+    fallbacks = []
+    for game_pk, game_data in fetched.items():
+        if "live_feed" in game_data and "boxscore" not in game_data:
+            for name in plan_live_feed_fallbacks(game_data["live_feed"]):
+                fallbacks.append((game_pk, name, statuses[game_pk]))
+    if fallbacks:
+        await run_planned(fallbacks)
+
+    # Finished games: stored results are used as is; new ones are stored for good once the
+    # boxscore names both decisions and nothing in this request was served stale
+    new_results = {}
+    for game in games:
+        game_pk = game["gamePk"]
+        if not is_final_result(game):
+            continue
+        stored = final_store.get(game_pk)
+        if stored is not None:
+            fetched.setdefault(game_pk, {})["completed"] = stored
+        elif "completed" not in fetched.get(game_pk, {}) and fetched.get(game_pk, {}).get("boxscore"):
+            details = fetched[game_pk]["completed"] = build_completed_details(game, fetched[game_pk]["boxscore"])
+            if has_decisions(details):
+                new_results[game_pk] = details
+    if new_results and not request_is_stale():
+        await asyncio.to_thread(final_store.save, new_results)
+
+    return fetched
+
+def build_not_started_details(game: Dict[str, Any], venue: str, boxscore: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Details for a game that hasn't started: time, venue and probable pitchers.
+    """
+    probable_pitchers = {}
+    if boxscore:
+        index = index_boxscore(boxscore)
+        for side in ("home", "away"):
+            # Method 1: the probablePitcher field; Method 2: first pitcher in the players list
+            pitcher = index.probable.get(side) or index.first_pitcher.get(side)
+            if pitcher:
+                probable_pitchers[side] = pitcher.get("fullName", "TBD")
+
+    # If still no probable pitchers, try the schedule endpoint data
+    if not probable_pitchers:
+        # Check if the game object has probable pitcher info
+        home_probable = game.get("teams", {}).get("home", {}).get("probablePitcher", {})
+        away_probable = game.get("teams", {}).get("away", {}).get("probablePitcher", {})
+
+        if home_probable:
+            probable_pitchers["home"] = home_probable.get("fullName", "TBD")
+        if away_probable:
+            probable_pitchers["away"] = away_probable.get("fullName", "TBD")
+
+    return {
+        "game_time": game["gameDate"],
+        "venue": venue,
+        "probable_pitchers": probable_pitchers
     }
 
-    # Step 1: Create team lookup
-    team_info = {}
-    for team in affiliates:
-        sport = team.get("sport", {})
-        raw_level = sport.get("name", sport.get("abbreviation", "Unknown"))
-        level = LEVEL_MAP.get(raw_level, sport.get("abbreviation", raw_level))
-        team_info[team["id"]] = {
-            "team_name": team["name"],
-            "level": level
-        }
+def build_in_progress_details(
+    game: Dict[str, Any],
+    venue: str,
+    live_feed_data: Optional[Dict[str, Any]],
+    boxscore_data: Optional[Dict[str, Any]],
+    plays_data: Optional[Dict[str, Any]],
+) -> Dict[str, Any]:
+    """
+    Details for a live game: score, inning, outs, runners, pitcher and batter.
+    """
+    game_pk = game["gamePk"]
+    details = {
+        "venue": venue,
+        "score": {
+            "home": game["teams"]["home"].get("score", 0),
+            "away": game["teams"]["away"].get("score", 0)
+        },
+        "inning": "N/A",
+        "outs": "N/A",
+        "runners_on_base": [],
+        "current_pitcher": "N/A",
+        "batter": "N/A"
+    }
 
-    # Step 2: Initialize base response
-    response = {team_id: {} for team_id in team_info}
+    # First, try to get basic info from the game object itself
+    game_status = game.get("status", {})
+    details["inning"] = game_status.get("detailedState", "N/A")
+
+    # Process live feed data for current game state
+    live_data = {}
+    if live_feed_data:
+        logger.debug("Live feed data keys: %s", lazy(lambda: list(live_feed_data.keys())))
+
+        # Extract current game state from live feed
+        live_data = live_feed_data.get("liveData", {})
+        if live_data:
+            # Get current inning, outs, and offense from linescore
+            linescore = live_data.get("linescore", {})
+            if linescore:
+                current_inning = linescore.get("currentInning", "N/A")
+                inning_half = linescore.get("inningHalf", "N/A")
+                outs = linescore.get("outs", "N/A")
+
+                if current_inning and inning_half:
+                    details["inning"] = f"{inning_half} {current_inning}"
+                    logger.debug("Live feed inning: %s", details['inning'])
+
+                if outs != "N/A":
+                    details["outs"] = str(outs)
+                    logger.debug("Live feed outs: %s", details['outs'])
+
+            # Get current batter and runners from offense
+            offense = linescore.get("offense", {})
+            if offense:
+                # Get current batter
+                batter_info = offense.get("batter", {})
+                if isinstance(batter_info, dict) and batter_info.get("fullName"):
+                    details["batter"] = batter_info["fullName"]
+                    logger.debug("Live feed batter: %s", details['batter'])
+
+                # Get runners on base
+                runners_on_base = []
+                on_first = offense.get("first")
+                on_second = offense.get("second") 
+                on_third = offense.get("third")
+
+                if on_first and isinstance(on_first, dict) and on_first.get("fullName"):
+                    runners_on_base.append(f"1B: {on_first.get('fullName')}")
+                    logger.debug("Found runner on 1B: %s", on_first.get('fullName'))
+                if on_second and isinstance(on_second, dict) and on_second.get("fullName"):
+                    runners_on_base.append(f"2B: {on_second.get('fullName')}")
+                    logger.debug("Found runner on 2B: %s", on_second.get('fullName'))
+                if on_third and isinstance(on_third, dict) and on_third.get("fullName"):
+                    runners_on_base.append(f"3B: {on_third.get('fullName')}")
+                    logger.debug("Found runner on 3B: %s", on_third.get('fullName'))
+
+                details["runners_on_base"] = sorted(runners_on_base)
+                logger.debug("Live feed runners: %s", details['runners_on_base'])
+
+            # Get current pitcher from defense
+            defense = linescore.get("defense", {})
+            if defense:
+                pitcher_info = defense.get("pitcher", {})
+                if isinstance(pitcher_info, dict) and pitcher_info.get("fullName"):
+                    details["current_pitcher"] = pitcher_info["fullName"]
+                    logger.debug("Live feed pitcher: %s", details['current_pitcher'])
+
+    # Process boxscore data as fallback (only for pitcher/batter if live feed didn't provide them)
+    if boxscore_data and (details["current_pitcher"] == "N/A" or details["batter"] == "N/A"):
+        logger.debug("Boxscore data keys: %s", lazy(lambda: list(boxscore_data.keys())))
+
+        # Check if this is boxscore data (which has different structure)
+        if "teams" in boxscore_data and "info" in boxscore_data:
+            logger.debug("Processing boxscore data for live game...")
+            info = boxscore_data.get("info", [])
+
+            # Look for current pitcher and batter using gameStatus
+            for team_side, player_data in current_players(boxscore_data):
+                player_status = player_data.get("gameStatus", {})
+
+                # Check if this is the current pitcher
+                if player_status.get("isCurrentPitcher", False):
+                    details["current_pitcher"] = player_data.get("person", {}).get("fullName", "N/A")
+                    logger.debug("Found current pitcher: %s", details['current_pitcher'])
+
+                    # Extract inning and outs from current pitcher's stats
+                    pitcher_stats = player_data.get("stats", {}).get("pitching", {})
+                    if pitcher_stats:
+                        # Get innings pitched (e.g., "2.2" means 2 innings + 2 outs = 8 outs total)
+                        innings_pitched = pitcher_stats.get("inningsPitched", "0.0")
+
+                        # Check if this pitcher has pitched any innings
+                        if innings_pitched and innings_pitched != "0.0":
+                            try:
+                                # Parse innings like "2.2" (2 innings, 2 outs)
+                                if "." in innings_pitched:
+                                    full_innings, partial_outs = innings_pitched.split(".")
+                                    total_outs = int(full_innings) * 3 + int(partial_outs)
+                                    details["outs"] = str(total_outs % 3)  # Current outs in this inning
+
+                                    # Calculate current inning
+                                    total_innings = int(full_innings) + (int(partial_outs) // 3)
+                                    # Determine if home or away team is batting based on current batter
+                                    inning_half = "Bottom"  # Default assumption
+                                    details["inning"] = f"{inning_half} {total_innings + 1}"
+                                else:
+                                    total_innings = int(innings_pitched)
+                                    details["outs"] = "0"  # Start of new inning
+                                    inning_half = "Bottom"  # Default assumption
+                                    details["inning"] = f"{inning_half} {total_innings + 1}"
+
+                                logger.debug("Extracted from pitcher stats: Inning %s, Outs %s", details['inning'], details['outs'])
+
+                            except (ValueError, TypeError) as e:
+                                logger.debug("Error parsing pitcher stats: %s", e)
+                        else:
+                            # New pitcher with no innings pitched - need to get inning from other sources
+                            logger.debug("New pitcher detected (0.0 IP) - getting inning from game status")
+
+                            # Try to get inning from game status detailed state
+                            game_status_detailed = game_status.get("detailedState", "")
+                            if game_status_detailed:
+                                # Look for inning info in detailed state like "Bottom 5th" or "Top 3rd"
+                                inning_match = re.search(r'(top|bottom)\s*(\d+)(?:st|nd|rd|th)?', game_status_detailed.lower())
+                                if inning_match:
+                                    inning_half = inning_match.group(1).title()
+                                    inning_num = inning_match.group(2)
+                                    details["inning"] = f"{inning_half} {inning_num}"
+                                    logger.debug("Extracted from game status: %s", details['inning'])
+
+                                # Try to get outs from detailed state
+                                outs_match = re.search(r'(\d+)\s*out', game_status_detailed.lower())
+                                if outs_match:
+                                    details["outs"] = outs_match.group(1)
+                                    logger.debug("Extracted outs from game status: %s", details['outs'])
+
+                            # If still no inning info, try to get from current pitcher's total outs
+                            if details["inning"] == "N/A":
+                                # Calculate inning from current pitcher's total outs
+                                total_outs_pitched = pitcher_stats.get("outs", 0)
+                                if total_outs_pitched > 0:
+                                    # Calculate completed innings from total outs
+                                    completed_innings = total_outs_pitched // 3
+                                    current_inning = completed_innings + 1
+
+                                    # Determine which team is batting based on current batter
+                                    if team_side == "away":
+                                        # Away team batting = Top of inning
+                                        inning_half = "Top"
+                                    else:
+                                        # Home team batting = Bottom of inning
+                                        inning_half = "Bottom"
+
+                                    details["inning"] = f"{inning_half} {current_inning}"
+                                    logger.debug("Calculated inning from pitcher total outs: %s (Pitcher outs: %s)", details['inning'], total_outs_pitched)
+
+                            # If still no inning info, try to get from team stats using total outs
+                            if details["inning"] == "N/A":
+                                # Look at team stats to determine current inning from total outs
+                                home_team_stats = boxscore_data.get("teams", {}).get("home", {}).get("teamStats", {})
+                                away_team_stats = boxscore_data.get("teams", {}).get("away", {}).get("teamStats", {})
+
+                                if home_team_stats and away_team_stats:
+                                    # Get total outs for each team
+                                    home_outs = home_team_stats.get("batting", {}).get("leftOnBase", 0)  # This might not be total outs
+                                    away_outs = away_team_stats.get("batting", {}).get("leftOnBase", 0)
+
+                                    # Try to get outs from pitching stats (outs recorded by opposing pitchers)
+                                    home_pitching_outs = home_team_stats.get("pitching", {}).get("outs", 0)
+                                    away_pitching_outs = away_team_stats.get("pitching", {}).get("outs", 0)
+
+                                    # Calculate inning from total outs (27 outs per 9 innings)
+                                    total_outs = home_pitching_outs + away_pitching_outs
+                                    completed_innings = total_outs // 3  # 3 outs per inning
+
+                                    # Determine which team is batting based on current batter
+                                    if team_side == "away":
+                                        # Away team batting = Top of inning
+                                        inning_half = "Top"
+                                        current_inning = completed_innings + 1
+                                    else:
+                                        # Home team batting = Bottom of inning
+                                        inning_half = "Bottom"
+                                        current_inning = completed_innings + 1
+
+                                    details["inning"] = f"{inning_half} {current_inning}"
+                                    logger.debug("Calculated inning from total outs: %s (Total outs: %s)", details['inning'], total_outs)
+
+                    # Try to determine runners on base from pitcher's recent performance
+                    if pitcher_stats:
+                        hits = pitcher_stats.get("hits", 0)
+                        base_on_balls = pitcher_stats.get("baseOnBalls", 0)
+                        hit_by_pitch = pitcher_stats.get("hitBatsmen", 0)
+                        batters_faced = pitcher_stats.get("battersFaced", 0)
+
+                        if batters_faced > 0:
+                            logger.debug("Pitcher stats: %s hits, %s walks, %s HBP, %s batters faced", hits, base_on_balls, hit_by_pitch, batters_faced)
+
+                # Check if this is the current batter
+                if player_status.get("isCurrentBatter", False):
+                    details["batter"] = player_data.get("person", {}).get("fullName", "N/A")
+                    logger.debug("Found current batter: %s", details['batter'])
+
+                    # Determine which team is batting (top/bottom)
+                    if team_side == "away":
+                        # Away team batting = Top of inning
+                        if "inning" in details and "Bottom" in details["inning"]:
+                            details["inning"] = details["inning"].replace("Bottom", "Top")
+                            logger.debug("Corrected inning: %s (away team batting)", details['inning'])
+                    else:
+                        # Home team batting = Bottom of inning
+                        if "inning" in details and "Top" in details["inning"]:
+                            details["inning"] = details["inning"].replace("Top", "Bottom")
+                            logger.debug("Corrected inning: %s (home team batting)", details['inning'])
+
+            # Rebuild runners on base from play-by-play (if not already set by live feed)
+            all_plays = plays_data.get("allPlays") if plays_data else None
+            if not details["runners_on_base"] and all_plays:
+                details["runners_on_base"] = format_runners(base_states.runners(game_pk, all_plays))
+                logger.debug("Runners from plays: %s", details['runners_on_base'])
+
+            # Fallback to info array only without play-by-play (empty bases from plays are an answer)
+            if not details["runners_on_base"] and not all_plays:
+                runners_on_base = []
+
+                # First, try to get runners from "Runners left in scoring position" info
+                for item in info:
+                    label = item.get("label", "")
+                    value = item.get("value", "")
+
+                    # Look for runners on base information
+                    if "Runners left in scoring position" in label:
+                        # Parse runners from value like "Lopez, O; Edwards, X."
+                        if value and value != "None":
+                            # Extract base positions from the label
+                            if "2 out" in label:
+                                # Runners on 2nd and 3rd with 2 outs
+                                runners_on_base.extend(["2B", "3B"])
+                            elif "1 out" in label:
+                                # Runners on 2nd and 3rd with 1 out
+                                runners_on_base.extend(["2B", "3B"])
+                            else:
+                                # Default to 2nd and 3rd if no out count specified
+                                runners_on_base.extend(["2B", "3B"])
+
+                    # Look for other runner indicators
+                    elif "LOB" in label and value and value != "0":
+                        # Left on base indicates runners
+                        if "1" in value:
+                            runners_on_base.append("1B")
+                        if "2" in value:
+                            runners_on_base.append("2B")
+                        if "3" in value:
+                            runners_on_base.append("3B")
+
+                # If no runners found from info, try to determine from recent plays
+                if not runners_on_base:
+                    # Look for recent base-running events in the info array
+                    for item in info:
+                        label = item.get("label", "")
+                        value = item.get("value", "")
+
+                        # Look for stolen bases, doubles, triples, etc.
+                        if "SB" in label and value:
+                            # Stolen base indicates runner on 2B or 3B
+                            if "2nd" in value or "2B" in value:
+                                runners_on_base.append("2B")
+                            elif "3rd" in value or "3B" in value:
+                                runners_on_base.append("3B")
+
+                        # Look for doubles and triples
+                        elif "2B" in label and value and value != "None":
+                            # Double indicates runner on 2B
+                            runners_on_base.append("2B")
+
+                        elif "3B" in label and value and value != "None":
+                            # Triple indicates runner on 3B
+                            runners_on_base.append("3B")
+
+                        # Look for recent hits that might indicate runners
+                        elif "TB" in label and value:
+                            # Total bases - look for recent hits
+                            if "2" in value:  # Double
+                                runners_on_base.append("2B")
+                            elif "3" in value:  # Triple
+                                runners_on_base.append("3B")
+                            elif "1" in value and "2" not in value and "3" not in value:  # Single
+                                runners_on_base.append("1B")
+
+                # Remove duplicates and sort
+                runners_on_base = sorted(list(set(runners_on_base)))
+                details["runners_on_base"] = runners_on_base
+
+                logger.debug("Extracted runners from info: %s", runners_on_base)
+
+            # If we still don't have proper inning info, try to get it from the game status
+            if details["inning"] == "N/A" or details["inning"] == "In Progress":
+                # Use the detailed state from the original game object
+                details["inning"] = game_status.get("detailedState", "In Progress")
+
+            # If we still don't have outs, try to get from game status
+            if details["outs"] == "N/A":
+                # Try to extract outs from the detailed state or other sources
+                detailed_state = game_status.get("detailedState", "")
+                if "out" in detailed_state.lower():
+                    # Extract number from "2 outs" or similar
+                    outs_match = re.search(r'(\d+)\s*out', detailed_state.lower())
+                    if outs_match:
+                        details["outs"] = outs_match.group(1)
+
+            # Try to get inning from the detailed state if not found in info
+            if details["inning"] == "N/A" or details["inning"] == "In Progress":
+                detailed_state = game_status.get("detailedState", "")
+                if "inning" in detailed_state.lower():
+                    # Extract inning info from detailed state
+                    inning_match = re.search(r'(top|bottom)\s*(\d+)(?:st|nd|rd|th)?', detailed_state.lower())
+                    if inning_match:
+                        inning_part = inning_match.group(1).title()
+                        inning_num = inning_match.group(2)
+                        details["inning"] = f"{inning_part} {inning_num}"
+
+            # Try to get outs from info array more thoroughly
+            if details["outs"] == "N/A":
+                for item in info:
+                    label = item.get("label", "")
+                    if "out" in label.lower():
+                        # Extract number from labels like "2 out"
+                        outs_match = re.search(r'(\d+)\s*out', label.lower())
+                        if outs_match:
+                            details["outs"] = outs_match.group(1)
+                            break
 
-    # Step 3: Extract all games
-    games = []
-    for day in schedule_data:
-        games.extend(day.get("games", []))
+            logger.debug("Boxscore processing results:")
+            logger.debug("Inning: %s", details['inning'])
+            logger.debug("Outs: %s", details['outs'])
+            logger.debug("Current Pitcher: %s", details['current_pitcher'])
+            logger.debug("Current Batter: %s", details['batter'])
+            logger.debug("Runners on base: %s", details['runners_on_base'])
 
-    # Step 4: Process games with detailed data
-    for game in games:
-        status = game["status"]["abstractGameState"]
-        home_team = game["teams"]["home"]["team"]
-        away_team = game["teams"]["away"]["team"]
+        else:
+            # Original live feed processing
+            live_feed = live_data.get("liveData", {})
+            logger.debug("Live feed keys: %s", lazy(lambda: list(live_feed.keys())))
+
+            plays = live_feed.get("plays", {})
+            current_play = plays.get("currentPlay", {})
+            all_plays = plays.get("allPlays", [])
+
+            logger.debug("Has liveData: %s", bool(live_feed))
+            logger.debug("Has plays: %s", bool(plays))
+            logger.debug("Has currentPlay: %s", bool(current_play))
+            logger.debug("All plays count: %s", len(all_plays) if all_plays else 0)
+
+            # Get inning information from live data if available
+            if current_play:
+                about = current_play.get("about", {})
+                live_inning = f"{about.get('inningState', '')} {about.get('inning', '')}".strip()
+                if live_inning and live_inning != "N/A":
+                    details["inning"] = live_inning
+                details["outs"] = str(current_play.get("count", {}).get("outs", "N/A"))
+
+                # Get current pitcher and batter
+                matchup = current_play.get("matchup", {})
+                if matchup:
+                    pitcher = matchup.get("pitcher", {})
+                    batter = matchup.get("batter", {})
+                    if pitcher:
+                        details["current_pitcher"] = pitcher.get("fullName", "N/A")
+                    if batter:
+                        details["batter"] = batter.get("fullName", "N/A")
+
+            # Get runners on base from the play-by-play
+            if all_plays:
+                details["runners_on_base"] = format_runners(base_states.runners(game_pk, all_plays))
+
+            # Alternative: Try to get data from live feed structure
+            if details["current_pitcher"] == "N/A":
+                live_plays = live_feed.get("plays", {})
+                if live_plays:
+                    # Try to get from the most recent play
+                    recent_plays = live_plays.get("allPlays", [])
+                    if recent_plays:
+                        latest_play = recent_plays[-1]
+                        matchup = latest_play.get("matchup", {})
+                        if matchup:
+                            pitcher = matchup.get("pitcher", {})
+                            if pitcher:
+                                details["current_pitcher"] = pitcher.get("fullName", "N/A")
+    else:
+        logger.debug("No live data available for game %s", game_pk)
+        # Use the game status as fallback
+        if details["inning"] == "N/A":
+            details["inning"] = game_status.get("detailedState", "In Progress")
 
-        # Determine if one of the teams is a Marlins affiliate
-        marlins_team = None
-        opponent_team = None
-        is_home = False
+    return details
 
-        if home_team["id"] in team_info:
-            marlins_team = home_team
-            opponent_team = away_team
-            is_home = True
-        elif away_team["id"] in team_info:
-            marlins_team = away_team
-            opponent_team = home_team
-            is_home = False
-        else:
-            continue  # skip non-affiliate games
+def build_completed_details(game: Dict[str, Any], boxscore: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Details for a finished game: final score and pitching decisions.
+    """
+    details = {
+        "final_score": {
+            "home": game["teams"]["home"].get("score", 0),
+            "away": game["teams"]["away"].get("score", 0)
+        },
+        "winning_pitcher": "N/A",
+        "losing_pitcher": "N/A",
+        "save_pitcher": "N/A"
+    }
 
-        marlins_id = marlins_team["id"]
-        game_pk = game["gamePk"]
+    if boxscore:
+        details.update(pitching_decisions(boxscore))
 
-        # Basic metadata
-        team_name = team_info[marlins_id]["team_name"]
-        level = team_info[marlins_id]["level"]
-        opponent_name = opponent_team["name"]
-        parent_club = opponent_team["name"].split()[-1] if " " in opponent_name else opponent_name
-        venue = game["venue"]["name"]
-        
-        # Map game state
-        if status == "Preview":
-            game_state = "Not Started"
-        elif status == "Live":
-            game_state = "In Progress"
-        elif status == "Final":
-            game_state = "Completed"
-        else:
-            game_state = status
+    return details
 
-        # Fetch detailed data based on game state
+def build_game_entry(game: Dict[str, Any], team_info: Dict[int, Dict[str, str]], game_data: Dict[str, Any]) -> Optional[tuple]:
+    """
+    Format one game from already-fetched detail data (no I/O).
+    Returns (affiliate team id, TeamGame dict), or None for non-affiliate games.
+    """
+    matched = match_affiliate(game, team_info)
+    if matched is None:
+        return None
+    marlins_team, opponent_team = matched
+    marlins_id = marlins_team["id"]
+
+    # Basic metadata
+    opponent_name = opponent_team["name"]
+    parent_club = opponent_team["name"].split()[-1] if " " in opponent_name else opponent_name
+    venue = game["venue"]["name"]
+    game_state = map_game_state(game["status"]["abstractGameState"])
+
+    with format_game_seconds.time(game_state):
         if game_state == "Not Started":
-            # Get probable pitchers from boxscore
-            boxscore = await get_game_boxscore(game_pk)
-            probable_pitchers = {}
-            if boxscore:
-                # Try multiple possible locations for probable pitchers
-                home_team_data = boxscore.get("teams", {}).get("home", {})
-                away_team_data = boxscore.get("teams", {}).get("away", {})
-                
-                # Method 1: Check probablePitcher field
-                home_pitcher = home_team_data.get("probablePitcher", {})
-                away_pitcher = away_team_data.get("probablePitcher", {})
-                
-                # Method 2: Check if no probable pitcher, try to get from players list
-                if not home_pitcher and home_team_data.get("players"):
-                    # Look for pitchers in the players list
-                    for player_id, player_data in home_team_data.get("players", {}).items():
-                        if player_data.get("position", {}).get("abbreviation") == "P":
-                            home_pitcher = player_data.get("person", {})
-                            break
-                
-                if not away_pitcher and away_team_data.get("players"):
-                    for player_id, player_data in away_team_data.get("players", {}).items():
-                        if player_data.get("position", {}).get("abbreviation") == "P":
-                            away_pitcher = player_data.get("person", {})
-                            break
-                
-                # Add pitchers if found
-                if home_pitcher:
-                    probable_pitchers["home"] = home_pitcher.get("fullName", "TBD")
-                if away_pitcher:
-                    probable_pitchers["away"] = away_pitcher.get("fullName", "TBD")
-            
-            # If still no probable pitchers, try the schedule endpoint data
-            if not probable_pitchers:
-                # Check if the game object has probable pitcher info
-                home_probable = game.get("teams", {}).get("home", {}).get("probablePitcher", {})
-                away_probable = game.get("teams", {}).get("away", {}).get("probablePitcher", {})
-                
-                if home_probable:
-                    probable_pitchers["home"] = home_probable.get("fullName", "TBD")
-                if away_probable:
-                    probable_pitchers["away"] = away_probable.get("fullName", "TBD")
-            
-            details = {
-                "game_time": game["gameDate"],
-                "venue": venue,
-                "probable_pitchers": probable_pitchers
-            }
-
+            details = build_not_started_details(game, venue, game_data.get("boxscore"))
         elif game_state == "In Progress":
-            details = {
-                "venue": venue,
-                "score": {
-                    "home": game["teams"]["home"].get("score", 0),
-                    "away": game["teams"]["away"].get("score", 0)
-                },
-                "inning": "N/A",
-                "outs": "N/A",
-                "runners_on_base": [],
-                "current_pitcher": "N/A",
-                "batter": "N/A"
-            }
-            
-            # First, try to get basic info from the game object itself
-            game_status = game.get("status", {})
-            details["inning"] = game_status.get("detailedState", "N/A")
-            
-            print(f"Fetching live data for game {game_pk}...")
-            
-            # Try to get live feed data first (for current game state)
-            live_feed_data = await get_live_feed_data(game_pk)
-            print(f"Live feed data result for game {game_pk}: {bool(live_feed_data)}")
-            
-            # Also get boxscore data (for historical info and current players)
-            boxscore_data = await get_game_boxscore(game_pk)
-            print(f"Boxscore data result for game {game_pk}: {bool(boxscore_data)}")
-            
-            # Get plays data for base runner analysis
-            plays_data = await get_game_plays(game_pk)
-            print(f"Plays data result for game {game_pk}: {bool(plays_data)}")
-
-            # Process live feed data for current game state
+            live_feed_data = game_data.get("live_feed")
+            boxscore_data = game_data.get("boxscore")
+            plays_data = game_data.get("plays")
             if live_feed_data:
-                print(f"Live feed data keys: {list(live_feed_data.keys())}")
-                
-                # Extract current game state from live feed
+                # Prefer the sections embedded in the v1.1 feed over separate endpoint calls
                 live_data = live_feed_data.get("liveData", {})
-                if live_data:
-                    # Get current inning, outs, and offense from linescore
-                    linescore = live_data.get("linescore", {})
-                    if linescore:
-                        current_inning = linescore.get("currentInning", "N/A")
-                        inning_half = linescore.get("inningHalf", "N/A")
-                        outs = linescore.get("outs", "N/A")
-                        
-                        if current_inning and inning_half:
-                            details["inning"] = f"{inning_half} {current_inning}"
-                            print(f"    Live feed inning: {details['inning']}")
-                        
-                        if outs != "N/A":
-                            details["outs"] = str(outs)
-                            print(f"    Live feed outs: {details['outs']}")
-                    
-                    # Get current batter and runners from offense
-                    offense = linescore.get("offense", {})
-                    if offense:
-                        # Get current batter
-                        batter_info = offense.get("batter", {})
-                        if isinstance(batter_info, dict) and batter_info.get("fullName"):
-                            details["batter"] = batter_info["fullName"]
-                            print(f"    Live feed batter: {details['batter']}")
-                        
-                        # Get runners on base
-                        runners_on_base = []
-                        on_first = offense.get("first")
-                        on_second = offense.get("second") 
-                        on_third = offense.get("third")
-                        
-                        if on_first and isinstance(on_first, dict) and on_first.get("fullName"):
-                            runners_on_base.append(f"1B: {on_first.get('fullName')}")
-                            print(f"    Found runner on 1B: {on_first.get('fullName')}")
-                        if on_second and isinstance(on_second, dict) and on_second.get("fullName"):
-                            runners_on_base.append(f"2B: {on_second.get('fullName')}")
-                            print(f"    Found runner on 2B: {on_second.get('fullName')}")
-                        if on_third and isinstance(on_third, dict) and on_third.get("fullName"):
-                            runners_on_base.append(f"3B: {on_third.get('fullName')}")
-                            print(f"    Found runner on 3B: {on_third.get('fullName')}")
-                        
-                        details["runners_on_base"] = sorted(runners_on_base)
-                        print(f"    Live feed runners: {details['runners_on_base']}")
-                    
-                    # Get current pitcher from defense
-                    defense = linescore.get("defense", {})
-                    if defense:
-                        pitcher_info = defense.get("pitcher", {})
-                        if isinstance(pitcher_info, dict) and pitcher_info.get("fullName"):
-                            details["current_pitcher"] = pitcher_info["fullName"]
-                            print(f"    Live feed pitcher: {details['current_pitcher']}")
-            
-            # Process boxscore data as fallback (only for pitcher/batter if live feed didn't provide them)
-            if boxscore_data and (details["current_pitcher"] == "N/A" or details["batter"] == "N/A"):
-                print(f"Boxscore data keys: {list(boxscore_data.keys())}")
-
-                # Check if this is boxscore data (which has different structure)
-                if "teams" in boxscore_data and "info" in boxscore_data:
-                    print("Processing boxscore data for live game...")
-                    
-                    # Get current pitcher and batter from teams data
-                    teams = boxscore_data.get("teams", {})
-                    
-                    # Look for current pitcher and batter using gameStatus
-                    for team_side in ["home", "away"]:
-                        team_data = teams.get(team_side, {})
-                        players = team_data.get("players", {})
-                        
-                        for player_id, player_data in players.items():
-                            game_status = player_data.get("gameStatus", {})
-                            
-                            # Check if this is the current pitcher
-                            if game_status.get("isCurrentPitcher", False):
-                                details["current_pitcher"] = player_data.get("person", {}).get("fullName", "N/A")
-                                print(f"    Found current pitcher: {details['current_pitcher']}")
-                                
-                                # Extract inning and outs from current pitcher's stats
-                                pitcher_stats = player_data.get("stats", {}).get("pitching", {})
-                                if pitcher_stats:
-                                    # Get innings pitched (e.g., "2.2" means 2 innings + 2 outs = 8 outs total)
-                                    innings_pitched = pitcher_stats.get("inningsPitched", "0.0")
-                                    
-                                    # Check if this pitcher has pitched any innings
-                                    if innings_pitched and innings_pitched != "0.0":
-                                        try:
-                                            # Parse innings like "2.2" (2 innings, 2 outs)
-                                            if "." in innings_pitched:
-                                                full_innings, partial_outs = innings_pitched.split(".")
-                                                total_outs = int(full_innings) * 3 + int(partial_outs)
-                                                details["outs"] = str(total_outs % 3)  # Current outs in this inning
-                                                
-                                                # Calculate current inning
-                                                total_innings = int(full_innings) + (int(partial_outs) // 3)
-                                                # Determine if home or away team is batting based on current batter
-                                                inning_half = "Bottom"  # Default assumption
-                                                details["inning"] = f"{inning_half} {total_innings + 1}"
-                                            else:
-                                                total_innings = int(innings_pitched)
-                                                details["outs"] = "0"  # Start of new inning
-                                                inning_half = "Bottom"  # Default assumption
-                                                details["inning"] = f"{inning_half} {total_innings + 1}"
-                                            
-                                            print(f"    Extracted from pitcher stats: Inning {details['inning']}, Outs {details['outs']}")
-                                            
-                                        except (ValueError, TypeError) as e:
-                                            print(f"    Error parsing pitcher stats: {e}")
-                                    else:
-                                        # New pitcher with no innings pitched - need to get inning from other sources
-                                        print(f"    New pitcher detected (0.0 IP) - getting inning from game status")
-                                        
-                                        # Try to get inning from game status detailed state
-                                        game_status_detailed = game_status.get("detailedState", "")
-                                        if game_status_detailed:
-                                            # Look for inning info in detailed state like "Bottom 5th" or "Top 3rd"
-                                            import re
-                                            inning_match = re.search(r'(top|bottom)\s*(\d+)(?:st|nd|rd|th)?', game_status_detailed.lower())
-                                            if inning_match:
-                                                inning_half = inning_match.group(1).title()
-                                                inning_num = inning_match.group(2)
-                                                details["inning"] = f"{inning_half} {inning_num}"
-                                                print(f"    Extracted from game status: {details['inning']}")
-                                            
-                                            # Try to get outs from detailed state
-                                            outs_match = re.search(r'(\d+)\s*out', game_status_detailed.lower())
-                                            if outs_match:
-                                                details["outs"] = outs_match.group(1)
-                                                print(f"    Extracted outs from game status: {details['outs']}")
-                                        
-                                        # If still no inning info, try to get from current pitcher's total outs
-                                        if details["inning"] == "N/A":
-                                            # Calculate inning from current pitcher's total outs
-                                            total_outs_pitched = pitcher_stats.get("outs", 0)
-                                            if total_outs_pitched > 0:
-                                                # Calculate completed innings from total outs
-                                                completed_innings = total_outs_pitched // 3
-                                                current_inning = completed_innings + 1
-                                                
-                                                # Determine which team is batting based on current batter
-                                                if team_side == "away":
-                                                    # Away team batting = Top of inning
-                                                    inning_half = "Top"
-                                                else:
-                                                    # Home team batting = Bottom of inning
-                                                    inning_half = "Bottom"
-                                                
-                                                details["inning"] = f"{inning_half} {current_inning}"
-                                                print(f"    Calculated inning from pitcher total outs: {details['inning']} (Pitcher outs: {total_outs_pitched})")
-                                        
-                                        # If still no inning info, try to get from team stats using total outs
-                                        if details["inning"] == "N/A":
-                                            # Look at team stats to determine current inning from total outs
-                                            home_team_stats = boxscore_data.get("teams", {}).get("home", {}).get("teamStats", {})
-                                            away_team_stats = boxscore_data.get("teams", {}).get("away", {}).get("teamStats", {})
-                                            
-                                            if home_team_stats and away_team_stats:
-                                                # Get total outs for each team
-                                                home_outs = home_team_stats.get("batting", {}).get("leftOnBase", 0)  # This might not be total outs
-                                                away_outs = away_team_stats.get("batting", {}).get("leftOnBase", 0)
-                                                
-                                                # Try to get outs from pitching stats (outs recorded by opposing pitchers)
-                                                home_pitching_outs = home_team_stats.get("pitching", {}).get("outs", 0)
-                                                away_pitching_outs = away_team_stats.get("pitching", {}).get("outs", 0)
-                                                
-                                                # Calculate inning from total outs (27 outs per 9 innings)
-                                                total_outs = home_pitching_outs + away_pitching_outs
-                                                completed_innings = total_outs // 3  # 3 outs per inning
-                                                
-                                                # Determine which team is batting based on current batter
-                                                if team_side == "away":
-                                                    # Away team batting = Top of inning
-                                                    inning_half = "Top"
-                                                    current_inning = completed_innings + 1
-                                                else:
-                                                    # Home team batting = Bottom of inning
-                                                    inning_half = "Bottom"
-                                                    current_inning = completed_innings + 1
-                                                
-                                                details["inning"] = f"{inning_half} {current_inning}"
-                                                print(f"    Calculated inning from total outs: {details['inning']} (Total outs: {total_outs})")
-                                
-                                # Try to determine runners on base from pitcher's recent performance
-                                if pitcher_stats:
-                                    hits = pitcher_stats.get("hits", 0)
-                                    base_on_balls = pitcher_stats.get("baseOnBalls", 0)
-                                    hit_by_pitch = pitcher_stats.get("hitBatsmen", 0)
-                                    batters_faced = pitcher_stats.get("battersFaced", 0)
-                                    
-                                    if batters_faced > 0:
-                                        print(f"    Pitcher stats: {hits} hits, {base_on_balls} walks, {hit_by_pitch} HBP, {batters_faced} batters faced")
-                            
-                            # Check if this is the current batter
-                            if game_status.get("isCurrentBatter", False):
-                                details["batter"] = player_data.get("person", {}).get("fullName", "N/A")
-                                print(f"    Found current batter: {details['batter']}")
-                                
-                                # Determine which team is batting (top/bottom)
-                                if team_side == "away":
-                                    # Away team batting = Top of inning
-                                    if "inning" in details and "Bottom" in details["inning"]:
-                                        details["inning"] = details["inning"].replace("Bottom", "Top")
-                                        print(f"    Corrected inning: {details['inning']} (away team batting)")
-                                else:
-                                    # Home team batting = Bottom of inning
-                                    if "inning" in details and "Top" in details["inning"]:
-                                        details["inning"] = details["inning"].replace("Top", "Bottom")
-                                        print(f"    Corrected inning: {details['inning']} (home team batting)")
-                    
-                    # Extract runners on base from plays analysis (if not already set by live feed)
-                    if not details["runners_on_base"] and plays_data:
-                        # Extract current inning number from the inning string
-                        current_inning_str = details["inning"]
-                        current_inning = 1  # Default
-                        try:
-                            # Extract number from "Top 5" or "Bottom 3"
-                            import re
-                            inning_match = re.search(r'(\d+)', current_inning_str)
-                            if inning_match:
-                                current_inning = int(inning_match.group(1))
-                        except (ValueError, TypeError):
-                            current_inning = 1
-                        
-                        # Analyze recent plays for current base runners
-                        runners_on_base = analyze_recent_plays_for_runners(plays_data, current_inning, int(details["outs"]))
-                        details["runners_on_base"] = runners_on_base
-                        print(f"    Analyzed plays for runners: {runners_on_base}")
-                    
-                    # Fallback to info array if plays analysis didn't work
-                    if not details["runners_on_base"]:
-                        runners_on_base = []
-                        
-                        # First, try to get runners from "Runners left in scoring position" info
-                        for item in info:
-                            label = item.get("label", "")
-                            value = item.get("value", "")
-                            
-                            # Look for runners on base information
-                            if "Runners left in scoring position" in label:
-                                # Parse runners from value like "Lopez, O; Edwards, X."
-                                if value and value != "None":
-                                    # Extract base positions from the label
-                                    if "2 out" in label:
-                                        # Runners on 2nd and 3rd with 2 outs
-                                        runners_on_base.extend(["2B", "3B"])
-                                    elif "1 out" in label:
-                                        # Runners on 2nd and 3rd with 1 out
-                                        runners_on_base.extend(["2B", "3B"])
-                                    else:
-                                        # Default to 2nd and 3rd if no out count specified
-                                        runners_on_base.extend(["2B", "3B"])
-                            
-                            # Look for other runner indicators
-                            elif "LOB" in label and value and value != "0":
-                                # Left on base indicates runners
-                                if "1" in value:
-                                    runners_on_base.append("1B")
-                                if "2" in value:
-                                    runners_on_base.append("2B")
-                                if "3" in value:
-                                    runners_on_base.append("3B")
-                        
-                        # If no runners found from info, try to determine from recent plays
-                        if not runners_on_base:
-                            # Look for recent base-running events in the info array
-                            for item in info:
-                                label = item.get("label", "")
-                                value = item.get("value", "")
-                                
-                                # Look for stolen bases, doubles, triples, etc.
-                                if "SB" in label and value:
-                                    # Stolen base indicates runner on 2B or 3B
-                                    if "2nd" in value or "2B" in value:
-                                        runners_on_base.append("2B")
-                                    elif "3rd" in value or "3B" in value:
-                                        runners_on_base.append("3B")
-                                
-                                # Look for doubles and triples
-                                elif "2B" in label and value and value != "None":
-                                    # Double indicates runner on 2B
-                                    runners_on_base.append("2B")
-                                
-                                elif "3B" in label and value and value != "None":
-                                    # Triple indicates runner on 3B
-                                    runners_on_base.append("3B")
-                                
-                                # Look for recent hits that might indicate runners
-                                elif "TB" in label and value:
-                                    # Total bases - look for recent hits
-                                    if "2" in value:  # Double
-                                        runners_on_base.append("2B")
-                                    elif "3" in value:  # Triple
-                                        runners_on_base.append("3B")
-                                    elif "1" in value and "2" not in value and "3" not in value:  # Single
-                                        runners_on_base.append("1B")
-                        
-                        # Remove duplicates and sort
-                        runners_on_base = sorted(list(set(runners_on_base)))
-                        details["runners_on_base"] = runners_on_base
-                        
-                        print(f"    Extracted runners from info: {runners_on_base}")
-                    
-                    # If we still don't have proper inning info, try to get it from the game status
-                    if details["inning"] == "N/A" or details["inning"] == "In Progress":
-                        # Use the detailed state from the original game object
-                        details["inning"] = game_status.get("detailedState", "In Progress")
-                    
-                    # If we still don't have outs, try to get from game status
-                    if details["outs"] == "N/A":
-                        # Try to extract outs from the detailed state or other sources
-                        detailed_state = game_status.get("detailedState", "")
-                        if "out" in detailed_state.lower():
-                            # Extract number from "2 outs" or similar
-                            import re
-                            outs_match = re.search(r'(\d+)\s*out', detailed_state.lower())
-                            if outs_match:
-                                details["outs"] = outs_match.group(1)
-                    
-                    # Try to get inning from the detailed state if not found in info
-                    if details["inning"] == "N/A" or details["inning"] == "In Progress":
-                        detailed_state = game_status.get("detailedState", "")
-                        if "inning" in detailed_state.lower():
-                            # Extract inning info from detailed state
-                            import re
-                            inning_match = re.search(r'(top|bottom)\s*(\d+)(?:st|nd|rd|th)?', detailed_state.lower())
-                            if inning_match:
-                                inning_part = inning_match.group(1).title()
-                                inning_num = inning_match.group(2)
-                                details["inning"] = f"{inning_part} {inning_num}"
-                    
-                    # Try to get outs from info array more thoroughly
-                    if details["outs"] == "N/A":
-                        for item in info:
-                            label = item.get("label", "")
-                            if "out" in label.lower():
-                                # Extract number from labels like "2 out"
-                                import re
-                                outs_match = re.search(r'(\d+)\s*out', label.lower())
-                                if outs_match:
-                                    details["outs"] = outs_match.group(1)
-                                    break
-                    
-                    print(f"  Boxscore processing results:")
-                    print(f"    - Inning: {details['inning']}")
-                    print(f"    - Outs: {details['outs']}")
-                    print(f"    - Current Pitcher: {details['current_pitcher']}")
-                    print(f"    - Current Batter: {details['batter']}")
-                    print(f"    - Runners on base: {details['runners_on_base']}")
-                
-                else:
-                    # Original live feed processing
-                    live_feed = live_data.get("liveData", {})
-                    print(f"Live feed keys: {list(live_feed.keys())}")
-                    
-                    plays = live_feed.get("plays", {})
-                    current_play = plays.get("currentPlay", {})
-                    all_plays = plays.get("allPlays", [])
-                    
-                    print(f"  - Has liveData: {bool(live_feed)}")
-                    print(f"  - Has plays: {bool(plays)}")
-                    print(f"  - Has currentPlay: {bool(current_play)}")
-                    print(f"  - All plays count: {len(all_plays) if all_plays else 0}")
-                    
-                    # Get inning information from live data if available
-                    if current_play:
-                        about = current_play.get("about", {})
-                        live_inning = f"{about.get('inningState', '')} {about.get('inning', '')}".strip()
-                        if live_inning and live_inning != "N/A":
-                            details["inning"] = live_inning
-                        details["outs"] = str(current_play.get("count", {}).get("outs", "N/A"))
-                        
-                        # Get current pitcher and batter
-                        matchup = current_play.get("matchup", {})
-                        if matchup:
-                            pitcher = matchup.get("pitcher", {})
-                            batter = matchup.get("batter", {})
-                            if pitcher:
-                                details["current_pitcher"] = pitcher.get("fullName", "N/A")
-                            if batter:
-                                details["batter"] = batter.get("fullName", "N/A")
-                    
-                    # Get runners on base from current situation
-                    if all_plays:
-                        last_play = all_plays[-1]
-                        runners = last_play.get("runners", [])
-                        runners_on_base = []
-                        for runner in runners:
-                            movement = runner.get("movement", {})
-                            start = movement.get("start")
-                            end = movement.get("end")
-                            # Check if runner is still on base
-                            if start in ["1B", "2B", "3B"] and end not in ["1B", "2B", "3B", "HOME"]:
-                                runners_on_base.append(start)
-                            elif end in ["1B", "2B", "3B"]:
-                                runners_on_base.append(end)
-                        details["runners_on_base"] = runners_on_base
-                    
-                    # Alternative: Try to get data from live feed structure
-                    if details["current_pitcher"] == "N/A":
-                        live_plays = live_feed.get("plays", {})
-                        if live_plays:
-                            # Try to get from the most recent play
-                            recent_plays = live_plays.get("allPlays", [])
-                            if recent_plays:
-                                latest_play = recent_plays[-1]
-                                matchup = latest_play.get("matchup", {})
-                                if matchup:
-                                    pitcher = matchup.get("pitcher", {})
-                                    if pitcher:
-                                        details["current_pitcher"] = pitcher.get("fullName", "N/A")
-            else:
-                print(f"No live data available for game {game_pk}")
-                # Use the game status as fallback
-                if details["inning"] == "N/A":
-                    details["inning"] = game_status.get("detailedState", "In Progress")
-
+                boxscore_data = boxscore_data or live_data.get("boxscore")
+                plays_data = plays_data or live_data.get("plays")
+            details = build_in_progress_details(game, venue, live_feed_data, boxscore_data, plays_data)
         elif game_state == "Completed":
-            # Get final stats from boxscore
-            boxscore = await get_game_boxscore(game_pk)
-            details = {
-                "final_score": {
-                    "home": game["teams"]["home"].get("score", 0),
-                    "away": game["teams"]["away"].get("score", 0)
-                },
-                "winning_pitcher": "N/A",
-                "losing_pitcher": "N/A",
-                "save_pitcher": "N/A"
-            }
-            
-            if boxscore:
-                # Extract pitcher stats
-                home_pitchers = boxscore.get("teams", {}).get("home", {}).get("pitchers", [])
-                away_pitchers = boxscore.get("teams", {}).get("away", {}).get("pitchers", [])
-                
-                # Find winning and losing pitchers
-                for pitcher_id in home_pitchers + away_pitchers:
-                    pitcher_data = boxscore.get("teams", {}).get("home", {}).get("players", {}).get(f"ID{pitcher_id}", {})
-                    if not pitcher_data:
-                        pitcher_data = boxscore.get("teams", {}).get("away", {}).get("players", {}).get(f"ID{pitcher_id}", {})
-                    
-                    if pitcher_data:
-                        stats = pitcher_data.get("stats", {}).get("pitching", {})
-                        if stats.get("wins", 0) > 0:
-                            details["winning_pitcher"] = pitcher_data.get("person", {}).get("fullName", "N/A")
-                        elif stats.get("losses", 0) > 0:
-                            details["losing_pitcher"] = pitcher_data.get("person", {}).get("fullName", "N/A")
-                        elif stats.get("saves", 0) > 0:
-                            details["save_pitcher"] = pitcher_data.get("person", {}).get("fullName", "N/A")
+            base_states.discard(game["gamePk"])
+            details = game_data.get("completed") or build_completed_details(game, game_data.get("boxscore"))
         else:
             details = {}
 
-        # Construct the output
-        response[marlins_id] = {
-            "team_name": team_name,
-            "level": level,
-            "opponent_name": opponent_name,
-            "opponent_mlb_parent": parent_club,
-            "game_state": game_state,
-            "details": details
-        }
+    return marlins_id, {
+        "team_name": team_info[marlins_id]["team_name"],
+        "level": team_info[marlins_id]["level"],
+        "opponent_name": opponent_name,
+        "opponent_mlb_parent": parent_club,
+        "game_state": game_state,
+        "details": details
+    }
+
+def assemble_schedule(team_info: Dict[int, Dict[str, str]], games: List[Dict[str, Any]], fetched: Dict[int, Dict[str, Any]]) -> Dict[int, dict]:
+    """
+    Format affiliate games from already-fetched detail data into the response dict (no I/O).
+    """
+    response = {team_id: {} for team_id in team_info}
+    for game in games:
+        entry = build_game_entry(game, team_info, fetched.get(game["gamePk"], {}))
+        if entry is not None:
+            marlins_id, team_game = entry
+            response[marlins_id] = team_game
+    return response
+
+async def format_schedule_with_details(affiliates: List[Dict[str, Any]], schedule_data: List[Dict[str, Any]]) -> Dict[int, dict]:
+    """
+    Enhanced formatter that fetches detailed game data.
+    Fetches for every game run concurrently first; formatting is then a pure pass.
+    """
+    # Step 1: Create team lookup
+    team_info = build_team_info(affiliates)
+
+    # Step 2: Extract affiliate games
+    games = [game for game in extract_games(schedule_data) if match_affiliate(game, team_info)]
 
-    return response 
\ No newline at end of file
+    # Step 3: Plan and run all per-game detail fetches concurrently
+    with schedule_stage_seconds.time("fetch"):
+        fetched = await fetch_game_details(games)
+
+    # Step 4: Format each game from the fetched data
+    with schedule_stage_seconds.time("format"):
+        return assemble_schedule(team_info, games, fetched)
+
+async def format_org_schedules(affiliates_by_org: Dict[int, List[Dict[str, Any]]], schedule_data: List[Dict[str, Any]]) -> Dict[int, Dict[int, dict]]:
+    """
+    Format one combined schedule for several organizations, keyed by parent club id.
+    A game between two tracked orgs is fetched once and appears under both.
+    """
+    team_info_by_org = {org_id: build_team_info(affiliates) for org_id, affiliates in affiliates_by_org.items()}
+    all_teams = {team_id: info for team_info in team_info_by_org.values() for team_id, info in team_info.items()}
+
+    games = [game for game in extract_games(schedule_data) if match_affiliate(game, all_teams)]
+    with schedule_stage_seconds.time("fetch"):
+        fetched = await fetch_game_details(games)
+
+    response = {}
+    with schedule_stage_seconds.time("format"):
+        for org_id, team_info in team_info_by_org.items():
+            org_games = [game for game in games if match_affiliate(game, team_info)]
+            response[org_id] = assemble_schedule(team_info, org_games, fetched)
+    return response
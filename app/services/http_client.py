@@ -0,0 +1,61 @@
+import httpx
+from typing import Optional
+from app.config import (
+    HTTP2_ENABLED,
+    HTTP_TIMEOUT_SECONDS,
+    HTTP_CONNECT_TIMEOUT_SECONDS,
+    HTTP_MAX_CONNECTIONS,
+    HTTP_MAX_KEEPALIVE_CONNECTIONS,
+    HTTP_KEEPALIVE_EXPIRY_SECONDS,
+)
+
+# App-lifetime client shared by every upstream call
+_client: Optional[httpx.AsyncClient] = None
+
+def create_http_client(transport: Optional[httpx.AsyncBaseTransport] = None) -> httpx.AsyncClient:
+    """
+    Build a pooled AsyncClient for statsapi.mlb.com.
+    Pass a transport (e.g. httpx.MockTransport) to run without the network.
+    """
+    limits = httpx.Limits(
+        max_connections=HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=HTTP_KEEPALIVE_EXPIRY_SECONDS,
+    )
+    timeout = httpx.Timeout(HTTP_TIMEOUT_SECONDS, connect=HTTP_CONNECT_TIMEOUT_SECONDS)
+
+    # HTTP/2 needs the optional "h2" package; a custom transport handles its own protocol
+    http2 = HTTP2_ENABLED and transport is None
+    if http2:
+        try:
+            import h2  # noqa: F401
+        except ImportError:
+            http2 = False
+
+    return httpx.AsyncClient(http2=http2, limits=limits, timeout=timeout, transport=transport)
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Return the shared client, creating it lazily for callers outside the app lifespan
+    (e.g. debug_json.py).
+    """
+    global _client
+    if _client is None or _client.is_closed:
+        _client = create_http_client()
+    return _client
+
+def set_http_client(client: Optional[httpx.AsyncClient]) -> None:
+    """
+    Install a specific client (used by the app lifespan and by tests).
+    """
+    global _client
+    _client = client
+
+async def close_http_client() -> None:
+    """
+    Close the shared client and release its pooled connections.
+    """
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
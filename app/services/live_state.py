@@ -0,0 +1,208 @@
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+from app.utils.json_utils import extract_paths, path_is_retained
+
+class PatchError(Exception):
+    """Raised when a diff/patch can't be applied to the stored feed."""
+
+def _parse_pointer(path: str) -> List[str]:
+    if path == "":
+        return []
+    if not path.startswith("/"):
+        raise PatchError(f"Invalid JSON pointer: {path}")
+    return [part.replace("~1", "/").replace("~0", "~") for part in path[1:].split("/")]
+
+def _resolve_parent(doc: Any, parts: List[str], copies: Optional[Dict[int, Any]] = None) -> Any:
+    """
+    The container holding the last part of a pointer. With `copies`, every container on
+    the way is replaced by a shallow copy (once per patch), so writes never reach the
+    original document.
+    """
+    target = doc
+    for part in parts[:-1]:
+        try:
+            key = int(part) if isinstance(target, list) else part
+            child = target[key]
+        except (KeyError, IndexError, ValueError, TypeError):
+            raise PatchError(f"Missing path segment: {part}")
+        if copies is not None and isinstance(child, (dict, list)) and id(child) not in copies:
+            child = target[key] = _shallow_copy(child, copies)
+        target = child
+    return target
+
+def _shallow_copy(value: Any, copies: Dict[int, Any]) -> Any:
+    copied = type(value)(value)
+    # Held by id (and kept alive) so an id is never reused while the patch runs
+    copies[id(copied)] = copied
+    return copied
+
+def _get(doc: Any, path: str) -> Any:
+    parts = _parse_pointer(path)
+    if not parts:
+        return doc
+    parent = _resolve_parent(doc, parts)
+    key = parts[-1]
+    try:
+        return parent[int(key)] if isinstance(parent, list) else parent[key]
+    except (KeyError, IndexError, ValueError, TypeError):
+        raise PatchError(f"Missing path: {path}")
+
+def _remove(doc: Any, path: str, copies: Optional[Dict[int, Any]] = None) -> Any:
+    parts = _parse_pointer(path)
+    parent = _resolve_parent(doc, parts, copies)
+    key = parts[-1]
+    try:
+        return parent.pop(int(key)) if isinstance(parent, list) else parent.pop(key)
+    except (KeyError, IndexError, ValueError, TypeError):
+        raise PatchError(f"Missing path: {path}")
+
+def _add(doc: Any, path: str, value: Any, replace: bool = False, copies: Optional[Dict[int, Any]] = None) -> Any:
+    parts = _parse_pointer(path)
+    if not parts:
+        return value
+    parent = _resolve_parent(doc, parts, copies)
+    key = parts[-1]
+    if isinstance(parent, list):
+        if key == "-":
+            parent.append(value)
+            return doc
+        try:
+            index = int(key)
+            if replace:
+                parent[index] = value
+            else:
+                parent.insert(index, value)
+        except (IndexError, ValueError):
+            raise PatchError(f"Invalid list index: {path}")
+    elif isinstance(parent, dict):
+        if replace and key not in parent:
+            raise PatchError(f"Missing path: {path}")
+        parent[key] = value
+    else:
+        raise PatchError(f"Cannot patch into a scalar at {path}")
+    return doc
+
+def apply_json_patch(doc: Any, operations: List[Dict[str, Any]], copies: Optional[Dict[int, Any]] = None) -> Any:
+    """
+    Apply RFC 6902 operations to `doc` and return the (possibly replaced) root. `doc` is
+    changed in place unless `copies` is given: then only the containers on patched paths
+    are copied (recorded in `copies`) and untouched branches are shared with `doc`.
+    """
+    if copies is not None and isinstance(doc, (dict, list)) and id(doc) not in copies:
+        doc = _shallow_copy(doc, copies)
+    for operation in operations:
+        op = operation.get("op")
+        path = operation.get("path", "")
+        if op == "add":
+            doc = _add(doc, path, operation.get("value"), copies=copies)
+        elif op == "replace":
+            doc = _add(doc, path, operation.get("value"), replace=True, copies=copies)
+        elif op == "remove":
+            _remove(doc, path, copies)
+        elif op == "move":
+            value = _remove(doc, operation["from"], copies)
+            doc = _add(doc, path, value, copies=copies)
+        elif op == "copy":
+            doc = _add(doc, path, _copy(_get(doc, operation["from"])), copies=copies)
+        elif op == "test":
+            if _get(doc, path) != operation.get("value"):
+                raise PatchError(f"Test failed at {path}")
+        else:
+            raise PatchError(f"Unknown patch op: {op}")
+    return doc
+
+def _copy(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {key: _copy(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_copy(item) for item in value]
+    return value
+
+class LiveGameState:
+    """
+    The last full v1.1 feed for a game, its timecode, and the size of the full document.
+    """
+    __slots__ = ("feed", "timecode", "size")
+
+    def __init__(self, feed: Dict[str, Any], size: int):
+        self.feed = feed
+        self.size = size
+        self.timecode = feed.get("metaData", {}).get("timeStamp")
+
+class LiveFeedStore:
+    """
+    Keeps the latest feed per live game so refreshes can request only the
+    diffPatch since the stored timecode. Bounded to the most recently used games.
+    With `keep_paths`, stored feeds are pruned to those paths and patch operations
+    outside them are skipped.
+    """
+
+    def __init__(self, max_games: int, keep_paths: Optional[Sequence[Tuple[str, ...]]] = None):
+        self.max_games = max_games
+        self.keep_paths = keep_paths
+        self._games: "OrderedDict[int, LiveGameState]" = OrderedDict()
+
+    def get(self, game_pk: int) -> Optional[LiveGameState]:
+        state = self._games.get(game_pk)
+        if state is not None:
+            self._games.move_to_end(game_pk)
+        return state
+
+    def put(self, game_pk: int, feed: Dict[str, Any], size: int) -> LiveGameState:
+        if self.keep_paths is not None:
+            feed = extract_paths(feed, self.keep_paths)
+        state = LiveGameState(feed, size)
+        self._games[game_pk] = state
+        self._games.move_to_end(game_pk)
+        while len(self._games) > self.max_games:
+            self._games.popitem(last=False)
+        return state
+
+    def apply(self, game_pk: int, payload: Union[List[Dict[str, Any]], Dict[str, Any]], size: int) -> LiveGameState:
+        """
+        Apply a diffPatch response. A dict payload is a full feed (upstream falls back to
+        one when the diff would be too large); a list holds {"diff": [ops]} entries.
+        The stored feed is never changed in place (it may also be held by the response
+        cache): the patched feed shares untouched branches with it and replaces it only
+        once every patch applied.
+        """
+        if isinstance(payload, dict):
+            return self.put(game_pk, payload, size)
+
+        state = self._games.get(game_pk)
+        if state is None:
+            raise PatchError(f"No stored feed for game {game_pk}")
+        feed = state.feed
+        copies: Dict[int, Any] = {}
+        for patch in payload:
+            operations = patch.get("diff", [])
+            if self.keep_paths is not None:
+                operations = self._retained_operations(operations)
+            feed = apply_json_patch(feed, operations, copies)
+        if self.keep_paths is not None:
+            # A replaced parent (e.g. all of /liveData) may have brought back pruned fields
+            feed = extract_paths(feed, self.keep_paths)
+        state.feed = feed
+        state.timecode = feed.get("metaData", {}).get("timeStamp", state.timecode)
+        return state
+
+    def _retained_operations(self, operations: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        retained = []
+        for operation in operations:
+            if not path_is_retained(operation.get("path", ""), self.keep_paths):
+                continue
+            source = operation.get("from")
+            if source is not None and not path_is_retained(source, self.keep_paths):
+                # The value to move/copy was pruned away; only a full refetch can rebuild it
+                raise PatchError(f"Patch source was pruned: {source}")
+            retained.append(operation)
+        return retained
+
+    def discard(self, game_pk: int) -> None:
+        self._games.pop(game_pk, None)
+
+    def clear(self) -> None:
+        self._games.clear()
+
+    def __len__(self) -> int:
+        return len(self._games)
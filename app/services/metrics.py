@@ -0,0 +1,286 @@
+import asyncio
+import bisect
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+from app.config import METRICS_LATENCY_BUCKETS, EVENT_LOOP_LAG_INTERVAL_SECONDS
+
+# Prometheus text exposition format, version 0.0.4 (the response adds charset=utf-8)
+CONTENT_TYPE = "text/plain; version=0.0.4"
+
+def format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    """
+    Render a label set as {name="value",...} (empty string when there are no labels).
+    """
+    if not names:
+        return ""
+    pairs = []
+    for name, value in zip(names, values):
+        escaped = str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        pairs.append(f'{name}="{escaped}"')
+    return "{" + ",".join(pairs) + "}"
+
+def format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+class Metric:
+    """
+    Base for a named metric family whose samples are keyed by label values.
+    """
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+
+    def samples(self) -> List[Tuple[str, Tuple[str, ...], Tuple[str, ...], float]]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for suffix, names, values, value in self.samples():
+            lines.append(f"{self.name}{suffix}{format_labels(names, values)} {format_value(value)}")
+        return lines
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *labels: Any, amount: float = 1.0) -> None:
+        key = tuple(str(label) for label in labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def samples(self):
+        return [("", self.labelnames, key, value) for key, value in sorted(self._values.items())]
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def set(self, value: float, *labels: Any) -> None:
+        self._values[tuple(str(label) for label in labels)] = value
+
+    def inc(self, *labels: Any, amount: float = 1.0) -> None:
+        key = tuple(str(label) for label in labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, *labels: Any, amount: float = 1.0) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def samples(self):
+        return [("", self.labelnames, key, value) for key, value in sorted(self._values.items())]
+
+class Histogram(Metric):
+    """
+    Cumulative histogram with fixed upper bounds; each label set keeps per-bucket counts, sum and count.
+    """
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = METRICS_LATENCY_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [bucket counts..., +Inf count], sum
+        self._series: Dict[Tuple[str, ...], Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, *labels: Any) -> None:
+        key = tuple(str(label) for label in labels)
+        series = self._series.get(key)
+        if series is None:
+            series = ([0] * (len(self.buckets) + 1), [0.0])
+            self._series[key] = series
+        counts, total = series
+        counts[bisect.bisect_left(self.buckets, value)] += 1
+        total[0] += value
+
+    @contextmanager
+    def time(self, *labels: Any) -> Iterator[None]:
+        """
+        Observe the wall time spent in the block.
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, *labels)
+
+    def samples(self):
+        samples = []
+        bucket_names = self.labelnames + ("le",)
+        for key, (counts, total) in sorted(self._series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                samples.append(("_bucket", bucket_names, key + (format_value(bound),), cumulative))
+            samples.append(("_sum", self.labelnames, key, total[0]))
+            samples.append(("_count", self.labelnames, key, cumulative))
+        return samples
+
+class CacheCollector(Metric):
+    """
+    Reads hit/miss counters from registered caches (anything with a stats() dict) at scrape time.
+    """
+    kind = "gauge"
+
+    def __init__(self):
+        super().__init__("cache", "Cache statistics by cache name.", ("cache",))
+        self._caches: Dict[str, Any] = {}
+
+    def register(self, name: str, cache: Any) -> None:
+        self._caches[name] = cache
+
+    def render(self) -> List[str]:
+        stats = {name: cache.stats() for name, cache in sorted(self._caches.items())}
+        families = [
+            ("cache_hits_total", "counter", "Cache lookups served from the cache.", "hits"),
+            ("cache_misses_total", "counter", "Cache lookups that had to load.", "misses"),
+            ("cache_evictions_total", "counter", "Entries evicted to stay within the byte budget.", "evictions"),
+            ("cache_stale_hits_total", "counter", "Expired entries served because the upstream was failing.", "stale_hits"),
+            ("cache_hit_ratio", "gauge", "Hits divided by lookups since startup.", "hit_ratio"),
+            ("cache_entries", "gauge", "Entries currently cached.", "entries"),
+            ("cache_bytes", "gauge", "Payload bytes currently cached.", "bytes"),
+        ]
+        lines = []
+        for family, kind, help, field in families:
+            rows = [(name, values[field]) for name, values in stats.items() if field in values]
+            if not rows:
+                continue
+            lines.append(f"# HELP {family} {help}")
+            lines.append(f"# TYPE {family} {kind}")
+            for name, value in rows:
+                lines.append(f"{family}{format_labels(self.labelnames, (name,))} {format_value(value)}")
+        return lines
+
+class CallbackGauge(Metric):
+    """
+    A gauge whose value is read from a function at scrape time.
+    """
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, fn: Callable[[], float]):
+        super().__init__(name, help)
+        self.fn = fn
+
+    def samples(self):
+        return [("", (), (), self.fn())]
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+registry = MetricsRegistry()
+
+upstream_request_seconds = registry.register(Histogram(
+    "upstream_request_duration_seconds",
+    "Latency of MLB Stats API requests by endpoint and HTTP status.",
+    ("endpoint", "status"),
+))
+upstream_in_flight = registry.register(Gauge(
+    "upstream_requests_in_flight",
+    "MLB Stats API requests currently awaiting a response.",
+    ("endpoint",),
+))
+format_game_seconds = registry.register(Histogram(
+    "formatter_game_duration_seconds",
+    "Time spent formatting one game from fetched data, by game state.",
+    ("state",),
+))
+schedule_stage_seconds = registry.register(Histogram(
+    "schedule_stage_duration_seconds",
+    "Time spent in each stage of building a schedule (fetch, format).",
+    ("stage",),
+))
+event_loop_lag_seconds = registry.register(Histogram(
+    "event_loop_lag_seconds",
+    "How late the event loop woke a sleeping task, sampled periodically.",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+))
+upstream_retries = registry.register(Counter(
+    "upstream_retries_total",
+    "MLB Stats API requests retried after a timeout, connection error or 5xx.",
+    ("endpoint",),
+))
+circuit_state = registry.register(Gauge(
+    "upstream_circuit_state",
+    "Circuit breaker state per endpoint (0 closed, 1 half-open, 2 open).",
+    ("endpoint",),
+))
+stale_responses = registry.register(Counter(
+    "stale_responses_total",
+    "Responses served from stale data while the upstream was failing.",
+    ("source",),
+))
+caches = registry.register(CacheCollector())
+
+@contextmanager
+def track_upstream(endpoint: str) -> Iterator[Dict[str, Any]]:
+    """
+    Time one upstream request and count it as in flight. Set result["status"] to the
+    HTTP status code inside the block; requests that raise first are labeled "error".
+    """
+    result: Dict[str, Any] = {"status": "error"}
+    upstream_in_flight.inc(endpoint)
+    started = time.perf_counter()
+    try:
+        yield result
+    finally:
+        upstream_in_flight.dec(endpoint)
+        upstream_request_seconds.observe(time.perf_counter() - started, endpoint, result["status"])
+
+class EventLoopLagMonitor:
+    """
+    Sleeps for a fixed interval and records how much later than requested it woke up.
+    """
+
+    def __init__(self, interval: float = EVENT_LOOP_LAG_INTERVAL_SECONDS):
+        self.interval = interval
+        self.last_lag = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.interval)
+            self.last_lag = max(0.0, loop.time() - started - self.interval)
+            event_loop_lag_seconds.observe(self.last_lag)
+
+loop_lag_monitor = EventLoopLagMonitor()
+registry.register(CallbackGauge(
+    "event_loop_lag_last_seconds",
+    "Most recent event loop lag sample.",
+    lambda: loop_lag_monitor.last_lag,
+))
@@ -1,114 +1,451 @@
+import asyncio
+import logging
 import httpx
-from app.config import BASE_URL, LIVE_FEED_BASE_URL, MARLINS_TEAM_ID
-from typing import List, Dict, Any, Optional
+from datetime import date
+from app.config import (
+    BASE_URL,
+    LIVE_FEED_BASE_URL,
+    MARLINS_TEAM_ID,
+    AFFILIATES_CACHE_TTL_SECONDS,
+    AFFILIATES_REFRESH_AFTER_SECONDS,
+    GAME_STATE_CACHE_TTL_SECONDS,
+    RESPONSE_CACHE_MAX_BYTES,
+    LIVE_FEED_DIFF_PATCH,
+    LIVE_FEED_STORE_MAX_GAMES,
+    LIVE_FEED_PARSE_MODE,
+    LIVE_FEED_FIELDS,
+    HTTP_TIMEOUT_SECONDS,
+    HTTP_CONNECT_TIMEOUT_SECONDS,
+    UPSTREAM_RETRY_ATTEMPTS,
+    STALE_IF_ERROR_SECONDS,
+    AFFILIATES_STALE_IF_ERROR_SECONDS,
+)
+from app.services.cache import TTLCache, ResponseCache
+from app.services.extractors import IndexedBoxscore, pitching_decisions
+from app.services.final_store import has_decisions
+from app.services.http_client import get_http_client
+from app.services.live_state import LiveFeedStore, PatchError
+from app.services.metrics import CallbackGauge, caches, registry, track_upstream, upstream_retries, stale_responses
+from app.services.resilience import (
+    RETRYABLE_STATUSES,
+    CircuitOpenError,
+    DeadlineExceeded,
+    UpstreamUnavailable,
+    backoff_delay,
+    circuit_breaker,
+    mark_stale,
+    remaining_time,
+)
+from app.services.singleflight import SingleFlight
+from app.utils.json_utils import loads, compile_paths
+from app.utils.logging_utils import lazy
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 
-async def get_affiliates() -> List[Dict[str, Any]]:
+logger = logging.getLogger(__name__)
+
+# Affiliates keyed by (parent team id, season)
+affiliates_cache = TTLCache(AFFILIATES_CACHE_TTL_SECONDS, AFFILIATES_REFRESH_AFTER_SECONDS)
+
+# Parsed upstream responses keyed by URL, with a TTL chosen from the game state
+response_cache = ResponseCache(RESPONSE_CACHE_MAX_BYTES)
+
+# Identical in-flight upstream requests (same URL) share one call
+upstream_flight = SingleFlight()
+
+# Last full feed per live game, refreshed through diffPatch (pruned to the fields we read)
+live_feed_store = LiveFeedStore(
+    LIVE_FEED_STORE_MAX_GAMES,
+    compile_paths(LIVE_FEED_FIELDS) if LIVE_FEED_PARSE_MODE == "pruned" else None,
+)
+
+caches.register("affiliates", affiliates_cache)
+caches.register("upstream_response", response_cache)
+registry.register(CallbackGauge(
+    "upstream_flights_in_progress",
+    "Distinct upstream loads in flight after coalescing identical requests.",
+    upstream_flight.in_flight,
+))
+
+def cache_response(url: str, data: Any, size: int, game_state: Optional[str]) -> None:
+    """
+    Cache a parsed response for as long as its game state allows (unknown states aren't cached).
+    """
+    ttl = GAME_STATE_CACHE_TTL_SECONDS.get(game_state)
+    if ttl:
+        response_cache.set(url, data, size, ttl, STALE_IF_ERROR_SECONDS)
+
+def schedule_cache_state(dates: List[Dict[str, Any]]) -> str:
+    """
+    The most volatile game state in a schedule payload decides how long it may be cached.
+    """
+    states = {game["status"]["abstractGameState"] for day in dates for game in day.get("games", [])}
+    if "Live" in states:
+        return "Live"
+    if states and states <= {"Final"}:
+        return "Final"
+    return "Preview"
+
+async def fetch_upstream(endpoint: str, url: str) -> httpx.Response:
+    """
+    GET an upstream URL on the shared client, recording latency by endpoint and status.
+    Timeouts, connection errors and 5xx/429 are retried with jittered backoff while the
+    endpoint's circuit is closed and the request deadline allows. The last 5xx response is
+    returned for the caller's raise_for_status(); 4xx responses are returned unretried.
+    A timeout shortened by the deadline raises DeadlineExceeded without counting against the circuit.
+    """
+    client = get_http_client()
+    breaker = circuit_breaker(endpoint)
+    attempt = 0
+    while True:
+        remaining = remaining_time()
+        if remaining is not None and remaining <= 0:
+            raise DeadlineExceeded(f"Deadline passed before calling {endpoint}")
+        breaker.before_call()
+        # Never wait on the upstream past the request's deadline
+        timeout = {} if remaining is None else {"timeout": httpx.Timeout(min(HTTP_TIMEOUT_SECONDS, remaining), connect=min(HTTP_CONNECT_TIMEOUT_SECONDS, remaining))}
+
+        try:
+            with track_upstream(endpoint) as tracked:
+                response = await client.get(url, **timeout)
+                tracked["status"] = response.status_code
+        except httpx.TimeoutException as e:
+            full_timeout = HTTP_CONNECT_TIMEOUT_SECONDS if isinstance(e, httpx.ConnectTimeout) else HTTP_TIMEOUT_SECONDS
+            if remaining is not None and remaining < full_timeout:
+                # Cut short by the request's deadline, which says nothing about the endpoint
+                breaker.release_trial()
+                raise DeadlineExceeded(f"Deadline passed while calling {endpoint}") from e
+            breaker.record_failure()
+            response, error = None, e
+        except httpx.TransportError as e:
+            breaker.record_failure()
+            response, error = None, e
+        except BaseException:
+            # Cancelled, or failed without an answer from the endpoint: free a half-open trial
+            breaker.release_trial()
+            raise
+        else:
+            if response.status_code not in RETRYABLE_STATUSES:
+                breaker.record_success()
+                return response
+            breaker.record_failure()
+
+        delay = backoff_delay(attempt)
+        attempt += 1
+        remaining = remaining_time()
+        if attempt >= UPSTREAM_RETRY_ATTEMPTS or (remaining is not None and delay >= remaining):
+            if response is None:
+                raise error
+            return response
+        logger.debug("Retrying %s in %.3fs (attempt %s)", url, delay, attempt + 1)
+        upstream_retries.inc(endpoint)
+        await asyncio.sleep(delay)
+
+async def load_or_stale(url: str, load: Callable[[], Awaitable[Any]]) -> Any:
     """
-    Fetch all Marlins affiliate teams for the 2025 season.
+    Run a coalesced upstream load; if it fails, fall back to the expired cached response
+    (marking the request stale) while one is still within its stale window.
     """
-    url = f"{BASE_URL}/teams/affiliates?teamIds={MARLINS_TEAM_ID}&year=2025"
-    async with httpx.AsyncClient() as client:
-        response = await client.get(url)
+    try:
+        return await upstream_flight.do(url, load)
+    except (httpx.HTTPError, UpstreamUnavailable) as e:
+        stale = response_cache.get_stale(url)
+        if stale is None:
+            raise
+        logger.warning("Serving stale response for %s: %s: %s", url, type(e).__name__, e)
+        stale_responses.inc("upstream")
+        mark_stale()
+        return stale
+
+async def get_affiliates(team_id: int = MARLINS_TEAM_ID, season: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Fetch all affiliate teams of a parent club for a season (defaults to the current year).
+    Results are cached per (team_id, season).
+    """
+    if season is None:
+        season = date.today().year
+
+    async def load() -> List[Dict[str, Any]]:
+        url = f"{BASE_URL}/teams/affiliates?teamIds={team_id}&year={season}"
+        response = await fetch_upstream("affiliates", url)
         response.raise_for_status()
-        data = response.json()
+        data = loads(response.content)
+
+        return data.get("teams", [])
+
+    try:
+        return await affiliates_cache.get((team_id, season), load)
+    except (httpx.HTTPError, UpstreamUnavailable) as e:
+        stale = stale_affiliates(team_id, season, e)
+        if stale is None:
+            raise
+        return stale
+
+def stale_affiliates(team_id: int, season: int, error: Exception) -> Optional[List[Dict[str, Any]]]:
+    """
+    The last affiliate list for an org after a failed refresh, if it expired recently enough.
+    """
+    stale = affiliates_cache.peek_stale((team_id, season), AFFILIATES_STALE_IF_ERROR_SECONDS)
+    if stale is not None:
+        logger.warning("Serving stale affiliates for %s: %s: %s", team_id, type(error).__name__, error)
+        stale_responses.inc("affiliates")
+        mark_stale()
+    return stale
+
+async def get_affiliates_for_orgs(team_ids: List[int], season: Optional[int] = None) -> Dict[int, List[Dict[str, Any]]]:
+    """
+    Fetch affiliates for several parent clubs, keyed by parent team id.
+    Orgs missing from the cache are resolved together in one teams/affiliates?teamIds= request.
+    """
+    if season is None:
+        season = date.today().year
+
+    by_org = {}
+    missing = []
+    for team_id in team_ids:
+        if affiliates_cache.peek((team_id, season)) is None:
+            missing.append(team_id)
+        else:
+            # Served from the cache (refreshed in the background when due)
+            by_org[team_id] = await get_affiliates(team_id, season)
+
+    if missing:
+        url = f"{BASE_URL}/teams/affiliates?teamIds={','.join(str(id) for id in sorted(missing))}&year={season}"
+
+        async def load() -> Dict[int, List[Dict[str, Any]]]:
+            response = await fetch_upstream("affiliates", url)
+            response.raise_for_status()
+            loaded = {team_id: [] for team_id in missing}
+            for team in loads(response.content).get("teams", []):
+                # Minor league clubs name their parent; the MLB club is its own org
+                org_id = team.get("parentOrgId", team["id"])
+                if org_id in loaded:
+                    loaded[org_id].append(team)
+            for team_id, teams in loaded.items():
+                affiliates_cache.put((team_id, season), teams)
+            return loaded
+
+        try:
+            by_org.update(await upstream_flight.do(url, load))
+        except (httpx.HTTPError, UpstreamUnavailable) as e:
+            stale = {team_id: stale_affiliates(team_id, season, e) for team_id in missing}
+            if any(teams is None for teams in stale.values()):
+                raise
+            by_org.update(stale)
 
-    return data.get("teams", [])
+    return {team_id: by_org[team_id] for team_id in team_ids}
 
-async def get_schedule_for_teams(team_ids: List[int], sport_ids: List[int], date_str: str) -> List[Dict[str, Any]]:
+async def get_schedule_for_teams(
+    team_ids: List[int],
+    sport_ids: List[int],
+    date_str: Optional[str] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+) -> List[Dict[str, Any]]:
     """
-    Fetch schedule for given team and sport IDs on a specific date.
+    Fetch schedule for given team and sport IDs on a specific date,
+    or for every date from start_date to end_date (inclusive) in one request.
     """
     team_id_str = ",".join(str(id) for id in team_ids)
     sport_id_str = ",".join(str(id) for id in sport_ids)
-    url = f"{BASE_URL}/schedule?teamId={team_id_str}&sportId={sport_id_str}&date={date_str}"
+    if start_date and end_date:
+        date_params = f"startDate={start_date}&endDate={end_date}"
+    else:
+        date_params = f"date={date_str}"
+    url = f"{BASE_URL}/schedule?teamId={team_id_str}&sportId={sport_id_str}&{date_params}"
 
-    async with httpx.AsyncClient() as client:
-        response = await client.get(url)
+    cached = response_cache.get(url)
+    if cached is not None:
+        return cached
+
+    async def load() -> List[Dict[str, Any]]:
+        response = await fetch_upstream("schedule", url)
         response.raise_for_status()
-        return response.json().get("dates", [])
+        dates = loads(response.content).get("dates", [])
+        cache_response(url, dates, len(response.content), schedule_cache_state(dates))
+        return dates
+
+    return await load_or_stale(url, load)
+
+# Candidate endpoints for get_live_game_data, most preferred first: (name, base URL, path under /game/{pk})
+LIVE_DATA_ENDPOINTS = [
+    ("feed/live", BASE_URL, "feed/live"),
+    ("live", BASE_URL, "live"),
+    ("feed", BASE_URL, "feed"),
+    ("boxscore", BASE_URL, "boxscore"),  # Boxscore often has current game state
+]
 
-async def get_live_game_data(game_pk: int) -> Optional[Dict[str, Any]]:
+# Index into LIVE_DATA_ENDPOINTS of the endpoint that last worked, per sport level
+# (None when the caller doesn't know the game's sport)
+live_data_endpoints: Dict[Optional[int], int] = {}
+
+async def try_live_data_endpoint(index: int, game_pk: int) -> Optional[Dict[str, Any]]:
     """
-    Fetch live game data for a specific game.
+    Fetch one candidate live data endpoint, returning None unless it answers 200.
     """
-    # Try multiple possible endpoints for live data
-    endpoints = [
-        f"{BASE_URL}/game/{game_pk}/feed/live",
-        f"{BASE_URL}/game/{game_pk}/live",
-        f"{BASE_URL}/game/{game_pk}/feed",
-        f"{BASE_URL}/game/{game_pk}/boxscore"  # Boxscore often has current game state
-    ]
-
-    async with httpx.AsyncClient() as client:
-        for url in endpoints:
-            print(f"  Trying endpoint: {url}")
-            try:
-                response = await client.get(url)
-                print(f"  Response status: {response.status_code}")
+    name, base_url, path = LIVE_DATA_ENDPOINTS[index]
+    url = f"{base_url}/game/{game_pk}/{path}"
+    logger.debug("Trying endpoint: %s", url)
+    try:
+        response = await fetch_upstream("probe:" + name, url)
+        logger.debug("Response status: %s", response.status_code)
+        if response.status_code != 200:
+            logger.debug("Failed with status: %s", response.status_code)
+            return None
+        data = loads(response.content)
+    except Exception as e:
+        logger.debug("Other error: %s: %s", type(e).__name__, str(e))
+        return None
+    logger.debug("Success! Data keys: %s", lazy(lambda: list(data.keys()) if data else 'None'))
+    return data
+
+async def probe_live_data_endpoints(game_pk: int) -> Optional[Tuple[int, Dict[str, Any]]]:
+    """
+    Race every candidate endpoint at once. The most preferred endpoint that succeeds wins
+    as soon as everything ranked above it has failed; the remaining requests are cancelled.
+    """
+    tasks = {asyncio.ensure_future(try_live_data_endpoint(index, game_pk)): index for index in range(len(LIVE_DATA_ENDPOINTS))}
+    pending = set(tasks)
+    results: Dict[int, Optional[Dict[str, Any]]] = {}
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                results[tasks[task]] = task.result()
+            for index in range(len(LIVE_DATA_ENDPOINTS)):
+                if index not in results:
+                    break
+                if results[index] is not None:
+                    return index, results[index]
+        return None
+    finally:
+        for task in pending:
+            task.cancel()
 
-                if response.status_code == 200:
-                    data = response.json()
-                    print(f"  Success! Data keys: {list(data.keys()) if data else 'None'}")
-                    return data
-                else:
-                    print(f"  Failed with status: {response.status_code}")
+async def get_live_game_data(game_pk: int, sport_id: Optional[int] = None) -> Optional[Dict[str, Any]]:
+    """
+    Fetch live game data for a specific game.
 
-            except httpx.HTTPStatusError as e:
-                print(f"  HTTP Error: {e.response.status_code} - {e.response.text[:100]}")
-                continue
-            except Exception as e:
-                print(f"  Other error: {type(e).__name__}: {str(e)}")
-                continue
+    The endpoint that worked last time for this sport level is tried alone; when there is
+    none yet, or it fails, all candidates are probed concurrently and the winner remembered.
+    """
+    remembered = live_data_endpoints.get(sport_id)
+    if remembered is not None:
+        data = await try_live_data_endpoint(remembered, game_pk)
+        if data is not None:
+            return data
 
-    print(f"  All endpoints failed for game {game_pk}")
-    return None
+    found = await probe_live_data_endpoints(game_pk)
+    if found is None:
+        logger.debug("All endpoints failed for game %s", game_pk)
+        return None
 
-async def get_live_feed_data(game_pk: int) -> Optional[Dict[str, Any]]:
+    index, data = found
+    if index != remembered:
+        logger.debug("Using live data endpoint %s for sport %s", LIVE_DATA_ENDPOINTS[index][0], sport_id)
+    live_data_endpoints[sport_id] = index
+    return data
+
+async def get_live_feed_data(game_pk: int, game_state: Optional[str] = None) -> Optional[Dict[str, Any]]:
     """
     Fetch live feed data specifically for current game state (inning, outs, runners).
     Uses v1.1 API for live feed data.
     """
     url = f"{LIVE_FEED_BASE_URL}/game/{game_pk}/feed/live"
-    print(f"  Trying live feed URL: {url}")
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(url)
-            print(f"  Live feed response status: {response.status_code}")
+    cached = response_cache.get(url)
+    if cached is not None:
+        return cached
+
+    async def load() -> Optional[Dict[str, Any]]:
+        state = live_feed_store.get(game_pk) if LIVE_FEED_DIFF_PATCH else None
+        if state is not None and state.timecode:
+            diff_url = f"{url}/diffPatch?startTimecode={state.timecode}"
+            logger.debug("Trying live feed diffPatch URL: %s", diff_url)
+            try:
+                response = await fetch_upstream("feed/live/diffPatch", diff_url)
+                response.raise_for_status()
+                state = live_feed_store.apply(game_pk, loads(response.content), len(response.content))
+            except (httpx.HTTPError, CircuitOpenError, PatchError) as e:
+                # The full feed has its own endpoint (and circuit), so it can still be fetched
+                logger.debug("Live feed diffPatch failed (%s: %s), refetching full feed", type(e).__name__, e)
+                live_feed_store.discard(game_pk)
+                state = None
+
+        if state is None:
+            logger.debug("Trying live feed URL: %s", url)
+            response = await fetch_upstream("feed/live", url)
+            logger.debug("Live feed response status: %s", response.status_code)
             response.raise_for_status()
-            data = response.json()
-            print(f"  Live feed data keys: {list(data.keys()) if data else 'None'}")
-            return data
-        except httpx.HTTPStatusError as e:
-            print(f"  Live feed HTTP Error: {e.response.status_code} - {e.response.text[:200]}")
-            return None
-        except Exception as e:
-            print(f"  Live feed other error: {type(e).__name__}: {str(e)}")
-            return None
+            data = loads(response.content)
+            logger.debug("Live feed data keys: %s", lazy(lambda: list(data.keys()) if data else 'None'))
+            # The store keeps only the retained paths; the rest of the document is dropped here
+            state = live_feed_store.put(game_pk, data, len(response.content))
+
+        data = state.feed
+        # The feed reports its own state, which beats the caller's schedule snapshot
+        feed_state = data.get("gameData", {}).get("status", {}).get("abstractGameState", game_state)
+        if feed_state != "Live":
+            # Only in-progress games keep changing; the cache covers the rest
+            live_feed_store.discard(game_pk)
+        cache_response(url, data, state.size, feed_state)
+        return data
 
-async def get_game_boxscore(game_pk: int) -> Optional[Dict[str, Any]]:
+    try:
+        return await load_or_stale(url, load)
+    except httpx.HTTPStatusError as e:
+        logger.warning("Live feed HTTP Error: %s - %s", e.response.status_code, lazy(lambda: e.response.text[:200]))
+        return None
+    except Exception as e:
+        logger.warning("Live feed other error: %s: %s", type(e).__name__, str(e))
+        return None
+
+async def get_game_boxscore(game_pk: int, game_state: Optional[str] = None) -> Optional[Dict[str, Any]]:
     """
     Fetch boxscore data for a specific game (includes probable pitchers, final stats).
+    Pass the game's abstractGameState to allow caching; a Final boxscore that doesn't
+    credit both decisions yet is cached only as long as a Preview one.
     """
     url = f"{BASE_URL}/game/{game_pk}/boxscore"
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(url)
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPStatusError:
-            # Boxscore might not be available
-            return None
+    cached = response_cache.get(url)
+    if cached is not None:
+        return cached
 
-async def get_game_plays(game_pk: int) -> Optional[Dict[str, Any]]:
+    async def load() -> Optional[Dict[str, Any]]:
+        response = await fetch_upstream("boxscore", url)
+        response.raise_for_status()
+        # Its player index, once built, is cached and evicted along with the payload
+        data = IndexedBoxscore(loads(response.content))
+        cache_state = game_state
+        if game_state == "Final" and not has_decisions(pitching_decisions(data)):
+            # Decisions aren't credited yet: look again soon instead of keeping this for weeks
+            cache_state = "Preview"
+        cache_response(url, data, len(response.content), cache_state)
+        return data
+
+    try:
+        return await load_or_stale(url, load)
+    except (httpx.HTTPError, UpstreamUnavailable):
+        # Boxscore might not be available
+        return None
+
+async def get_game_plays(game_pk: int, game_state: Optional[str] = None) -> Optional[Dict[str, Any]]:
     """
     Fetch recent plays/events for a specific game to determine current base runners.
+    Pass the game's abstractGameState to allow caching.
     """
     url = f"{BASE_URL}/game/{game_pk}/plays"
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(url)
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPStatusError:
-            print(f"  Plays endpoint failed for game {game_pk}")
-            return None 
\ No newline at end of file
+    cached = response_cache.get(url)
+    if cached is not None:
+        return cached
+
+    async def load() -> Optional[Dict[str, Any]]:
+        response = await fetch_upstream("plays", url)
+        response.raise_for_status()
+        data = loads(response.content)
+        cache_response(url, data, len(response.content), game_state)
+        return data
+
+    try:
+        return await load_or_stale(url, load)
+    except (httpx.HTTPError, UpstreamUnavailable):
+        logger.warning("Plays endpoint failed for game %s", game_pk)
+        return None
\ No newline at end of file
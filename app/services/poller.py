@@ -0,0 +1,189 @@
+import asyncio
+import logging
+import time
+from datetime import date
+from typing import Any, Dict, Optional, Tuple
+from app.config import (
+    MARLINS_TEAM_ID,
+    LIVE_POLL_INTERVAL_SECONDS,
+    IDLE_POLL_INTERVAL_SECONDS,
+    SNAPSHOT_GRACE_SECONDS,
+)
+from app.services.mlb_api import get_affiliates, get_schedule_for_teams, schedule_cache_state
+from app.services.formatter import (
+    build_team_info,
+    extract_games,
+    match_affiliate,
+    fetch_game_details,
+    assemble_schedule,
+)
+from app.services.resilience import request_is_incomplete, request_is_stale, request_scope
+from app.services.schedule_cache import RenderedSchedule, render_schedule
+from app.services.broadcast import ScheduleBroadcaster, schedule_deltas
+
+logger = logging.getLogger(__name__)
+
+class ScheduleSnapshot:
+    """
+    Today's formatted schedule as last written by the poller.
+    """
+    __slots__ = ("date_str", "formatted", "rendered", "updated_at", "expires_at")
+
+    def __init__(self, date_str: str, formatted: Dict[int, dict], rendered: RenderedSchedule, valid_for: float):
+        self.date_str = date_str
+        self.formatted = formatted
+        self.rendered = rendered
+        self.updated_at = time.monotonic()
+        self.expires_at = self.updated_at + valid_for
+
+class LiveGamePoller:
+    """
+    Background task that keeps today's affiliate schedule fresh independently of client requests.
+    The schedule and live games are refreshed every `live_interval` seconds while any game
+    is live, otherwise every `idle_interval`; Preview games every `idle_interval`; Final games once.
+    """
+
+    def __init__(
+        self,
+        team_id: int = MARLINS_TEAM_ID,
+        live_interval: float = LIVE_POLL_INTERVAL_SECONDS,
+        idle_interval: float = IDLE_POLL_INTERVAL_SECONDS,
+        grace: float = SNAPSHOT_GRACE_SECONDS,
+    ):
+        self.team_id = team_id
+        self.live_interval = live_interval
+        self.idle_interval = idle_interval
+        self.grace = grace
+        self.snapshot: Optional[ScheduleSnapshot] = None
+        # Per-team changes are published here for /schedule/stream
+        self.broadcaster = ScheduleBroadcaster()
+        self._task: Optional[asyncio.Task] = None
+        self._date_str: Optional[str] = None
+        self._details: Dict[int, Dict[str, Any]] = {}
+        # game_pk -> (next refresh time, abstractGameState when last fetched)
+        self._next_due: Dict[int, Tuple[float, str]] = {}
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def get_snapshot(self, date_str: str) -> Optional[ScheduleSnapshot]:
+        """
+        The snapshot for `date_str`, if the poller covers that date and is keeping up.
+        """
+        snapshot = self.snapshot
+        if snapshot is None or snapshot.date_str != date_str:
+            return None
+        if time.monotonic() > snapshot.expires_at:
+            return None
+        return snapshot
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                interval = await self.poll_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Live poller error: %s: %s", type(e).__name__, str(e))
+                interval = self.live_interval
+            await asyncio.sleep(interval)
+
+    async def poll_once(self) -> float:
+        """
+        Refresh the snapshot once. Returns the number of seconds until the next poll.
+        A snapshot built while any upstream call fell back to expired data is marked stale,
+        and one missing per-game details (a detail call failed) is marked incomplete.
+        """
+        with request_scope(None):
+            return await self._poll()
+
+    async def _poll(self) -> float:
+        today = date.today()
+        date_str = today.isoformat()
+        if date_str != self._date_str:
+            # New day: forget yesterday's games
+            self._date_str = date_str
+            self._details.clear()
+            self._next_due.clear()
+
+        affiliates = await get_affiliates(self.team_id, today.year)
+        if not affiliates:
+            return self.idle_interval
+
+        team_ids = [team["id"] for team in affiliates]
+        sport_ids = list(set(team["sport"]["id"] for team in affiliates))
+        schedule_data = await get_schedule_for_teams(team_ids, sport_ids, date_str)
+
+        team_info = build_team_info(affiliates)
+        games = [game for game in extract_games(schedule_data) if match_affiliate(game, team_info)]
+
+        # Only games whose refresh interval has elapsed, or whose state changed, go upstream
+        now = time.monotonic()
+        due = [game for game in games if self._is_due(game, now)]
+        if due:
+            self._details.update(await fetch_game_details(due))
+            for game in due:
+                status = game["status"]["abstractGameState"]
+                interval = self._game_interval(status)
+                if self._missing_details(game["gamePk"]):
+                    # A detail call failed: retry it on the next idle poll at the latest
+                    interval = min(interval, self.idle_interval)
+                self._next_due[game["gamePk"]] = (now + interval, status)
+
+        # The schedule carries live scores, so it is re-read on the live interval while games are on
+        state = schedule_cache_state(schedule_data)
+        interval = self.live_interval if state == "Live" else self.idle_interval
+
+        formatted = assemble_schedule(team_info, games, self._details)
+        # Details held from earlier polls count too, until a retry fills them in
+        stale = request_is_stale()
+        incomplete = request_is_incomplete() or any(self._missing_details(game["gamePk"]) for game in games)
+        previous = self.snapshot
+        if (
+            previous is not None
+            and previous.date_str == date_str
+            and previous.formatted == formatted
+            and (previous.rendered.stale, previous.rendered.incomplete) == (stale, incomplete)
+        ):
+            # Nothing changed: keep the rendered body (and its ETag), just extend its validity
+            previous.expires_at = time.monotonic() + interval + self.grace
+            return interval
+
+        rendered = render_schedule(formatted, state, stale=stale, incomplete=incomplete)
+        self.snapshot = ScheduleSnapshot(date_str, formatted, rendered, interval + self.grace)
+        if previous is None or previous.date_str != date_str:
+            self.broadcaster.publish({"event": "snapshot", "date": date_str, "data": formatted})
+        else:
+            for delta in schedule_deltas(previous.formatted, formatted):
+                self.broadcaster.publish({"event": "delta", "date": date_str, "data": delta})
+        return interval
+
+    def _missing_details(self, game_pk: int) -> bool:
+        return any(value is None for value in self._details.get(game_pk, {}).values())
+
+    def _is_due(self, game: Dict[str, Any], now: float) -> bool:
+        scheduled = self._next_due.get(game["gamePk"])
+        if scheduled is None:
+            return True
+        due_at, status = scheduled
+        return due_at <= now or status != game["status"]["abstractGameState"]
+
+    def _game_interval(self, status: str) -> float:
+        if status == "Live":
+            return self.live_interval
+        if status == "Final":
+            return float("inf")
+        return self.idle_interval
+
+# Poller for the default organization, started from the app lifespan
+live_poller = LiveGamePoller()
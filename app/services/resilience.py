@@ -0,0 +1,166 @@
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, Optional
+from app.config import (
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_RESET_SECONDS,
+    UPSTREAM_RETRY_BASE_SECONDS,
+    UPSTREAM_RETRY_MAX_SECONDS,
+)
+from app.services.metrics import circuit_state
+
+# Statuses worth another attempt: the upstream is overloaded or a proxy in front of it failed
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+class UpstreamUnavailable(Exception):
+    """
+    The upstream was not called: its circuit is open or the request's deadline has passed.
+    """
+
+class CircuitOpenError(UpstreamUnavailable):
+    pass
+
+class DeadlineExceeded(UpstreamUnavailable):
+    pass
+
+class CircuitBreaker:
+    """
+    Stops calling an endpoint after `failure_threshold` consecutive failures. After
+    `reset_timeout` seconds one trial call is let through (half-open); its success closes
+    the circuit and its failure opens it again.
+    """
+    CLOSED = "closed"
+    HALF_OPEN = "half_open"
+    OPEN = "open"
+
+    def __init__(self, endpoint: str, failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD, reset_timeout: float = CIRCUIT_RESET_SECONDS):
+        self.endpoint = endpoint
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._trial_at: Optional[float] = None
+
+    def before_call(self) -> None:
+        """
+        Raise CircuitOpenError unless a call may go out now.
+        """
+        if self.state == self.CLOSED:
+            return
+        now = time.monotonic()
+        if self.state == self.OPEN:
+            if now - self._opened_at < self.reset_timeout:
+                raise CircuitOpenError(f"Circuit open for {self.endpoint}")
+            self._set_state(self.HALF_OPEN)
+        # Half-open: one trial at a time (a trial that never reports back expires after reset_timeout)
+        if self._trial_at is not None and now - self._trial_at < self.reset_timeout:
+            raise CircuitOpenError(f"Circuit half-open for {self.endpoint}, trial in progress")
+        self._trial_at = now
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self._trial_at = None
+        if self.state != self.CLOSED:
+            self._set_state(self.CLOSED)
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._trial_at = None
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            self._opened_at = time.monotonic()
+            self._set_state(self.OPEN)
+
+    def release_trial(self) -> None:
+        """
+        Give back a half-open trial whose call ended without an answer (cancelled, or cut
+        short by the request's deadline), so the next caller can try.
+        """
+        self._trial_at = None
+
+    def _set_state(self, state: str) -> None:
+        self.state = state
+        circuit_state.set({self.CLOSED: 0, self.HALF_OPEN: 1, self.OPEN: 2}[state], self.endpoint)
+
+_breakers: Dict[str, CircuitBreaker] = {}
+
+def circuit_breaker(endpoint: str) -> CircuitBreaker:
+    """
+    The breaker for one upstream endpoint (created on first use).
+    """
+    breaker = _breakers.get(endpoint)
+    if breaker is None:
+        breaker = _breakers[endpoint] = CircuitBreaker(endpoint)
+    return breaker
+
+def reset_circuit_breakers() -> None:
+    _breakers.clear()
+
+def backoff_delay(attempt: int, base: float = UPSTREAM_RETRY_BASE_SECONDS, cap: float = UPSTREAM_RETRY_MAX_SECONDS) -> float:
+    """
+    Full-jitter exponential backoff: uniform in [0, min(cap, base * 2**attempt)].
+    """
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+class RequestScope:
+    """
+    Per-request upstream state: the absolute deadline (monotonic clock), whether any
+    stale data went into the response, and whether any per-game details are missing.
+    """
+    __slots__ = ("deadline", "stale", "incomplete")
+
+    def __init__(self, deadline: Optional[float]):
+        self.deadline = deadline
+        self.stale = False
+        self.incomplete = False
+
+# Tasks copy the context they are created in, so fan-out under a route sees its scope
+_scope: ContextVar[Optional[RequestScope]] = ContextVar("upstream_request_scope", default=None)
+
+@contextmanager
+def request_scope(timeout: Optional[float]) -> Iterator[RequestScope]:
+    """
+    Bound every upstream call made inside the block (including tasks it starts) by
+    `timeout` seconds in total.
+    """
+    scope = RequestScope(time.monotonic() + timeout if timeout is not None else None)
+    token = _scope.set(scope)
+    try:
+        yield scope
+    finally:
+        _scope.reset(token)
+
+def remaining_time() -> Optional[float]:
+    """
+    Seconds left before the current request's deadline (None outside a request scope).
+    """
+    scope = _scope.get()
+    if scope is None or scope.deadline is None:
+        return None
+    return scope.deadline - time.monotonic()
+
+def request_is_stale() -> bool:
+    scope = _scope.get()
+    return scope is not None and scope.stale
+
+def mark_stale() -> None:
+    """
+    Record that the current request is being answered with stale data.
+    """
+    scope = _scope.get()
+    if scope is not None:
+        scope.stale = True
+
+def request_is_incomplete() -> bool:
+    scope = _scope.get()
+    return scope is not None and scope.incomplete
+
+def mark_incomplete() -> None:
+    """
+    Record that the current request is missing per-game details its upstream calls failed to return.
+    """
+    scope = _scope.get()
+    if scope is not None:
+        scope.incomplete = True
@@ -0,0 +1,98 @@
+import hashlib
+from typing import Any, Dict, Hashable, Optional, Tuple, Type
+from pydantic import RootModel
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from app.config import (
+    MARLINS_TEAM_ID,
+    GAME_STATE_CACHE_TTL_SECONDS,
+    SCHEDULE_CACHE_CONTROL,
+    SCHEDULE_RESPONSE_CACHE_MAX_BYTES,
+    SCHEDULE_STALE_CACHE_CONTROL,
+    STALE_IF_ERROR_SECONDS,
+)
+from app.models.game_response import ScheduleResponse
+from app.services.cache import ResponseCache
+from app.services.metrics import caches
+
+# Rendered schedule bodies keyed by resolved date
+schedule_response_cache = ResponseCache(SCHEDULE_RESPONSE_CACHE_MAX_BYTES)
+caches.register("rendered_schedule", schedule_response_cache)
+
+class RenderedSchedule:
+    """
+    A serialized /schedule body with its strong ETag and caching headers.
+    """
+    __slots__ = ("body", "etag", "state", "stale", "incomplete")
+
+    def __init__(self, body: bytes, state: str, stale: bool = False, incomplete: bool = False):
+        self.body = body
+        self.etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+        self.state = state
+        self.stale = stale
+        self.incomplete = incomplete
+
+    @property
+    def degraded(self) -> bool:
+        return self.stale or self.incomplete
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        if self.stale:
+            # Built from (or served as) expired data while the upstream was failing
+            return {"ETag": self.etag, "Cache-Control": SCHEDULE_STALE_CACHE_CONTROL, "Warning": '110 - "Response is Stale"'}
+        if self.incomplete:
+            # Some per-game detail calls failed; the fields they fill read "N/A"
+            return {"ETag": self.etag, "Cache-Control": SCHEDULE_STALE_CACHE_CONTROL, "Warning": '199 - "Incomplete game details"'}
+        return {"ETag": self.etag, "Cache-Control": SCHEDULE_CACHE_CONTROL[self.state]}
+
+
+def render_schedule(
+    formatted: Dict[int, Any],
+    state: str,
+    model: Type[RootModel] = ScheduleResponse,
+    stale: bool = False,
+    incomplete: bool = False,
+) -> RenderedSchedule:
+    """
+    Validate and serialize a formatted schedule exactly as the response_model would.
+    """
+    content = jsonable_encoder(model.model_validate(formatted))
+    return RenderedSchedule(JSONResponse(content).body, state, stale, incomplete)
+
+def schedule_key(date_str: str, org_ids: Tuple[int, ...] = (MARLINS_TEAM_ID,)) -> Hashable:
+    """
+    Cache key for a rendered schedule; the default organization is keyed by date alone.
+    """
+    return date_str if org_ids == (MARLINS_TEAM_ID,) else (date_str, org_ids)
+
+def store_rendered(key: Any, rendered: RenderedSchedule) -> None:
+    # Stale or incomplete renders are never cached; the next request tries the upstream again
+    if not rendered.degraded:
+        schedule_response_cache.set(key, rendered, len(rendered.body), GAME_STATE_CACHE_TTL_SECONDS[rendered.state], STALE_IF_ERROR_SECONDS)
+
+def get_rendered(key: Any) -> Optional[RenderedSchedule]:
+    return schedule_response_cache.get(key)
+
+def get_stale_rendered(key: Any) -> Optional[RenderedSchedule]:
+    """
+    The last rendered schedule for `key`, expired but within its stale window, marked stale.
+    """
+    rendered = schedule_response_cache.get_stale(key)
+    return RenderedSchedule(rendered.body, rendered.state, stale=True) if rendered is not None else None
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    If-None-Match check (weak comparison, as RFC 9110 specifies for this header).
+    """
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
@@ -0,0 +1,87 @@
+from datetime import date, timedelta
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Tuple
+import httpx
+from app.config import RANGE_CHUNK_DAYS, SCHEDULE_DEADLINE_SECONDS
+from app.services.mlb_api import get_affiliates, get_schedule_for_teams, schedule_cache_state
+from app.services.formatter import build_team_info, extract_games, match_affiliate, fetch_game_details, assemble_schedule
+from app.services.resilience import UpstreamUnavailable, request_is_incomplete, request_is_stale, request_scope
+from app.services.schedule_cache import RenderedSchedule, render_schedule, get_rendered, get_stale_rendered, store_rendered
+
+def split_range(start: date, end: date, chunk_days: int = RANGE_CHUNK_DAYS) -> Iterator[Tuple[date, date]]:
+    """
+    Split [start, end] into windows of at most `chunk_days` that never cross a season (year) boundary.
+    """
+    window_start = start
+    while window_start <= end:
+        window_end = min(window_start + timedelta(days=chunk_days - 1), end, date(window_start.year, 12, 31))
+        yield window_start, window_end
+        window_start = window_end + timedelta(days=1)
+
+def days_in(start: date, end: date) -> List[date]:
+    return [start + timedelta(days=offset) for offset in range((end - start).days + 1)]
+
+async def render_window(window_start: date, window_end: date) -> List[Tuple[str, RenderedSchedule]]:
+    """
+    (date, rendered schedule) for every day of one window: one upstream schedule request
+    and one concurrent batch of per-game detail fetches. Renders are marked stale if any
+    upstream call fell back to expired data.
+    """
+    days = days_in(window_start, window_end)
+
+    # Days already rendered (e.g. by /schedule) need no upstream work
+    cached = {day: get_rendered(day.isoformat()) for day in days}
+    if all(rendered is not None for rendered in cached.values()):
+        return [(day.isoformat(), cached[day]) for day in days]
+
+    affiliates = await get_affiliates(season=window_start.year)
+    team_ids = [team["id"] for team in affiliates]
+    sport_ids = list(set(team["sport"]["id"] for team in affiliates))
+    schedule_data = await get_schedule_for_teams(
+        team_ids, sport_ids, start_date=window_start.isoformat(), end_date=window_end.isoformat()
+    )
+
+    team_info = build_team_info(affiliates)
+    by_day: Dict[str, List[dict]] = {day_data.get("date"): [day_data] for day_data in schedule_data}
+    games = [game for game in extract_games(schedule_data) if match_affiliate(game, team_info)]
+    fetched = await fetch_game_details(games)
+
+    rendered_days = []
+    for day in days:
+        date_str = day.isoformat()
+        rendered = cached[day]
+        if rendered is None:
+            day_schedule = by_day.get(date_str, [])
+            day_games = [game for game in extract_games(day_schedule) if match_affiliate(game, team_info)]
+            formatted = assemble_schedule(team_info, day_games, fetched)
+            rendered = render_schedule(
+                formatted, schedule_cache_state(day_schedule), stale=request_is_stale(), incomplete=request_is_incomplete()
+            )
+            store_rendered(date_str, rendered)
+        rendered_days.append((date_str, rendered))
+    return rendered_days
+
+def stale_window(window_start: date, window_end: date) -> Optional[List[Tuple[str, RenderedSchedule]]]:
+    """
+    The last renders of every day in a window, marked stale (None unless all are still held).
+    """
+    rendered_days = [(day.isoformat(), get_stale_rendered(day.isoformat())) for day in days_in(window_start, window_end)]
+    if any(rendered is None for _, rendered in rendered_days):
+        return None
+    return rendered_days
+
+async def iter_schedule_range(start: date, end: date) -> AsyncIterator[List[Tuple[str, RenderedSchedule]]]:
+    """
+    Yield each window's (date, rendered schedule) pairs, in order; only one window is held
+    in memory at a time. Every window gets its own SCHEDULE_DEADLINE_SECONDS for upstream
+    calls. When the upstream fails, a window whose days were all rendered before is served
+    stale; otherwise the error propagates.
+    """
+    for window_start, window_end in split_range(start, end):
+        try:
+            with request_scope(SCHEDULE_DEADLINE_SECONDS):
+                rendered_days = await render_window(window_start, window_end)
+        except (httpx.HTTPError, UpstreamUnavailable):
+            rendered_days = stale_window(window_start, window_end)
+            if rendered_days is None:
+                raise
+        yield rendered_days
@@ -0,0 +1,44 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key: the first caller starts the work,
+    later callers await the same in-flight task and receive its result or exception.
+    The shared task is cancelled only once every caller waiting on it has been cancelled.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self._waiters: Dict[Hashable, int] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            self._waiters[key] = 0
+            task.add_done_callback(lambda finished: self._finish(key, finished))
+
+        self._waiters[key] += 1
+        try:
+            # Shield so one cancelled caller doesn't cancel the work shared with the others
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if not task.done() and self._inflight.get(key) is task and self._waiters[key] == 1:
+                task.cancel()
+            raise
+        finally:
+            if self._inflight.get(key) is task:
+                self._waiters[key] -= 1
+
+    def in_flight(self) -> int:
+        return len(self._inflight)
+
+    def _finish(self, key: Hashable, finished: asyncio.Task) -> None:
+        if self._inflight.get(key) is finished:
+            del self._inflight[key]
+            del self._waiters[key]
+        # Mark the exception as retrieved; waiters still receive it
+        if not finished.cancelled():
+            finished.exception()
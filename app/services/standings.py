@@ -0,0 +1,285 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from datetime import date
+from typing import Any, Dict, Hashable, List, Optional, Set, Tuple
+import httpx
+import numpy as np
+from app.config import ARCHIVE_DIR, STANDINGS_MAX_ENTRIES, STANDINGS_REFRESH_SECONDS
+from app.services.archive import load_archive, season_archive_path
+from app.services.final_store import FINAL_DETAILED_STATES, is_final_result
+from app.services.formatter import build_team_info, extract_games, match_affiliate
+from app.services.mlb_api import get_affiliates_for_orgs, get_schedule_for_teams
+from app.services.resilience import UpstreamUnavailable
+from app.services.schedule_range import split_range
+from app.services.singleflight import SingleFlight
+from app.utils.json_utils import dumps
+
+logger = logging.getLogger(__name__)
+
+# Per-game result columns, one row per (affiliate team, final game)
+RESULT_COLUMNS = {
+    "team_id": np.int32,
+    "game_pk": np.int64,
+    "date": "datetime64[D]",
+    "is_home": np.bool_,
+    "runs_for": np.int32,
+    "runs_against": np.int32,
+}
+
+def _record(wins: np.ndarray, losses: np.ndarray, index: int) -> Dict[str, int]:
+    return {"wins": int(wins[index]), "losses": int(losses[index])}
+
+def _win_pct(wins: int, losses: int) -> float:
+    return round(wins / (wins + losses), 3) if wins + losses else 0.0
+
+def _group_totals(keys: np.ndarray, wins: np.ndarray, losses: np.ndarray, runs_for: np.ndarray, runs_against: np.ndarray) -> Dict[str, Dict[str, Any]]:
+    """
+    Sum per-team totals into groups (levels or orgs).
+    """
+    groups, index = np.unique(keys, return_inverse=True)
+    sums = [np.bincount(index, weights=values, minlength=len(groups)).astype(np.int64) for values in (wins, losses, runs_for, runs_against)]
+    return {
+        str(group): {
+            "wins": int(sums[0][i]),
+            "losses": int(sums[1][i]),
+            "win_pct": _win_pct(int(sums[0][i]), int(sums[1][i])),
+            "run_differential": int(sums[2][i] - sums[3][i]),
+        }
+        for i, group in enumerate(groups.tolist())
+    }
+
+def compute_standings(results: Dict[str, np.ndarray], team_info: Dict[int, Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Records, run differential, home/away splits, last 10 and current streak for every team
+    with results, plus level-wide and org-wide totals, in a fixed number of array passes.
+    `team_info` maps team id to {"team_name", "level", "org_id"}.
+    """
+    order = np.lexsort((results["game_pk"], results["date"], results["team_id"]))
+    team_ids = results["team_id"][order]
+    runs_for = results["runs_for"][order]
+    runs_against = results["runs_against"][order]
+    is_home = results["is_home"][order]
+
+    teams, team_index = np.unique(team_ids, return_inverse=True)
+    count = len(teams)
+    won = runs_for > runs_against
+    lost = runs_for < runs_against
+
+    def per_team(values: np.ndarray) -> np.ndarray:
+        return np.bincount(team_index, weights=values, minlength=count).astype(np.int64)
+
+    wins, losses = per_team(won), per_team(lost)
+    scored, allowed = per_team(runs_for), per_team(runs_against)
+    home_wins, home_losses = per_team(won & is_home), per_team(lost & is_home)
+    away_wins, away_losses = per_team(won & ~is_home), per_team(lost & ~is_home)
+
+    # Ties (rare, e.g. called games) don't count toward last 10 or streaks
+    decided = won | lost
+    decided_team = team_index[decided]
+    decided_won = won[decided]
+    decided_count = np.bincount(decided_team, minlength=count)
+    ends = np.cumsum(decided_count)
+    # Games are sorted by team then date, so a game's distance from its team's last game is its recency
+    from_end = ends[decided_team] - np.arange(len(decided_team))
+    recent = from_end <= 10
+    last10_wins = np.bincount(decided_team, weights=decided_won & recent, minlength=count).astype(np.int64)
+    last10_losses = np.bincount(decided_team, weights=~decided_won & recent, minlength=count).astype(np.int64)
+
+    # A run starts wherever the team or the result changes; each team's streak is its last run
+    starts = np.ones(len(decided_team), dtype=bool)
+    starts[1:] = (decided_team[1:] != decided_team[:-1]) | (decided_won[1:] != decided_won[:-1])
+    run_ids = np.cumsum(starts) - 1
+    run_lengths = np.bincount(run_ids) if len(run_ids) else np.zeros(0, dtype=np.int64)
+
+    standings: Dict[str, Any] = {}
+    for i, team_id in enumerate(teams.tolist()):
+        info = team_info.get(team_id, {})
+        streak = ""
+        if decided_count[i]:
+            last = ends[i] - 1
+            streak = ("W" if decided_won[last] else "L") + str(int(run_lengths[run_ids[last]]))
+        standings[str(team_id)] = {
+            "team_name": info.get("team_name", ""),
+            "level": info.get("level", ""),
+            "org_id": info.get("org_id"),
+            "games": int(wins[i] + losses[i]),
+            "wins": int(wins[i]),
+            "losses": int(losses[i]),
+            "win_pct": _win_pct(int(wins[i]), int(losses[i])),
+            "runs_scored": int(scored[i]),
+            "runs_allowed": int(allowed[i]),
+            "run_differential": int(scored[i] - allowed[i]),
+            "home": _record(home_wins, home_losses, i),
+            "away": _record(away_wins, away_losses, i),
+            "last_10": _record(last10_wins, last10_losses, i),
+            "streak": streak,
+        }
+
+    levels = np.array([team_info.get(team_id, {}).get("level", "") for team_id in teams.tolist()], dtype=str)
+    orgs = np.array([team_info.get(team_id, {}).get("org_id") or 0 for team_id in teams.tolist()], dtype=np.int64)
+    return {
+        "teams": standings,
+        "levels": _group_totals(levels, wins, losses, scored, allowed) if count else {},
+        "orgs": _group_totals(orgs, wins, losses, scored, allowed) if count else {},
+    }
+
+class SeasonStandings:
+    """
+    A season of final results for a set of orgs, held as NumPy columns.
+
+    Refreshes only re-read schedule windows that still had unfinished games; a window
+    whose games are all final (and in the past) is never fetched again. New results are
+    appended to the columns, and the standings are recomputed and re-encoded only when
+    the columns changed. A past season with a backfill archive covering its orgs is read
+    from the archive instead, without any upstream calls.
+    """
+
+    def __init__(self, season: int, org_ids: Tuple[int, ...]):
+        self.season = season
+        self.org_ids = org_ids
+        self.team_info: Dict[int, Dict[str, Any]] = {}
+        self.results = {name: np.empty(0, dtype=dtype) for name, dtype in RESULT_COLUMNS.items()}
+        self.version = 0
+        self.refreshed_at: Optional[float] = None
+        self._seen: Set[Tuple[int, int]] = set()
+        self._closed_windows: Set[Tuple[date, date]] = set()
+        self._rendered: Optional[Tuple[int, bytes]] = None
+        self.archived = False
+
+    def needs_refresh(self, max_age: float = STANDINGS_REFRESH_SECONDS) -> bool:
+        return self.refreshed_at is None or time.monotonic() - self.refreshed_at >= max_age
+
+    async def refresh(self, today: date) -> None:
+        if not self.archived and self.refreshed_at is None and today.year > self.season:
+            path = season_archive_path(self.season, ARCHIVE_DIR)
+            if path is not None:
+                try:
+                    self.archived = self.load_archive(await asyncio.to_thread(load_archive, path))
+                except (OSError, ValueError, KeyError) as e:
+                    logger.warning("Can't read season archive %s (%s: %s); using the schedule", path, type(e).__name__, e)
+                if self.archived:
+                    logger.info("Loaded %s standings from %s", self.season, path)
+        if self.archived:
+            # A finished season's results can't change
+            self.refreshed_at = time.monotonic()
+            return
+
+        affiliates_by_org = await get_affiliates_for_orgs(list(self.org_ids), self.season)
+        for org_id, affiliates in affiliates_by_org.items():
+            for team_id, info in build_team_info(affiliates).items():
+                self.team_info[team_id] = dict(info, org_id=org_id)
+        affiliates = [team for teams in affiliates_by_org.values() for team in teams]
+        if not affiliates or today.year < self.season:
+            self.refreshed_at = time.monotonic()
+            return
+        team_ids = list(self.team_info)
+        sport_ids = list(set(team["sport"]["id"] for team in affiliates))
+
+        season_end = min(today, date(self.season, 12, 31))
+        for window in split_range(date(self.season, 1, 1), season_end):
+            if window in self._closed_windows:
+                continue
+            window_start, window_end = window
+            schedule_data = await get_schedule_for_teams(
+                team_ids, sport_ids, start_date=window_start.isoformat(), end_date=window_end.isoformat()
+            )
+            rows: List[Tuple[Any, ...]] = []
+            open_games = False
+            for game in extract_games(schedule_data):
+                if game["status"]["abstractGameState"] != "Final":
+                    open_games = True
+                    continue
+                if not is_final_result(game) or not match_affiliate(game, self.team_info):
+                    continue
+                rows.extend(self._result_rows(game))
+            # Kept window by window, so a refresh that fails part way loses nothing
+            self.append(rows)
+            if window_end < today and not open_games:
+                self._closed_windows.add(window)
+
+        self.refreshed_at = time.monotonic()
+
+    def load_archive(self, archive: Dict[str, Any]) -> bool:
+        """
+        Take the final results from a season archive (see load_archive). Returns False,
+        loading nothing, unless the archive spans the whole season for every requested org.
+        """
+        meta = archive["meta"]
+        if (
+            meta.get("season") != self.season
+            or not set(self.org_ids) <= set(meta.get("orgs", []))
+            or meta.get("start", "") > f"{self.season}-01-01"
+            or meta.get("end", "") < f"{self.season}-12-31"
+        ):
+            return False
+        columns = archive["columns"]
+        final = np.isin(columns["org_id"], self.org_ids)
+        final &= np.logical_or.reduce([np.char.startswith(columns["detailed_state"], state) for state in FINAL_DETAILED_STATES])
+        for team_id, team_name, level, org_id in zip(*(columns[name][final].tolist() for name in ("team_id", "team_name", "level", "org_id"))):
+            self.team_info[team_id] = {"team_name": team_name, "level": level, "org_id": org_id}
+        self.append(list(zip(*(columns[name][final].tolist() for name in (
+            "team_id", "game_pk", "date", "is_home", "team_score", "opponent_score",
+        )))))
+        return True
+
+    def _result_rows(self, game: Dict[str, Any]) -> List[Tuple[Any, ...]]:
+        # Both sides when two tracked affiliates play each other
+        rows = []
+        home, away = game["teams"]["home"], game["teams"]["away"]
+        for side, opponent, is_home in ((home, away, True), (away, home, False)):
+            key = (side["team"]["id"], game["gamePk"])
+            if key[0] in self.team_info and key not in self._seen:
+                self._seen.add(key)
+                day = game.get("officialDate") or game["gameDate"][:10]
+                rows.append((key[0], key[1], day, is_home, side.get("score", 0), opponent.get("score", 0)))
+        return rows
+
+    def append(self, rows: List[Tuple[Any, ...]]) -> None:
+        if not rows:
+            return
+        columns = list(zip(*rows))
+        for (name, dtype), values in zip(RESULT_COLUMNS.items(), columns):
+            self.results[name] = np.concatenate([self.results[name], np.array(values, dtype=dtype)])
+        self.version += 1
+
+    def render(self) -> bytes:
+        """
+        The standings as JSON, re-encoded only when results were added.
+        """
+        if self._rendered is None or self._rendered[0] != self.version:
+            body = {"season": self.season, "orgs_requested": list(self.org_ids), "games": int(len(self.results["game_pk"]))}
+            body.update(compute_standings(self.results, self.team_info))
+            self._rendered = (self.version, dumps(body))
+        return self._rendered[1]
+
+# Season standings per (season, org ids), least recently used dropped first
+_standings: "OrderedDict[Hashable, SeasonStandings]" = OrderedDict()
+standings_flight = SingleFlight()
+
+def clear_standings() -> None:
+    _standings.clear()
+
+async def get_standings(season: int, org_ids: Tuple[int, ...], today: Optional[date] = None) -> Tuple[bytes, bool]:
+    """
+    Rendered standings for the orgs' affiliates and whether they are stale, refreshing at
+    most every STANDINGS_REFRESH_SECONDS (concurrent requests share one refresh). When the
+    upstream fails after an earlier successful refresh, the last standings are returned as stale.
+    """
+    key = (season, org_ids)
+    standings = _standings.get(key)
+    if standings is None:
+        standings = _standings[key] = SeasonStandings(season, org_ids)
+    _standings.move_to_end(key)
+    while len(_standings) > STANDINGS_MAX_ENTRIES:
+        _standings.popitem(last=False)
+
+    if standings.needs_refresh():
+        try:
+            await standings_flight.do(key, lambda: standings.refresh(today or date.today()))
+        except (httpx.HTTPError, UpstreamUnavailable):
+            if standings.refreshed_at is None:
+                raise
+            return standings.render(), True
+    return standings.render(), False
@@ -0,0 +1,64 @@
+import json
+from typing import Any, Dict, Iterable, List, Sequence, Tuple, Union
+
+try:
+    import orjson
+except ImportError:  # optional fast backend
+    orjson = None
+
+def loads(data: Union[bytes, str]) -> Any:
+    """
+    Decode JSON, using orjson when it is installed.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def dumps(value: Any) -> bytes:
+    """
+    Encode JSON as compact UTF-8 bytes, using orjson when it is installed.
+    """
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+def compile_paths(paths: Iterable[str]) -> List[Tuple[str, ...]]:
+    """
+    Split dotted paths ("liveData.boxscore.teams.*.pitchers") into segment tuples.
+    """
+    return [tuple(path.split(".")) for path in paths]
+
+def extract_paths(doc: Any, paths: Sequence[Tuple[str, ...]]) -> Any:
+    """
+    Copy only the given paths out of a decoded document. "*" matches every key of a dict.
+    Everything outside the paths is left behind, so it can be freed once `doc` is dropped.
+    """
+    result: Dict[str, Any] = {}
+    for path in paths:
+        _copy_path(doc, result, path)
+    return result
+
+def _copy_path(source: Any, target: Dict[str, Any], path: Tuple[str, ...]) -> None:
+    if not isinstance(source, dict) or not path:
+        return
+    head, rest = path[0], path[1:]
+    keys = source.keys() if head == "*" else ([head] if head in source else [])
+    for key in keys:
+        value = source[key]
+        if not rest:
+            target[key] = value
+        elif isinstance(value, dict):
+            child = target.get(key)
+            if not isinstance(child, dict):
+                child = target[key] = {}
+            _copy_path(value, child, rest)
+
+def path_is_retained(pointer: str, paths: Sequence[Tuple[str, ...]]) -> bool:
+    """
+    True when a JSON pointer ("/liveData/linescore/outs") falls inside, or above, one of the paths.
+    """
+    parts = [part.replace("~1", "/").replace("~0", "~") for part in pointer.split("/")[1:]]
+    for path in paths:
+        if all(segment == "*" or segment == part for segment, part in zip(path, parts)):
+            return True
+    return False
@@ -0,0 +1,104 @@
+import copy
+import logging
+import logging.handlers
+import queue
+import sys
+from typing import Any, Callable, Dict, Optional, Tuple
+from app.config import LOG_LEVEL, LOG_DEBUG_SAMPLE_EVERY
+
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+class lazy:
+    """
+    Defers computing a log argument until a handler actually formats the record.
+    """
+    __slots__ = ("fn",)
+
+    def __init__(self, fn: Callable[[], Any]):
+        self.fn = fn
+
+    def __str__(self) -> str:
+        return str(self.fn())
+
+    __repr__ = __str__
+
+class DebugSampler(logging.Filter):
+    """
+    Passes one in every `every` DEBUG records per call site; other levels always pass.
+    """
+
+    def __init__(self, every: int):
+        super().__init__()
+        self.every = max(1, every)
+        self._counts: Dict[Tuple[str, int], int] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno != logging.DEBUG or self.every == 1:
+            return True
+        site = (record.pathname, record.lineno)
+        count = self._counts.get(site, 0)
+        self._counts[site] = count + 1
+        return count % self.every == 0
+
+def _snapshot(value: Any) -> Any:
+    if isinstance(value, lazy):
+        return value.fn()
+    if isinstance(value, (dict, list, set)):
+        # Shallow copy: later changes by the caller can't leak into the queued record
+        return copy.copy(value)
+    return value
+
+class SnapshotQueueHandler(logging.handlers.QueueHandler):
+    """
+    Enqueues a copy of each record with its arguments pinned (lazy() arguments resolved,
+    containers copied) instead of the formatted message, so the listener thread does all
+    of the formatting.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        if isinstance(record.args, dict):
+            record.args = {key: _snapshot(value) for key, value in record.args.items()}
+        elif record.args:
+            record.args = tuple(_snapshot(value) for value in record.args)
+        return record
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+def configure_logging(level: str = LOG_LEVEL, sample_every: int = LOG_DEBUG_SAMPLE_EVERY) -> None:
+    """
+    Route the "app" loggers through a QueueHandler so the event loop only enqueues
+    records; a background thread formats them and writes them to stderr.
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    queue_handler = SnapshotQueueHandler(log_queue)
+    queue_handler.addFilter(DebugSampler(sample_every))
+
+    stream_handler = logging.StreamHandler(sys.stderr)
+    stream_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+
+    app_logger = logging.getLogger("app")
+    app_logger.setLevel(level)
+    app_logger.addHandler(queue_handler)
+    app_logger.propagate = False
+
+    _listener = logging.handlers.QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+
+def shutdown_logging() -> None:
+    """
+    Flush queued records and stop the writer thread.
+    """
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+        app_logger = logging.getLogger("app")
+        for handler in list(app_logger.handlers):
+            if isinstance(handler, logging.handlers.QueueHandler):
+                app_logger.removeHandler(handler)
+        app_logger.propagate = True
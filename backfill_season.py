@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Download a whole season of affiliate schedules and completed-game boxscores, store the
+final results for the API (see FINAL_STORE_PATH) and write a columnar season archive.
+
+    python backfill_season.py 2025
+    python backfill_season.py 2025 --org 146,147 --concurrency 8 --rate 10 --out archive/2025.npz
+
+Finished boxscores are checkpointed as they arrive, so an interrupted run picks up
+where it stopped when started again with the same arguments.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from datetime import date
+from typing import Any, Dict, List, Optional
+import httpx
+from app.config import ARCHIVE_DIR, BACKFILL_CONCURRENCY, BACKFILL_RATE_PER_SECOND, FINAL_STORE_PATH, MARLINS_TEAM_ID
+from app.services.archive import archive_row, write_archive
+from app.services.final_store import final_store, has_decisions, is_final_result
+from app.services.formatter import build_completed_details, build_team_info, extract_games, map_game_state, match_affiliate
+from app.services.http_client import create_http_client, set_http_client, close_http_client
+from app.services.mlb_api import get_affiliates_for_orgs, get_game_boxscore, get_schedule_for_teams
+from app.services.schedule_range import split_range
+
+class RateLimiter:
+    """
+    Spaces calls at least 1/rate seconds apart (no limit when rate <= 0).
+    """
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next = 0.0
+
+    async def wait(self) -> None:
+        now = time.monotonic()
+        slot = max(now, self._next)
+        self._next = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+def load_checkpoint(path: str) -> Dict[int, Dict[str, Any]]:
+    """
+    CompletedDetails already fetched by an earlier run, keyed by game_pk.
+    A line cut short by an interruption is ignored.
+    """
+    done: Dict[int, Dict[str, Any]] = {}
+    if not os.path.exists(path):
+        return done
+    with open(path) as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            done[entry["game_pk"]] = entry["details"]
+    return done
+
+async def backfill_season(
+    season: int,
+    org_ids: List[int],
+    out: str,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    concurrency: int = BACKFILL_CONCURRENCY,
+    rate: float = BACKFILL_RATE_PER_SECOND,
+    checkpoint: Optional[str] = None,
+    transport: Optional[httpx.AsyncBaseTransport] = None,
+) -> Dict[str, Any]:
+    """
+    Fetch schedules for [start, end] (the whole season by default) and the boxscore of every
+    completed affiliate game not already stored, then write the archive to `out`.
+    Returns a summary of the run.
+    """
+    start = start or date(season, 1, 1)
+    end = end or date(season, 12, 31)
+    checkpoint = checkpoint or out + ".progress.jsonl"
+    limiter = RateLimiter(rate)
+
+    set_http_client(create_http_client(transport))
+    try:
+        # Step 1: Affiliates per org
+        await limiter.wait()
+        affiliates_by_org = await get_affiliates_for_orgs(org_ids, season)
+        team_info_by_org = {org_id: build_team_info(affiliates) for org_id, affiliates in affiliates_by_org.items()}
+        all_teams = {team_id: info for team_info in team_info_by_org.values() for team_id, info in team_info.items()}
+        team_ids = list(all_teams)
+        sport_ids = list(set(team["sport"]["id"] for affiliates in affiliates_by_org.values() for team in affiliates))
+
+        # Step 2: Schedules, one request per window
+        games: Dict[int, Dict[str, Any]] = {}
+        for window_start, window_end in split_range(start, end):
+            await limiter.wait()
+            schedule_data = await get_schedule_for_teams(
+                team_ids, sport_ids, start_date=window_start.isoformat(), end_date=window_end.isoformat()
+            )
+            for game in extract_games(schedule_data):
+                if match_affiliate(game, all_teams):
+                    games[game["gamePk"]] = game
+
+        # Step 3: Boxscores of finished games not stored or checkpointed yet
+        completed = load_checkpoint(checkpoint)
+        resumed = len(completed)
+        for game_pk in games:
+            stored = final_store.get(game_pk)
+            if stored is not None:
+                completed.setdefault(game_pk, stored)
+        pending = [game for game_pk, game in games.items() if is_final_result(game) and game_pk not in completed]
+
+        semaphore = asyncio.Semaphore(concurrency)
+        failed: List[int] = []
+        with open(checkpoint, "a") as progress:
+
+            async def fetch(game: Dict[str, Any]) -> None:
+                async with semaphore:
+                    await limiter.wait()
+                    # No game state: a season of boxscores would only churn the response cache
+                    boxscore = await get_game_boxscore(game["gamePk"])
+                if boxscore is None:
+                    failed.append(game["gamePk"])
+                    return
+                details = build_completed_details(game, boxscore)
+                completed[game["gamePk"]] = details
+                progress.write(json.dumps({"game_pk": game["gamePk"], "details": details}) + "\n")
+                progress.flush()
+
+            await asyncio.gather(*(fetch(game) for game in pending))
+
+        # Step 4: Store results for the API and write the archive
+        await asyncio.to_thread(final_store.save, {
+            game_pk: details for game_pk, details in completed.items()
+            if final_store.get(game_pk) is None and has_decisions(details)
+        })
+        rows = []
+        for org_id, team_info in team_info_by_org.items():
+            for game in games.values():
+                if match_affiliate(game, team_info):
+                    game_state = map_game_state(game["status"]["abstractGameState"])
+                    rows.append(archive_row(org_id, game, team_info, game_state, completed.get(game["gamePk"], {})))
+        os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+        write_archive(out, rows, season=season, orgs=org_ids, start=start.isoformat(), end=end.isoformat())
+
+        # Failed games stay pending for the next run
+        if not failed and os.path.exists(checkpoint):
+            os.remove(checkpoint)
+
+        return {
+            "games": len(games),
+            "rows": len(rows),
+            "fetched": len(pending) - len(failed),
+            "resumed": resumed,
+            "failed": failed,
+            "path": out,
+        }
+    finally:
+        await close_http_client()
+
+async def main():
+    parser = argparse.ArgumentParser(description="Backfill a season of affiliate results into a columnar archive.")
+    parser.add_argument("season", type=int, help="Season year, e.g. 2025")
+    parser.add_argument("--org", default=str(MARLINS_TEAM_ID), help="Parent MLB team ID(s), comma-separated")
+    parser.add_argument("--start", type=date.fromisoformat, help="First date (YYYY-MM-DD, default January 1)")
+    parser.add_argument("--end", type=date.fromisoformat, help="Last date (YYYY-MM-DD, default December 31)")
+    parser.add_argument("--concurrency", type=int, default=BACKFILL_CONCURRENCY, help="Maximum boxscore requests in flight")
+    parser.add_argument("--rate", type=float, default=BACKFILL_RATE_PER_SECOND, help="Maximum upstream requests per second (0 = unlimited)")
+    parser.add_argument("--out", help="Archive path (.npz, or .parquet with pyarrow installed)")
+    parser.add_argument("--no-store", action="store_true", help="Don't write results to the API's final game store")
+    args = parser.parse_args()
+
+    org_ids = [int(part) for part in args.org.split(",")]
+    out = args.out or os.path.join(ARCHIVE_DIR, f"{args.season}.npz")
+    if FINAL_STORE_PATH and not args.no_store:
+        final_store.open(FINAL_STORE_PATH)
+    try:
+        summary = await backfill_season(args.season, org_ids, out, args.start, args.end, args.concurrency, args.rate)
+    finally:
+        final_store.close()
+
+    print(f"{summary['games']} games, {summary['rows']} rows written to {summary['path']} "
+          f"({summary['fetched']} boxscores fetched, {summary['resumed']} resumed)")
+    if summary["failed"]:
+        print(f"{len(summary['failed'])} boxscores failed; run again to retry them")
+
+if __name__ == "__main__":
+    asyncio.run(main())
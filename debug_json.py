@@ -6,6 +6,7 @@ Debug script to explore MLB API JSON structure and find inning, outs, and runner
 import asyncio
 import json
 from app.services.mlb_api import get_live_game_data
+from app.utils.logging_utils import configure_logging, shutdown_logging
 
 async def debug_game_data(game_pk: int):
     """Debug a specific game to find inning, outs, and runners on base data."""
@@ -107,4 +108,9 @@ async def main():
     print("\n✅ Debug complete! Check the generated JSON file for detailed structure.")
 
 if __name__ == "__main__":
-    asyncio.run(main()) 
\ No newline at end of file
+    # Every upstream request and probe is logged at DEBUG
+    configure_logging(level="DEBUG", sample_every=1)
+    try:
+        asyncio.run(main())
+    finally:
+        shutdown_logging() 
\ No newline at end of file
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Open-loop load driver for the schedule API: sends requests at a fixed rate regardless of
+how fast responses come back, then reports throughput, tail latency and upstream
+amplification (requests the API made to the fake statsapi per client request).
+
+    python -m loadtest.driver --rps 500 --duration 30 \\
+        --path "/schedule?date=2025-07-26&org=146,147" --upstream http://127.0.0.1:9000
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional
+import httpx
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+async def upstream_stats(client: httpx.AsyncClient, upstream: Optional[str]) -> Optional[Dict[str, Any]]:
+    if not upstream:
+        return None
+    response = await client.get(f"{upstream}/_stats")
+    response.raise_for_status()
+    return response.json()
+
+async def run_load(
+    url: str,
+    paths: List[str],
+    rps: float,
+    duration: float,
+    concurrency: int,
+    timeout: float,
+    upstream: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Issue `rps * duration` requests on a fixed schedule, cycling through `paths`.
+    Requests that would exceed `concurrency` open requests are counted as skipped
+    rather than delayed, so a slow server can't hide its latency by slowing the driver.
+    """
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    latencies: List[float] = []
+    statuses: Counter = Counter()
+    in_flight = 0
+    skipped = 0
+
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=timeout) as client:
+        before = await upstream_stats(client, upstream)
+
+        async def one(path: str) -> None:
+            nonlocal in_flight
+            started = time.perf_counter()
+            try:
+                response = await client.get(path)
+                statuses[response.status_code] += 1
+            except httpx.HTTPError as e:
+                statuses[type(e).__name__] += 1
+            finally:
+                latencies.append(time.perf_counter() - started)
+                in_flight -= 1
+
+        total = int(rps * duration)
+        tasks = []
+        started = time.perf_counter()
+        for i in range(total):
+            delay = started + i / rps - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if in_flight >= concurrency:
+                skipped += 1
+                continue
+            in_flight += 1
+            tasks.append(asyncio.ensure_future(one(paths[i % len(paths)])))
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - started
+
+        after = await upstream_stats(client, upstream)
+
+    latencies.sort()
+    completed = len(latencies)
+    report = {
+        "target_rps": rps,
+        "sent": completed,
+        "skipped": skipped,
+        "elapsed_seconds": round(elapsed, 3),
+        "throughput_rps": round(completed / elapsed, 1) if elapsed else 0.0,
+        "statuses": {str(status): count for status, count in statuses.items()},
+        "latency_ms": {
+            name: round(percentile(latencies, fraction) * 1000, 2)
+            for name, fraction in (("p50", 0.5), ("p90", 0.9), ("p99", 0.99), ("p99.9", 0.999), ("max", 1.0))
+        },
+    }
+    if before is not None and after is not None:
+        upstream_requests = after["requests"] - before["requests"]
+        report["upstream_requests"] = upstream_requests
+        report["upstream_errors"] = after["errors"] - before["errors"]
+        report["upstream_by_endpoint"] = {
+            endpoint: count - before["by_endpoint"].get(endpoint, 0)
+            for endpoint, count in after["by_endpoint"].items()
+            if count - before["by_endpoint"].get(endpoint, 0)
+        }
+        report["amplification"] = round(upstream_requests / completed, 4) if completed else 0.0
+    return report
+
+def print_report(report: Dict[str, Any]) -> None:
+    print(f"Sent {report['sent']} requests in {report['elapsed_seconds']}s "
+          f"({report['throughput_rps']} req/s, target {report['target_rps']}, skipped {report['skipped']})")
+    print("Statuses: " + ", ".join(f"{status}={count}" for status, count in sorted(report["statuses"].items())))
+    print("Latency (ms): " + ", ".join(f"{name}={value}" for name, value in report["latency_ms"].items()))
+    if "amplification" in report:
+        print(f"Upstream: {report['upstream_requests']} requests ({report['upstream_errors']} errors), "
+              f"{report['amplification']} per client request")
+        for endpoint, count in sorted(report["upstream_by_endpoint"].items()):
+            print(f"  {endpoint}: {count}")
+
+async def main():
+    parser = argparse.ArgumentParser(description="Drive load against the schedule API.")
+    parser.add_argument("--url", default="http://127.0.0.1:8000", help="Schedule API base URL")
+    parser.add_argument("--path", action="append", dest="paths", help="Request path (repeat to rotate through several)")
+    parser.add_argument("--rps", type=float, default=500.0)
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds of load")
+    parser.add_argument("--concurrency", type=int, default=1000, help="Maximum open requests")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--upstream", help="Fake statsapi base URL, to report upstream amplification")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    report = await run_load(args.url, args.paths or ["/schedule"], args.rps, args.duration, args.concurrency, args.timeout, args.upstream)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for statsapi.mlb.com that serves recorded fixtures (see record_fixtures.py)
+with configurable latency, error rate and live-game progression.
+
+    python -m loadtest.fake_statsapi tests/fixtures/live.json.xz --port 9000 \\
+        --latency lognormal:300:0.6 --error-rate 0.02 --advance 15
+
+Point the API at it with MLB_API_BASE_URL=http://127.0.0.1:9000/api/v1 and
+MLB_LIVE_FEED_BASE_URL=http://127.0.0.1:9000/api/v1.1.
+"""
+
+import argparse
+import asyncio
+import math
+import random
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, List, Tuple
+from urllib.parse import urlsplit
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+from tools.replay import load_fixture
+
+def parse_latency(spec: str) -> Callable[[random.Random], float]:
+    """
+    Build a latency sampler (seconds) from "fixed:MS", "uniform:LO_MS:HI_MS" or
+    "lognormal:MEDIAN_MS:SIGMA".
+    """
+    kind, *args = spec.split(":")
+    values = [float(arg) for arg in args]
+    if kind == "fixed" and len(values) == 1:
+        return lambda rng: values[0] / 1000
+    if kind == "uniform" and len(values) == 2:
+        return lambda rng: rng.uniform(values[0], values[1]) / 1000
+    if kind == "lognormal" and len(values) == 2:
+        mu = math.log(values[0])
+        return lambda rng: rng.lognormvariate(mu, values[1]) / 1000
+    raise ValueError(f"Invalid latency spec: {spec!r}")
+
+def endpoint_name(path: str) -> str:
+    """
+    Group request paths the way /metrics labels them (schedule, affiliates, feed/live, ...).
+    """
+    if "/game/" in path:
+        return path.split("/game/", 1)[1].split("/", 1)[1]
+    return path.rsplit("/", 1)[-1]
+
+class FakeStatsApi:
+    """
+    Serves recorded responses by path and query. A live feed recorded several times
+    steps to its next recording every `advance` seconds after startup (holding the last),
+    and diffPatch requests get the current full feed, as statsapi does when a client is far behind.
+    """
+
+    def __init__(
+        self,
+        fixtures: List[Dict[str, Any]],
+        latency: Callable[[random.Random], float],
+        error_rate: float = 0.0,
+        advance: float = 15.0,
+        seed: int = 0,
+    ):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.advance = advance
+        self.rng = random.Random(seed)
+        self.started = time.monotonic()
+        self.responses: Dict[str, List[Tuple[int, str, bytes]]] = {}
+        for fixture in fixtures:
+            for exchange in fixture["exchanges"]:
+                url = urlsplit(exchange["url"])
+                key = url.path + (f"?{url.query}" if url.query else "")
+                body = fixture["bodies"][exchange["body"]].encode("utf-8")
+                self.responses.setdefault(key, []).append((exchange["status"], exchange["content_type"], body))
+        self.requests: Counter = Counter()
+        self.errors: Counter = Counter()
+        self.misses: Counter = Counter()
+
+    def lookup(self, path: str, query: str) -> Tuple[int, str, bytes]:
+        if path.endswith("/diffPatch"):
+            path, query = path[: -len("/diffPatch")], ""
+        recorded = self.responses.get(path + (f"?{query}" if query else ""))
+        if not recorded:
+            return 404, "application/json", b'{"message": "Not recorded"}'
+        step = int((time.monotonic() - self.started) / self.advance) if self.advance > 0 else 0
+        return recorded[min(step, len(recorded) - 1)]
+
+    async def handle(self, request: Request) -> Response:
+        path = request.url.path
+        endpoint = endpoint_name(path)
+        self.requests[endpoint] += 1
+        await asyncio.sleep(self.latency(self.rng))
+        if self.rng.random() < self.error_rate:
+            self.errors[endpoint] += 1
+            return JSONResponse({"message": "Service Unavailable"}, status_code=503)
+        status, content_type, body = self.lookup(path, request.url.query)
+        if status == 404:
+            self.misses[endpoint] += 1
+        return Response(body, status_code=status, media_type=content_type)
+
+    async def stats(self, request: Request) -> Response:
+        return JSONResponse({
+            "requests": sum(self.requests.values()),
+            "errors": sum(self.errors.values()),
+            "by_endpoint": dict(self.requests),
+            "errors_by_endpoint": dict(self.errors),
+            "misses_by_endpoint": dict(self.misses),
+            "uptime_seconds": time.monotonic() - self.started,
+        })
+
+def create_app(fake: FakeStatsApi) -> Starlette:
+    return Starlette(routes=[
+        Route("/_stats", fake.stats),
+        Route("/{path:path}", fake.handle),
+    ])
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve recorded MLB Stats API fixtures with simulated latency and errors.")
+    parser.add_argument("fixtures", nargs="+", help="Fixture files written by record_fixtures.py")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--latency", default="uniform:100:800", help="fixed:MS, uniform:LO:HI or lognormal:MEDIAN:SIGMA")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 503")
+    parser.add_argument("--advance", type=float, default=15.0, help="Seconds between live feed recordings (0 = hold the first)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    fake = FakeStatsApi(
+        [load_fixture(path) for path in args.fixtures],
+        parse_latency(args.latency),
+        args.error_rate,
+        args.advance,
+        args.seed,
+    )
+    uvicorn.run(create_app(fake), host=args.host, port=args.port, log_level="warning")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Record a full upstream session for one day (affiliates, schedule, and every game's
+feed/live, boxscore and plays) into an xz-compressed fixture for offline benchmarks and tests.
+
+    python record_fixtures.py 2025-07-25 --name mixed
+    python record_fixtures.py 2025-07-25 --name live --org 146,147 --polls 6 --interval 10
+"""
+
+import argparse
+import asyncio
+import os
+from typing import Any, Dict, List, Optional
+import httpx
+from app.config import MARLINS_TEAM_ID, LIVE_FEED_BASE_URL
+from app.services.http_client import create_http_client, set_http_client, close_http_client
+from app.services.mlb_api import (
+    affiliates_cache,
+    response_cache,
+    live_feed_store,
+    get_affiliates_for_orgs,
+    get_schedule_for_teams,
+    get_live_feed_data,
+    get_game_boxscore,
+    get_game_plays,
+)
+from app.services.formatter import extract_games, match_affiliate, build_team_info
+from tools.replay import RecordingTransport, build_fixture, save_fixture
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tests", "fixtures")
+
+async def record_session(
+    date_str: str,
+    org_ids: List[int],
+    polls: int = 0,
+    interval: float = 5.0,
+    transport: Optional[httpx.AsyncBaseTransport] = None,
+) -> Dict[str, Any]:
+    """
+    Fetch everything /schedule could ask for on `date_str` through a recording transport.
+    Live feeds are re-fetched `polls` more times, `interval` seconds apart, so replays can
+    step through the game's progression.
+    """
+    # Start cold so every request reaches the upstream
+    affiliates_cache.invalidate()
+    response_cache.clear()
+    live_feed_store.clear()
+
+    recorder = RecordingTransport(transport)
+    set_http_client(create_http_client(recorder))
+    try:
+        year = int(date_str[:4])
+        affiliates_by_org = await get_affiliates_for_orgs(org_ids, year)
+        affiliates = [team for teams in affiliates_by_org.values() for team in teams]
+        team_ids = list(dict.fromkeys(team["id"] for team in affiliates))
+        sport_ids = list(set(team["sport"]["id"] for team in affiliates))
+        schedule_data = await get_schedule_for_teams(team_ids, sport_ids, date_str)
+
+        team_info = build_team_info(affiliates)
+        games = {game["gamePk"]: game for game in extract_games(schedule_data) if match_affiliate(game, team_info)}
+
+        # Every detail endpoint, not just what the current fetch plan uses, so replays
+        # also cover the fallback paths
+        await asyncio.gather(*(
+            fetcher(game_pk)
+            for game_pk in games
+            for fetcher in (get_live_feed_data, get_game_boxscore, get_game_plays)
+        ))
+
+        live = [game_pk for game_pk, game in games.items() if game["status"]["abstractGameState"] == "Live"]
+        client = create_http_client(recorder)
+        try:
+            for _ in range(polls if live else 0):
+                await asyncio.sleep(interval)
+                await asyncio.gather(*(client.get(f"{LIVE_FEED_BASE_URL}/game/{game_pk}/feed/live") for game_pk in live))
+        finally:
+            await client.aclose()
+
+        return build_fixture(
+            recorder.exchanges,
+            date=date_str,
+            orgs=org_ids,
+            path=f"/schedule?date={date_str}" + (f"&org={','.join(str(id) for id in org_ids)}" if org_ids != [MARLINS_TEAM_ID] else ""),
+            games={str(game_pk): game["status"]["abstractGameState"] for game_pk, game in games.items()},
+        )
+    finally:
+        await close_http_client()
+
+async def main():
+    parser = argparse.ArgumentParser(description="Record MLB Stats API responses for offline replay.")
+    parser.add_argument("date", help="Date in YYYY-MM-DD format")
+    parser.add_argument("--name", required=True, help="Fixture name, e.g. all_preview, mixed, live, all_final")
+    parser.add_argument("--org", default=str(MARLINS_TEAM_ID), help="Parent MLB team ID(s), comma-separated")
+    parser.add_argument("--polls", type=int, default=0, help="Extra live feed polls to record")
+    parser.add_argument("--interval", type=float, default=5.0, help="Seconds between live feed polls")
+    parser.add_argument("--out", default=FIXTURE_DIR, help="Directory to write <name>.json.xz into")
+    args = parser.parse_args()
+
+    org_ids = [int(part) for part in args.org.split(",")]
+    fixture = await record_session(args.date, org_ids, args.polls, args.interval)
+    fixture["name"] = args.name
+
+    os.makedirs(args.out, exist_ok=True)
+    path = os.path.join(args.out, f"{args.name}.json.xz")
+    save_fixture(path, fixture)
+    print(f"Recorded {len(fixture['exchanges'])} responses ({len(fixture['games'])} games) to {path}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,192 @@
+import asyncio
+import json
+import os
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+# Keep finished games in memory only, so runs don't depend on each other
+os.environ["FINAL_STORE_PATH"] = ""
+
+import app.main
+from app.services.formatter import base_states, build_team_info, extract_games, match_affiliate, fetch_game_details, assemble_schedule
+from app.services.final_store import final_store
+from app.services.http_client import create_http_client, set_http_client
+from app.services import mlb_api
+from app.services.mlb_api import affiliates_cache, response_cache, live_feed_store, get_affiliates_for_orgs, get_schedule_for_teams
+from tools.replay import ReplayTransport, load_fixture
+from app.services.resilience import reset_circuit_breakers
+from app.services.schedule_cache import schedule_response_cache
+from app.services.standings import clear_standings
+from tests.fixtures.make_synthetic import build_games, mock_upstream
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+BASELINES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baselines.json")
+
+# Recorded sessions: every game scheduled, a mix of states, ten live games (two orgs), every game final
+SCENARIOS = ["all_preview", "mixed", "live", "all_final"]
+
+# The synthetic upstream's default day: one org, four finished and two scheduled games
+SYNTHETIC_GAMES = build_games("2025-07-20", [146], ["Final"] * 4 + ["Preview"] * 2)
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--update-baselines",
+        action="store_true",
+        help="Rewrite tests/benchmark_baselines.json from this run instead of checking against it",
+    )
+    parser.addoption(
+        "--timing",
+        action="store_true",
+        help="Also run the timing benchmarks and check them against their baselines",
+    )
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "timing: wall-clock benchmark, run only with --timing or --update-baselines")
+
+def pytest_collection_modifyitems(config, items):
+    # Timings depend on the machine; the default run keeps only the deterministic checks
+    if config.getoption("--timing") or config.getoption("--update-baselines"):
+        return
+    skip = pytest.mark.skip(reason="timing benchmark; run with --timing")
+    for item in items:
+        if "timing" in item.keywords:
+            item.add_marker(skip)
+
+def reset_caches() -> None:
+    """
+    Drop every cached upstream and rendered response (and breaker state) so the next request runs cold.
+    """
+    reset_circuit_breakers()
+    affiliates_cache.invalidate()
+    response_cache.clear()
+    live_feed_store.clear()
+    base_states.clear()
+    final_store.clear()
+    schedule_response_cache.clear()
+    clear_standings()
+
+class Clock:
+    """
+    Stands in for the time module in app.services.cache, running `offset` seconds ahead.
+    """
+
+    def __init__(self):
+        self.offset = 0.0
+
+    def monotonic(self) -> float:
+        return time.monotonic() + self.offset
+
+class Baselines:
+    """
+    Stored per-scenario numbers a run must not exceed by more than a tolerance.
+    """
+
+    def __init__(self, data: Dict[str, Dict[str, float]], update: bool):
+        self.data = data
+        self.update = update
+
+    def check(self, scenario: str, metric: str, value: float, tolerance: float) -> None:
+        if self.update:
+            self.data.setdefault(scenario, {})[metric] = value
+            return
+        baseline = self.data.get(scenario, {}).get(metric)
+        if baseline is None:
+            pytest.skip(f"No baseline for {scenario}.{metric}; run with --update-baselines")
+        limit = baseline * (1 + tolerance)
+        assert value <= limit, f"{scenario}.{metric} regressed: {value:.6g} > {limit:.6g} (baseline {baseline:.6g})"
+
+@pytest.fixture(scope="session")
+def baselines(request):
+    data = {}
+    if os.path.exists(BASELINES_PATH):
+        with open(BASELINES_PATH) as f:
+            data = json.load(f)
+    recorded = Baselines(data, request.config.getoption("--update-baselines"))
+    yield recorded
+    if recorded.update:
+        with open(BASELINES_PATH, "w") as f:
+            json.dump(recorded.data, f, indent=2, sort_keys=True)
+            f.write("\n")
+
+@pytest.fixture(params=SCENARIOS)
+def scenario(request) -> Dict[str, Any]:
+    return load_fixture(os.path.join(FIXTURE_DIR, f"{request.param}.json.xz"))
+
+@pytest.fixture
+def replay(scenario) -> ReplayTransport:
+    return ReplayTransport(scenario)
+
+@contextmanager
+def serve_app(transport: httpx.AsyncBaseTransport, monkeypatch) -> Iterator[TestClient]:
+    """
+    The app, cold, with the poller off and its upstream client on `transport`.
+    """
+    monkeypatch.setattr(app.main, "LIVE_POLLER_ENABLED", False)
+    reset_caches()
+    with TestClient(app.main.app) as client:
+        # The lifespan installs a network client; replace it once the app is up
+        set_http_client(create_http_client(transport))
+        yield client
+    reset_caches()
+
+@pytest.fixture
+def upstream_transport(request) -> httpx.AsyncBaseTransport:
+    """
+    The upstream behind app_client: the test's indirect parameter, else SYNTHETIC_GAMES.
+    A module can also override this fixture to serve something else.
+    """
+    return getattr(request, "param", None) or mock_upstream([146], SYNTHETIC_GAMES)
+
+@pytest.fixture
+def app_client(upstream_transport, monkeypatch):
+    """
+    The app on upstream_transport; retries don't wait, so failure paths stay fast.
+    """
+    monkeypatch.setattr(mlb_api, "backoff_delay", lambda attempt: 0)
+    with serve_app(upstream_transport, monkeypatch) as client:
+        yield client
+
+@pytest.fixture
+def replay_client(replay, monkeypatch):
+    """
+    The app with its upstream client pointed at the recorded session.
+    """
+    with serve_app(replay, monkeypatch) as client:
+        yield client
+
+@pytest.fixture
+def format_fetched(scenario, replay):
+    """
+    Fetch the scenario's details once, then return a function that runs only the pure
+    formatting pass over them (one assemble_schedule per org, as /schedule does).
+    """
+    async def load():
+        reset_caches()
+        set_http_client(create_http_client(replay))
+        year = int(scenario["date"][:4])
+        affiliates_by_org = await get_affiliates_for_orgs(scenario["orgs"], year)
+        affiliates = [team for teams in affiliates_by_org.values() for team in teams]
+        team_ids = list(dict.fromkeys(team["id"] for team in affiliates))
+        sport_ids = list(set(team["sport"]["id"] for team in affiliates))
+        schedule_data = await get_schedule_for_teams(team_ids, sport_ids, scenario["date"])
+        team_info_by_org = {org_id: build_team_info(teams) for org_id, teams in affiliates_by_org.items()}
+        all_teams = build_team_info(affiliates)
+        games = [game for game in extract_games(schedule_data) if match_affiliate(game, all_teams)]
+        return team_info_by_org, games, await fetch_game_details(games)
+
+    team_info_by_org, games, fetched = asyncio.run(load())
+
+    def format_once() -> Dict[int, Dict[int, dict]]:
+        response = {}
+        for org_id, team_info in team_info_by_org.items():
+            org_games = [game for game in games if match_affiliate(game, team_info)]
+            response[org_id] = assemble_schedule(team_info, org_games, fetched)
+        return response
+
+    yield format_once
+    set_http_client(None)
+    reset_caches()
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Build the checked-in benchmark fixtures without network access.
+
+Runs record_fixtures.record_session against a mock upstream that serves statsapi-shaped
+payloads around the real boxscore in debug_game_777008.json, so the recorded URLs match
+exactly what the service requests. Replace these with real sessions from
+record_fixtures.py whenever statsapi.mlb.com is reachable.
+
+    python -m tests.fixtures.make_synthetic
+"""
+
+import asyncio
+import copy
+import json
+import os
+from typing import Any, Dict, List, Tuple
+import httpx
+from record_fixtures import FIXTURE_DIR, record_session
+from tools.replay import save_fixture
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+BOXSCORE = json.load(open(os.path.join(ROOT, "debug_game_777008.json")))
+
+def final_boxscore() -> Dict[str, Any]:
+    """
+    The boxscore with the decisions credited (each side's starter), as served once a game is final.
+    """
+    boxscore = copy.deepcopy(BOXSCORE)
+    for side, stat in (("home", "wins"), ("away", "losses")):
+        team = boxscore["teams"][side]
+        team["players"][f"ID{team['pitchers'][0]}"]["stats"]["pitching"][stat] = 1
+    return boxscore
+
+FINAL_BOXSCORE = final_boxscore()
+
+SPORTS = {
+    1: "Major League Baseball",
+    11: "Triple-A",
+    12: "Double-A",
+    13: "High-A",
+    14: "Single-A",
+    16: "Rookie",
+}
+
+# (team id, name, sport id) per parent org
+ORGS = {
+    146: [
+        (146, "Miami Marlins", 1),
+        (564, "Jacksonville Jumbo Shrimp", 11),
+        (4124, "Pensacola Blue Wahoos", 12),
+        (554, "Beloit Sky Carp", 13),
+        (479, "Jupiter Hammerheads", 14),
+        (619, "FCL Marlins", 16),
+    ],
+    147: [
+        (147, "New York Yankees", 1),
+        (531, "Scranton/Wilkes-Barre RailRiders", 11),
+        (1956, "Somerset Patriots", 12),
+        (537, "Hudson Valley Renegades", 13),
+        (587, "Tampa Tarpons", 14),
+    ],
+}
+
+# (fixture name, date, orgs, state per game in affiliate order)
+SCENARIOS = [
+    ("all_preview", "2025-08-01", [146], ["Preview"] * 6),
+    ("mixed", "2025-07-25", [146], ["Final", "Live", "Live", "Preview", "Final", "Preview"]),
+    ("live", "2025-07-26", [146, 147], ["Live"] * 10 + ["Final"]),
+    ("all_final", "2025-07-20", [146], ["Final"] * 6),
+]
+
+OPPONENTS = [
+    "Durham Bulls", "Montgomery Biscuits", "Lake County Captains", "Dunedin Blue Jays",
+    "FCL Cardinals", "Norfolk Tides", "Erie SeaWolves", "Wilmington Blue Rocks",
+    "Bradenton Marauders", "Toronto Blue Jays", "Charlotte Knights",
+]
+
+DETAILED_STATE = {"Preview": "Scheduled", "Live": "In Progress", "Final": "Final"}
+
+def affiliate(team_id: int, name: str, sport_id: int, org_id: int) -> Dict[str, Any]:
+    team = {"id": team_id, "name": name, "sport": {"id": sport_id, "name": SPORTS[sport_id]}}
+    if team_id != org_id:
+        team["parentOrgId"] = org_id
+    return team
+
+def build_games(date_str: str, orgs: List[int], states: List[str]) -> List[Dict[str, Any]]:
+    teams = [team for org_id in orgs for team in ORGS[org_id]]
+    games = []
+    for i, (state, (team_id, name, _)) in enumerate(zip(states, teams)):
+        opponent = {"id": 9000 + i, "name": OPPONENTS[i]}
+        home = {"team": {"id": team_id, "name": name}, "score": 4 if state != "Preview" else 0}
+        away = {"team": opponent, "score": 2 if state != "Preview" else 0}
+        games.append({
+            "gamePk": 800000 + int(date_str.replace("-", "")[-4:]) * 100 + i,
+            "gameDate": f"{date_str}T23:05:00Z",
+            "officialDate": date_str,
+            "status": {"abstractGameState": state, "detailedState": DETAILED_STATE[state]},
+            "teams": {"home": home, "away": away} if i % 2 == 0 else {"home": away, "away": home},
+            "venue": {"name": f"{name} Park"},
+        })
+    return games
+
+def build_plays(inning: int) -> List[Dict[str, Any]]:
+    plays = []
+    for at_bat in range(inning * 6):
+        runner = {"details": {"runner": {"fullName": f"Runner {at_bat}"}}, "movement": {"start": None, "end": "1B"}}
+        plays.append({
+            "atBatIndex": at_bat,
+            "about": {"inning": at_bat // 6 + 1, "halfInning": "top" if at_bat % 6 < 3 else "bottom"},
+            "result": {"event": "Single" if at_bat % 3 == 0 else "Groundout"},
+            "count": {"outs": at_bat % 3 + 1},
+            "runners": [runner] if at_bat % 3 == 0 else [],
+            "playEvents": [{"details": {"type": {"code": "X"}}, "runner": runner}] if at_bat % 3 == 0 else [],
+        })
+    return plays
+
+def build_feed(game: Dict[str, Any], poll: int) -> Dict[str, Any]:
+    state = game["status"]["abstractGameState"]
+    inning = 4 + poll
+    plays = build_plays(inning)
+    linescore = {}
+    if state == "Live":
+        linescore = {
+            "currentInning": inning,
+            "inningHalf": "Top" if game["gamePk"] % 2 else "Bottom",
+            "outs": poll % 3,
+            "offense": {"batter": {"fullName": "Xavier Edwards"}, "first": {"fullName": "Otto Lopez"}},
+            "defense": {"pitcher": {"fullName": "Sandy Alcantara"}},
+        }
+    return {
+        "gamePk": game["gamePk"],
+        "metaData": {"timeStamp": f"{game['officialDate'].replace('-', '')}_23{10 + poll:02d}00"},
+        "gameData": {"status": game["status"], "game": {"pk": game["gamePk"]}},
+        "liveData": {
+            "linescore": linescore,
+            "plays": {"allPlays": plays, "currentPlay": plays[-1] if state == "Live" else {}},
+            "boxscore": BOXSCORE,
+            "decisions": {},
+        },
+    }
+
+def mock_upstream(orgs: List[int], games: List[Dict[str, Any]]) -> httpx.MockTransport:
+    by_pk = {game["gamePk"]: game for game in games}
+    polls: Dict[int, int] = {}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if path.endswith("/teams/affiliates"):
+            return httpx.Response(200, json={"teams": [affiliate(*team, org_id) for org_id in orgs for team in ORGS[org_id]]})
+        if path.endswith("/schedule"):
+            return httpx.Response(200, json={"dates": [{"date": games[0]["officialDate"], "games": games}]})
+        game_pk = int(path.split("/game/")[1].split("/")[0])
+        if path.endswith("/feed/live"):
+            poll = polls.get(game_pk, 0)
+            polls[game_pk] = poll + 1
+            return httpx.Response(200, json=build_feed(by_pk[game_pk], poll))
+        if path.endswith("/boxscore"):
+            final = by_pk[game_pk]["status"]["abstractGameState"] == "Final"
+            return httpx.Response(200, json=FINAL_BOXSCORE if final else BOXSCORE)
+        if path.endswith("/plays"):
+            return httpx.Response(200, json={"allPlays": build_plays(5)})
+        return httpx.Response(404, json={"message": "Not found"})
+
+    return httpx.MockTransport(handler)
+
+async def build(name: str, date_str: str, orgs: List[int], states: List[str]) -> Tuple[str, int]:
+    games = build_games(date_str, orgs, states)
+    fixture = await record_session(date_str, orgs, polls=3, interval=0, transport=mock_upstream(orgs, games))
+    fixture["name"] = name
+    fixture["synthetic"] = True
+    path = os.path.join(FIXTURE_DIR, f"{name}.json.xz")
+    save_fixture(path, fixture)
+    return path, len(fixture["exchanges"])
+
+async def main():
+    for scenario in SCENARIOS:
+        path, count = await build(*scenario)
+        print(f"Wrote {count} responses to {path}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,79 @@
+import asyncio
+import json
+import os
+from datetime import date
+import numpy as np
+import pytest
+from backfill_season import RateLimiter, backfill_season
+from app.services import archive
+from app.services.archive import load_archive
+from app.services.final_store import final_store
+from app.services.formatter import build_team_info
+from tools.replay import RecordingTransport
+from tests.conftest import reset_caches
+from tests.fixtures.make_synthetic import ORGS, affiliate, build_games, mock_upstream
+
+DAY = date(2025, 7, 20)
+
+def run(tmp_path, **kwargs):
+    reset_caches()
+    games = build_games(DAY.isoformat(), [146], ["Final"] * 6)
+    recorder = RecordingTransport(mock_upstream([146], games))
+    out = str(tmp_path / "2025.npz")
+    summary = asyncio.run(backfill_season(2025, [146], out, DAY, DAY, rate=0, transport=recorder, **kwargs))
+    boxscores = [exchange["url"] for exchange in recorder.exchanges if exchange["url"].endswith("/boxscore")]
+    return summary, boxscores, games
+
+def test_backfill_writes_archive_and_store(tmp_path):
+    summary, boxscores, games = run(tmp_path)
+
+    archive = load_archive(summary["path"])
+    columns = archive["columns"]
+    assert summary["rows"] == 6 and summary["failed"] == []
+    assert len(boxscores) == 6
+    assert sorted(columns["game_pk"].tolist()) == sorted(game["gamePk"] for game in games)
+    assert columns["date"].dtype == np.dtype("datetime64[D]")
+    assert set(columns["game_state"].tolist()) == {"Completed"}
+    assert archive["meta"]["season"] == 2025
+    assert all(final_store.get(game["gamePk"]) is not None for game in games)
+    assert not os.path.exists(summary["path"] + ".progress.jsonl")
+    reset_caches()
+
+def test_backfill_resumes_from_checkpoint(tmp_path):
+    games = build_games(DAY.isoformat(), [146], ["Final"] * 6)
+    details = {"final_score": {"home": 4, "away": 2}, "winning_pitcher": "A", "losing_pitcher": "B", "save_pitcher": "N/A"}
+    with open(tmp_path / "2025.npz.progress.jsonl", "w") as f:
+        for game in games[:2]:
+            f.write(json.dumps({"game_pk": game["gamePk"], "details": details}) + "\n")
+        f.write('{"game_pk": ')  # cut short by the interruption
+
+    summary, boxscores, _ = run(tmp_path)
+
+    assert summary["resumed"] == 2
+    assert summary["fetched"] == 4
+    assert len(boxscores) == 4
+    reset_caches()
+
+def test_rate_limiter_spaces_calls():
+    async def timed():
+        limiter = RateLimiter(50)
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        for _ in range(5):
+            await limiter.wait()
+        return loop.time() - started
+
+    assert asyncio.run(timed()) >= 4 / 50 * 0.9
+
+@pytest.mark.skipif(archive.pyarrow is None, reason="pyarrow is not installed")
+def test_parquet_archive_round_trip(tmp_path):
+    rows = [archive.archive_row(146, game, build_team_info([affiliate(*team, 146) for team in ORGS[146]]), "Completed", {})
+            for game in build_games(DAY.isoformat(), [146], ["Final"] * 6)]
+    path = str(tmp_path / "2025.parquet")
+
+    written = archive.write_archive(path, rows, season=2025)
+    loaded = archive.load_archive(path)
+
+    assert loaded["meta"] == {"season": 2025}
+    for name in archive.ARCHIVE_COLUMNS:
+        assert loaded["columns"][name].tolist() == written[name].tolist()
@@ -0,0 +1,79 @@
+from app.services.base_state import BaseStateEngine, apply_play
+
+def runner(name, start, end, is_out=False):
+    return {
+        "details": {"runner": {"id": hash(name), "fullName": name}},
+        "movement": {"start": start, "end": end, "isOut": is_out},
+    }
+
+def play(at_bat, inning, half, runners, outs=0, complete=True):
+    return {
+        "atBatIndex": at_bat,
+        "about": {"inning": inning, "halfInning": half, "isComplete": complete},
+        "count": {"outs": outs},
+        "runners": runners,
+    }
+
+def test_apply_play_is_independent_of_runner_order():
+    # Batter doubles: the runner on 2B scores and the runner on 1B takes third
+    movements = [runner("Batter", None, "2B"), runner("Lead", "2B", "score"), runner("Trail", "1B", "3B")]
+    for ordering in (movements, list(reversed(movements))):
+        bases = {"1B": "Trail", "2B": "Lead"}
+        apply_play(bases, play(5, 3, "top", ordering))
+        assert bases == {"2B": "Batter", "3B": "Trail"}
+
+def test_runner_moving_twice_in_one_play():
+    # Steals second, then advances to third on the single
+    bases = {"1B": "Runner"}
+    apply_play(bases, play(1, 1, "top", [
+        runner("Runner", "1B", "2B"),
+        runner("Runner", "2B", "3B"),
+        runner("Batter", None, "1B"),
+    ]))
+    assert bases == {"1B": "Batter", "3B": "Runner"}
+
+def test_half_inning_resets_bases():
+    engine = BaseStateEngine(max_games=4)
+    plays = [
+        play(0, 1, "top", [runner("A", None, "1B")]),
+        play(1, 1, "top", [runner("B", None, "1B"), runner("A", "1B", "2B")]),
+        play(2, 1, "top", [runner("C", None, None, is_out=True)], outs=3),
+    ]
+    assert engine.runners(1, plays) == {}
+
+    plays.append(play(3, 1, "bottom", [runner("D", None, "2B")]))
+    assert engine.runners(1, plays) == {"2B": "D"}
+
+def test_refresh_processes_only_new_plays():
+    engine = BaseStateEngine(max_games=4)
+    plays = [play(0, 1, "top", [runner("A", None, "1B")])]
+    assert engine.runners(1, plays) == {"1B": "A"}
+
+    # Mutating an already-processed play shows it is not re-read
+    plays[0]["runners"] = [runner("Z", None, "3B")]
+    plays.append(play(1, 1, "top", [runner("B", None, "1B"), runner("A", "1B", "2B")]))
+    assert engine.runners(1, plays) == {"1B": "B", "2B": "A"}
+
+def test_in_progress_play_is_not_memoised():
+    engine = BaseStateEngine(max_games=4)
+    plays = [
+        play(0, 2, "top", [runner("A", None, "1B")]),
+        play(1, 2, "top", [runner("A", "1B", "2B")], complete=False),
+    ]
+    assert engine.runners(1, plays) == {"2B": "A"}
+
+    # The at-bat finishes: the steal is followed by a walk
+    plays[1] = play(1, 2, "top", [runner("A", "1B", "2B"), runner("B", None, "1B")])
+    assert engine.runners(1, plays) == {"1B": "B", "2B": "A"}
+
+def test_revised_play_list_rebuilds():
+    engine = BaseStateEngine(max_games=4)
+    engine.runners(1, [play(0, 1, "top", [runner("A", None, "1B")]), play(1, 1, "top", [])])
+
+    assert engine.runners(1, [play(7, 1, "top", [runner("B", None, "3B")])]) == {"3B": "B"}
+
+def test_engine_is_bounded():
+    engine = BaseStateEngine(max_games=2)
+    for game_pk in range(3):
+        engine.runners(game_pk, [play(0, 1, "top", [])])
+    assert len(engine) == 2
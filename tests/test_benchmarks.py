@@ -0,0 +1,43 @@
+import os
+import pytest
+from app.services.standings import compute_standings
+from tests.conftest import reset_caches
+from tests.test_standings import league_results
+
+pytest.importorskip("pytest_benchmark")
+
+pytestmark = pytest.mark.timing
+
+ROUNDS = 15
+# Allowed slowdown over the stored medians (1.0 = up to twice as slow); CI machines vary
+TIME_TOLERANCE = float(os.environ.get("BENCHMARK_TIME_TOLERANCE", "1.0"))
+
+def check_median(benchmark, baselines, scenario, metric):
+    if benchmark.disabled:
+        return
+    baselines.check(scenario["name"], metric, benchmark.stats.stats.median, TIME_TOLERANCE)
+
+def test_schedule_latency(benchmark, replay_client, replay, scenario, baselines):
+    def cold():
+        reset_caches()
+        replay.reset()
+        return (scenario["path"],), {}
+
+    response = benchmark.pedantic(replay_client.get, setup=cold, rounds=ROUNDS, warmup_rounds=1)
+
+    assert response.status_code == 200
+    check_median(benchmark, baselines, scenario, "schedule_median_seconds")
+
+def test_formatter_cpu(benchmark, format_fetched, scenario, baselines):
+    benchmark(format_fetched)
+
+    check_median(benchmark, baselines, scenario, "format_median_seconds")
+
+def test_standings_compute(benchmark, baselines):
+    # A full season for 30 orgs x 5 levels
+    columns, team_info = league_results()
+
+    computed = benchmark(compute_standings, columns, team_info)
+
+    assert len(computed["teams"]) == 150
+    check_median(benchmark, baselines, {"name": "season"}, "standings_median_seconds")
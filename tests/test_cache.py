@@ -0,0 +1,107 @@
+import pytest
+from app.config import GAME_STATE_CACHE_TTL_SECONDS, STALE_IF_ERROR_SECONDS
+from app.services import cache, mlb_api
+from app.services.cache import ResponseCache
+from tests.conftest import Clock
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache, "time", clock)
+    return clock
+
+def test_entries_expire_after_their_ttl(clock):
+    responses = ResponseCache(1024)
+    responses.set("url", "payload", 10, ttl=60)
+
+    fresh = responses.get("url")
+    clock.offset = 61
+    expired = responses.get("url")
+
+    assert fresh == "payload" and expired is None
+    assert responses.stats()["entries"] == 0
+
+@pytest.mark.parametrize("state", ["Final", "Preview", "Live"])
+def test_ttl_follows_game_state(clock, monkeypatch, state):
+    responses = ResponseCache(1024)
+    monkeypatch.setattr(mlb_api, "response_cache", responses)
+    ttl = GAME_STATE_CACHE_TTL_SECONDS[state]
+
+    mlb_api.cache_response("url", "payload", 10, state)
+    clock.offset = ttl - 1
+    before = responses.get("url")
+    clock.offset = ttl + 1
+    after = responses.get("url")
+
+    assert before == "payload" and after is None
+    # Still held as a stale fallback for STALE_IF_ERROR_SECONDS
+    assert responses.get_stale("url") == "payload"
+
+def test_unknown_state_is_not_cached(clock, monkeypatch):
+    responses = ResponseCache(1024)
+    monkeypatch.setattr(mlb_api, "response_cache", responses)
+
+    mlb_api.cache_response("url", "payload", 10, None)
+
+    assert responses.get("url") is None
+    assert responses.stats()["entries"] == 0
+
+def test_stale_window_ends(clock):
+    responses = ResponseCache(1024)
+    responses.set("url", "payload", 10, ttl=60, stale_ttl=STALE_IF_ERROR_SECONDS)
+
+    clock.offset = 60 + STALE_IF_ERROR_SECONDS - 1
+    stale = responses.get_stale("url")
+    clock.offset = 60 + STALE_IF_ERROR_SECONDS + 1
+
+    assert stale == "payload"
+    assert responses.get_stale("url") is None
+    assert responses.stats()["bytes"] == 0
+
+def test_least_recently_used_evicted_past_byte_budget(clock):
+    responses = ResponseCache(100)
+    responses.set("a", "A", 40, ttl=60)
+    responses.set("b", "B", 40, ttl=60)
+    # Reading "a" makes "b" the least recently used
+    responses.get("a")
+
+    responses.set("c", "C", 40, ttl=60)
+
+    assert responses.get("b") is None
+    assert responses.get("a") == "A" and responses.get("c") == "C"
+    stats = responses.stats()
+    assert stats["bytes"] == 80 and stats["evictions"] == 1
+
+def test_oversized_entries_are_not_cached(clock):
+    responses = ResponseCache(100)
+    responses.set("a", "A", 40, ttl=60)
+
+    responses.set("big", "B", 101, ttl=60)
+
+    assert responses.get("big") is None
+    assert responses.get("a") == "A"
+    assert responses.stats()["evictions"] == 0
+
+def test_replacing_an_entry_keeps_the_byte_count(clock):
+    responses = ResponseCache(100)
+    responses.set("a", "old", 60, ttl=60)
+
+    responses.set("a", "new", 30, ttl=60)
+
+    assert responses.get("a") == "new"
+    assert responses.stats()["bytes"] == 30
+
+def test_hits_misses_and_stale_hits_counted(clock):
+    responses = ResponseCache(100)
+    responses.set("a", "A", 10, ttl=60, stale_ttl=60)
+
+    responses.get("a")
+    responses.get("a")
+    responses.get("missing")
+    clock.offset = 61
+    responses.get("a")
+    responses.get_stale("a")
+
+    stats = responses.stats()
+    assert (stats["hits"], stats["misses"], stats["stale_hits"]) == (2, 2, 1)
+    assert stats["hit_ratio"] == 0.5
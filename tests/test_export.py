@@ -0,0 +1,118 @@
+import io
+import json
+import httpx
+import pytest
+from app.services import export
+from app.services.archive import ARCHIVE_COLUMNS
+from app.services.final_store import final_store
+from app.services.http_client import create_http_client, set_http_client
+from tools.replay import RecordingTransport
+from tests.conftest import SYNTHETIC_GAMES
+from tests.fixtures.make_synthetic import mock_upstream
+
+@pytest.fixture
+def upstream_transport() -> RecordingTransport:
+    return RecordingTransport(mock_upstream([146], SYNTHETIC_GAMES))
+
+def test_ndjson_export_rows(app_client, upstream_transport):
+    final_store.save({SYNTHETIC_GAMES[0]["gamePk"]: {
+        "final_score": {"home": 4, "away": 2},
+        "winning_pitcher": "Eury Pérez",
+        "losing_pitcher": "Ben Brown",
+        "save_pitcher": "N/A",
+    }})
+
+    response = app_client.get("/schedule/export?start=2025-07-20&end=2025-07-20")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert len(rows) == 6
+    assert {row["game_state"] for row in rows} == {"Completed", "Not Started"}
+    stored = next(row for row in rows if row["game_pk"] == SYNTHETIC_GAMES[0]["gamePk"])
+    assert stored["winning_pitcher"] == "Eury Pérez"
+    assert stored["team_score"] == 4 and stored["is_home"] is True
+    # Built from the schedule alone: no per-game detail calls
+    assert not any("/game/" in exchange["url"] for exchange in upstream_transport.exchanges)
+
+def test_export_takes_one_schedule_request_per_window(app_client, upstream_transport):
+
+    response = app_client.get("/schedule/export?start=2025-07-01&end=2025-08-15")
+
+    assert response.status_code == 200
+    schedules = [exchange for exchange in upstream_transport.exchanges if "/schedule?" in exchange["url"]]
+    assert len(schedules) == 2
+
+def failing_upstream(fail):
+    """
+    The synthetic upstream, answering 503 to every request `fail` picks.
+    """
+    mock = mock_upstream([146], SYNTHETIC_GAMES)
+
+    def handler(request):
+        if fail(request):
+            return httpx.Response(503, json={"message": "Service Unavailable"})
+        return mock.handle_request(request)
+
+    set_http_client(create_http_client(httpx.MockTransport(handler)))
+
+def test_export_unavailable_before_streaming(app_client):
+    failing_upstream(lambda request: True)
+
+    response = app_client.get("/schedule/export?start=2025-07-20&end=2025-07-20")
+
+    assert response.status_code == 503
+
+def test_ndjson_export_ends_with_error_when_a_later_window_fails(app_client):
+    failing_upstream(lambda request: "startDate=2025-08-01" in str(request.url))
+
+    response = app_client.get("/schedule/export?start=2025-07-01&end=2025-08-15")
+
+    assert response.status_code == 200
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert len(lines) == 7
+    assert lines[-1] == {"error": "MLB Stats API is unavailable.", "missing_from": "2025-08-01"}
+
+@pytest.mark.skipif(export.pyarrow is None, reason="pyarrow is not installed")
+def test_parquet_export_broken_off_when_a_later_window_fails(app_client):
+    failing_upstream(lambda request: "startDate=2025-08-01" in str(request.url))
+
+    # The TestClient surfaces the aborted stream as the exception that broke it off
+    with pytest.raises(httpx.HTTPStatusError):
+        app_client.get("/schedule/export?start=2025-07-01&end=2025-08-15&format=parquet")
+
+def test_export_rejects_bad_requests(app_client):
+
+    assert app_client.get("/schedule/export?start=2025-07-20&end=2025-07-01").status_code == 400
+    assert app_client.get("/schedule/export?start=2024-01-01&end=2025-07-01").status_code == 400
+    assert app_client.get("/schedule/export?start=2025-07-20&end=2025-07-20&format=csv").status_code == 400
+
+@pytest.mark.skipif(export.pyarrow is not None, reason="pyarrow is installed")
+def test_arrow_formats_need_pyarrow(app_client):
+
+    response = app_client.get("/schedule/export?start=2025-07-20&end=2025-07-20&format=parquet")
+
+    assert response.status_code == 400
+    assert "ndjson" in response.json()["detail"]
+
+@pytest.mark.skipif(export.pyarrow is None, reason="pyarrow is not installed")
+def test_arrow_stream_round_trip(app_client):
+
+    response = app_client.get("/schedule/export?start=2025-07-20&end=2025-07-20&format=arrow")
+
+    table = export.pyarrow.ipc.open_stream(response.content).read_all()
+    assert table.num_rows == 6
+
+@pytest.mark.skipif(export.pyarrow is None, reason="pyarrow is not installed")
+def test_parquet_round_trip(app_client):
+
+    # Two schedule windows, so two row groups in one file
+    response = app_client.get("/schedule/export?start=2025-07-01&end=2025-08-15&format=parquet")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/vnd.apache.parquet"
+    parquet = export.pyarrow.parquet.ParquetFile(io.BytesIO(response.content))
+    assert parquet.metadata.num_row_groups == 2
+    table = parquet.read()
+    assert table.column_names == list(ARCHIVE_COLUMNS)
+    assert sorted(set(table.column("game_pk").to_pylist())) == sorted(game["gamePk"] for game in SYNTHETIC_GAMES)
@@ -0,0 +1,33 @@
+import copy
+from app.services.extractors import BoxscoreIndex, IndexedBoxscore, current_players, index_boxscore
+from tests.fixtures.make_synthetic import BOXSCORE
+
+def live_boxscore():
+    boxscore = copy.deepcopy(BOXSCORE)
+    for side in ("home", "away"):
+        for player in boxscore["teams"][side]["players"].values():
+            player["gameStatus"] = {}
+    home = boxscore["teams"]["home"]
+    home["players"][f"ID{home['pitchers'][0]}"]["gameStatus"] = {"isCurrentPitcher": True}
+    away = boxscore["teams"]["away"]
+    batter = next(iter(away["players"]))
+    away["players"][batter]["gameStatus"] = {"isCurrentBatter": True}
+    return boxscore
+
+def test_index_lives_on_the_payload():
+    boxscore = IndexedBoxscore(BOXSCORE)
+
+    index = index_boxscore(boxscore)
+
+    assert boxscore.index is index
+    assert index_boxscore(boxscore) is index
+    # Plain dicts aren't remembered anywhere
+    assert index_boxscore(BOXSCORE) is not index_boxscore(BOXSCORE)
+
+def test_current_players_matches_index():
+    boxscore = live_boxscore()
+
+    found = current_players(boxscore)
+
+    assert found == BoxscoreIndex(boxscore).current_players
+    assert [side for side, _ in found] == ["home", "away"]
@@ -0,0 +1,129 @@
+import asyncio
+import os
+import time
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+import app.main
+from app.services import formatter, mlb_api
+from app.services.final_store import FinalGameStore, decode_details, encode_details, final_store, is_final_result
+from app.services.http_client import create_http_client, set_http_client
+from tools.replay import ReplayTransport, load_fixture
+from app.services.resilience import mark_stale, request_scope
+from tests.fixtures.make_synthetic import BOXSCORE, FINAL_BOXSCORE
+from tests.conftest import FIXTURE_DIR, reset_caches
+
+DETAILS = {
+    "final_score": {"home": 11, "away": 3},
+    "winning_pitcher": "Eury Pérez",
+    "losing_pitcher": "Sandy Alcantara",
+    "save_pitcher": "N/A",
+}
+
+def test_encoding_round_trip():
+    blob = encode_details(DETAILS)
+
+    assert decode_details(blob) == DETAILS
+    assert len(blob) < 48
+
+def test_only_played_games_are_final():
+    assert is_final_result({"status": {"abstractGameState": "Final", "detailedState": "Final"}})
+    assert is_final_result({"status": {"abstractGameState": "Final", "detailedState": "Completed Early: Rain"}})
+    assert not is_final_result({"status": {"abstractGameState": "Final", "detailedState": "Postponed"}})
+    assert not is_final_result({"status": {"abstractGameState": "Live", "detailedState": "In Progress"}})
+
+def test_store_survives_reopen(tmp_path):
+    path = str(tmp_path / "final.sqlite3")
+    store = FinalGameStore()
+    store.open(path)
+    store.save({777008: DETAILS})
+    store.close()
+
+    reopened = FinalGameStore()
+    assert reopened.open(path) == 1
+    assert reopened.get(777008) == DETAILS
+    reopened.close()
+
+def test_restart_serves_final_games_without_boxscores(tmp_path, monkeypatch):
+    monkeypatch.setattr(app.main, "LIVE_POLLER_ENABLED", False)
+    monkeypatch.setattr(app.main, "FINAL_STORE_PATH", str(tmp_path / "final.sqlite3"))
+    fixture = load_fixture(os.path.join(FIXTURE_DIR, "all_final.json.xz"))
+
+    responses = []
+    for _ in range(2):
+        # A fresh process: nothing cached but what is on disk
+        reset_caches()
+        replay = ReplayTransport(fixture)
+        with TestClient(app.main.app) as client:
+            set_http_client(create_http_client(replay))
+            responses.append(client.get(fixture["path"]).json())
+        boxscores = [url for url in replay.requests if url.endswith("/boxscore")]
+
+    reset_caches()
+    assert responses[0] == responses[1]
+    assert boxscores == []
+
+FINAL_GAME = {
+    "gamePk": 777008,
+    "status": {"abstractGameState": "Final", "detailedState": "Final"},
+    "teams": {"home": {"score": 11}, "away": {"score": 3}},
+}
+
+def fetch_final_details(monkeypatch, boxscore, stale=False):
+    async def get_boxscore(game_pk, game_state=None):
+        if stale:
+            mark_stale()
+        return boxscore
+
+    monkeypatch.setitem(formatter.DETAIL_FETCHERS, "boxscore", get_boxscore)
+
+    async def fetch():
+        with request_scope(None):
+            return await formatter.fetch_game_details([FINAL_GAME])
+
+    return asyncio.run(fetch())[777008]["completed"]
+
+@pytest.mark.parametrize("boxscore, stale, stored", [
+    (FINAL_BOXSCORE, False, True),
+    # Decisions not credited yet
+    (BOXSCORE, False, False),
+    # Part of the request came from an expired cache entry
+    (FINAL_BOXSCORE, True, False),
+])
+def test_only_complete_fresh_results_are_stored(monkeypatch, boxscore, stale, stored):
+    reset_caches()
+
+    details = fetch_final_details(monkeypatch, boxscore, stale)
+
+    assert details["final_score"] == {"home": 11, "away": 3}
+    assert (final_store.get(777008) is not None) is stored
+
+def test_boxscore_without_decisions_is_fetched_again(monkeypatch):
+    reset_caches()
+    monkeypatch.setattr(mlb_api, "GAME_STATE_CACHE_TTL_SECONDS", {"Final": 3600, "Preview": 0.05, "Live": 0.05})
+    # The first boxscore comes before the official scorer credits the decisions
+    served = [BOXSCORE, FINAL_BOXSCORE]
+    calls = []
+
+    def handler(request):
+        calls.append(str(request.url))
+        return httpx.Response(200, json=served[min(len(calls), len(served)) - 1])
+
+    set_http_client(create_http_client(httpx.MockTransport(handler)))
+
+    async def fetch():
+        with request_scope(None):
+            return (await formatter.fetch_game_details([FINAL_GAME]))[777008]["completed"]
+
+    first = asyncio.run(fetch())
+    time.sleep(0.1)
+    second = asyncio.run(fetch())
+    third = asyncio.run(fetch())
+
+    assert first["winning_pitcher"] == "N/A" and second["winning_pitcher"] != "N/A"
+    assert final_store.get(777008) == second == third
+    # Once credited, the result comes from the store (and the boxscore from the Final TTL)
+    assert len(calls) == 2
+    assert mlb_api.response_cache.get(f"{mlb_api.BASE_URL}/game/777008/boxscore") is not None
+    set_http_client(None)
+    reset_caches()
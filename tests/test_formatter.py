@@ -0,0 +1,109 @@
+import asyncio
+import httpx
+import pytest
+from app.services import formatter, mlb_api
+from app.services.http_client import create_http_client, set_http_client
+from app.services.resilience import request_scope
+from tests.conftest import reset_caches
+from tests.fixtures.make_synthetic import build_feed, build_games, mock_upstream
+
+LIVE_GAMES = build_games("2025-07-20", [146], ["Live"] * 3)
+
+def serve(feed):
+    """
+    The synthetic upstream with the live feed replaced by `feed(game, request)` (a Response).
+    Returns the list of per-game endpoints requested, as (gamePk, endpoint) pairs.
+    """
+    reset_caches()
+    mock = mock_upstream([146], LIVE_GAMES)
+    by_pk = {game["gamePk"]: game for game in LIVE_GAMES}
+    calls = []
+
+    def handler(request):
+        path = request.url.path
+        if "/game/" in path:
+            game_pk = int(path.split("/game/")[1].split("/")[0])
+            calls.append((game_pk, path.rsplit("/", 1)[1]))
+            if path.endswith("/feed/live"):
+                return feed(by_pk[game_pk], request)
+        return mock.handle_request(request)
+
+    set_http_client(create_http_client(httpx.MockTransport(handler)))
+    return calls
+
+def fetch_details(games):
+    async def fetch():
+        with request_scope(None):
+            return await formatter.fetch_game_details(games)
+
+    return asyncio.run(fetch())
+
+def feed_without(*sections):
+    def feed(game, request):
+        data = build_feed(game, poll=0)
+        for section in sections:
+            del data["liveData"][section]
+        return httpx.Response(200, json=data)
+    return feed
+
+@pytest.mark.parametrize("state, planned", [
+    ("Preview", ["boxscore"]),
+    ("Live", ["live_feed"]),
+    ("Final", ["boxscore"]),
+])
+def test_plan_by_game_state(state, planned):
+    reset_caches()
+    game = build_games("2025-07-20", [146], [state])[0]
+
+    assert formatter.plan_game_fetches(game) == planned
+
+def test_stored_final_game_needs_no_calls():
+    reset_caches()
+    game = build_games("2025-07-20", [146], ["Final"])[0]
+    formatter.final_store.save({game["gamePk"]: {
+        "final_score": {"home": 1, "away": 0},
+        "winning_pitcher": "A",
+        "losing_pitcher": "B",
+        "save_pitcher": "N/A",
+    }})
+
+    assert formatter.plan_game_fetches(game) == []
+    reset_caches()
+
+@pytest.mark.parametrize("live_data, fallbacks", [
+    ({"boxscore": {"teams": {}}, "plays": {"allPlays": []}}, []),
+    ({"plays": {"allPlays": []}}, ["boxscore"]),
+    ({"boxscore": {"teams": {}}}, ["plays"]),
+    ({}, ["boxscore", "plays"]),
+])
+def test_live_feed_fallbacks(live_data, fallbacks):
+    assert formatter.plan_live_feed_fallbacks({"liveData": live_data}) == fallbacks
+
+def test_live_feed_fallbacks_when_feed_failed():
+    assert formatter.plan_live_feed_fallbacks(None) == ["boxscore", "plays"]
+
+def test_live_game_costs_one_feed_request():
+    calls = serve(feed_without())
+
+    fetched = fetch_details(LIVE_GAMES)
+
+    assert sorted(calls) == sorted((game["gamePk"], "live") for game in LIVE_GAMES)
+    assert all(set(data) == {"live_feed"} for data in fetched.values())
+    reset_caches()
+
+@pytest.mark.parametrize("feed, fallbacks", [
+    (feed_without("boxscore"), {"boxscore"}),
+    (feed_without("plays"), {"plays"}),
+    (lambda game, request: httpx.Response(404, json={"message": "Not found"}), {"boxscore", "plays"}),
+])
+def test_missing_feed_sections_fetched_separately(monkeypatch, feed, fallbacks):
+    monkeypatch.setattr(mlb_api, "backoff_delay", lambda attempt: 0)
+    calls = serve(feed)
+
+    fetched = fetch_details(LIVE_GAMES)
+
+    for game in LIVE_GAMES:
+        endpoints = [endpoint for game_pk, endpoint in calls if game_pk == game["gamePk"]]
+        assert sorted(endpoints) == sorted(["live", *fallbacks])
+        assert all(fetched[game["gamePk"]][name] is not None for name in fallbacks)
+    reset_caches()
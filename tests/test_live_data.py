@@ -0,0 +1,236 @@
+import asyncio
+import time
+import httpx
+import pytest
+from app.config import LIVE_FEED_FIELDS
+from app.services import mlb_api
+from app.services.formatter import base_states, build_in_progress_details
+from app.services.http_client import create_http_client, set_http_client
+from app.services.live_state import LiveFeedStore, PatchError
+from app.utils.json_utils import compile_paths, extract_paths, path_is_retained
+from tests.conftest import reset_caches
+from tests.fixtures.make_synthetic import build_feed, build_games
+
+@pytest.fixture(autouse=True)
+def fresh_state():
+    reset_caches()
+    mlb_api.live_data_endpoints.clear()
+    yield
+    mlb_api.live_data_endpoints.clear()
+
+def serve(routes, calls):
+    """
+    Mock upstream answering each /game/{pk}/<path> from `routes`: path -> (status, delay).
+    """
+    async def handler(request):
+        path = request.url.path.split("/game/", 1)[1].split("/", 1)[1]
+        calls.append(path)
+        status, delay = routes.get(path, (404, 0))
+        await asyncio.sleep(delay)
+        return httpx.Response(status, json={"source": path})
+    set_http_client(create_http_client(httpx.MockTransport(handler)))
+
+def test_probe_remembers_working_endpoint():
+    calls = []
+    serve({"boxscore": (200, 0)}, calls)
+
+    first = asyncio.run(mlb_api.get_live_game_data(777008, sport_id=11))
+    assert first == {"source": "boxscore"}
+    assert sorted(calls) == ["boxscore", "feed", "feed/live", "live"]
+
+    calls.clear()
+    second = asyncio.run(mlb_api.get_live_game_data(777009, sport_id=11))
+    assert second == {"source": "boxscore"}
+    assert calls == ["boxscore"]
+
+def test_preferred_endpoint_beats_faster_fallback():
+    calls = []
+    serve({"feed/live": (200, 0.05), "boxscore": (200, 0)}, calls)
+
+    data = asyncio.run(mlb_api.get_live_game_data(777008))
+
+    assert data == {"source": "feed/live"}
+    assert mlb_api.live_data_endpoints[None] == 0
+
+def test_losers_are_cancelled():
+    calls = []
+    serve({"feed/live": (200, 0), "boxscore": (200, 5)}, calls)
+
+    started = time.perf_counter()
+    data = asyncio.run(mlb_api.get_live_game_data(777008))
+
+    assert data == {"source": "feed/live"}
+    assert time.perf_counter() - started < 1
+
+def test_reprobes_when_remembered_endpoint_fails():
+    calls = []
+    serve({"live": (200, 0)}, calls)
+    mlb_api.live_data_endpoints[None] = 3
+
+    data = asyncio.run(mlb_api.get_live_game_data(777008))
+
+    assert data == {"source": "live"}
+    assert mlb_api.live_data_endpoints[None] == 1
+    assert calls[0] == "boxscore"
+
+def test_all_endpoints_failing_returns_none():
+    serve({}, [])
+
+    assert asyncio.run(mlb_api.get_live_game_data(777008)) is None
+    assert mlb_api.live_data_endpoints == {}
+
+def live_feed(timecode, outs):
+    return {
+        "metaData": {"timeStamp": timecode},
+        "gameData": {"status": {"abstractGameState": "Live"}},
+        "liveData": {"linescore": {"outs": outs}},
+    }
+
+def serve_feed(diff_status, calls):
+    """
+    Mock upstream whose diffPatch answers `diff_status` (or raises when it's None) and whose full feed works.
+    """
+    async def handler(request):
+        calls.append(request.url.path.rsplit("/", 1)[1])
+        if request.url.path.endswith("/diffPatch"):
+            if diff_status is None:
+                raise httpx.ConnectError("connection refused", request=request)
+            return httpx.Response(diff_status, json={"message": "error"})
+        return httpx.Response(200, json=live_feed("20250601_190500", 2))
+    set_http_client(create_http_client(httpx.MockTransport(handler)))
+
+@pytest.mark.parametrize("diff_status", [404, 503, None])
+def test_failed_diff_patch_refetches_full_feed(monkeypatch, diff_status):
+    monkeypatch.setattr(mlb_api, "backoff_delay", lambda attempt: 0)
+    calls = []
+    serve_feed(diff_status, calls)
+    mlb_api.live_feed_store.put(777008, live_feed("20250601_190000", 1), 100)
+
+    data = asyncio.run(mlb_api.get_live_feed_data(777008, "Live"))
+
+    assert data["liveData"]["linescore"]["outs"] == 2
+    assert calls[-1] == "live"
+    assert mlb_api.live_feed_store.get(777008).timecode == "20250601_190500"
+
+def test_diff_patch_leaves_cached_feed_untouched():
+    stored = mlb_api.live_feed_store.put(777008, live_feed("20250601_190000", 1), 100).feed
+    patch = [{"diff": [
+        {"op": "replace", "path": "/metaData/timeStamp", "value": "20250601_190500"},
+        {"op": "replace", "path": "/liveData/linescore/outs", "value": 2},
+    ]}]
+
+    patched = mlb_api.live_feed_store.apply(777008, patch, 100).feed
+
+    assert patched["liveData"]["linescore"]["outs"] == 2
+    assert stored["liveData"]["linescore"]["outs"] == 1
+    assert stored["metaData"]["timeStamp"] == "20250601_190000"
+    # Branches the patch didn't touch are shared, not copied
+    assert patched["gameData"]["status"] is stored["gameData"]["status"]
+
+def test_failed_patch_keeps_stored_feed():
+    stored = mlb_api.live_feed_store.put(777008, live_feed("20250601_190000", 1), 100).feed
+    patch = [{"diff": [
+        {"op": "replace", "path": "/liveData/linescore/outs", "value": 2},
+        {"op": "remove", "path": "/liveData/linescore/missing"},
+    ]}]
+
+    with pytest.raises(mlb_api.PatchError):
+        mlb_api.live_feed_store.apply(777008, patch, 100)
+
+    assert mlb_api.live_feed_store.get(777008).feed is stored
+    assert stored["liveData"]["linescore"]["outs"] == 1
+
+KEEP = compile_paths(LIVE_FEED_FIELDS)
+
+def full_feed():
+    return {
+        "metaData": {"timeStamp": "20250601_190000", "wait": 10},
+        "gameData": {"status": {"abstractGameState": "Live"}, "venue": {"name": "loanDepot park"}},
+        "liveData": {
+            "linescore": {"outs": 1},
+            "boxscore": {
+                "teams": {
+                    "home": {"players": {"ID1": {}}, "pitchers": [1], "coaches": ["x"]},
+                    "away": {"players": {"ID2": {}}, "pitchers": [2], "coaches": ["y"]},
+                },
+                "officials": ["z"],
+            },
+        },
+    }
+
+def test_wildcard_keeps_the_path_under_every_key():
+    pruned = extract_paths(full_feed(), KEEP)
+
+    teams = pruned["liveData"]["boxscore"]["teams"]
+    assert teams == {
+        "home": {"players": {"ID1": {}}, "pitchers": [1]},
+        "away": {"players": {"ID2": {}}, "pitchers": [2]},
+    }
+    assert "officials" not in pruned["liveData"]["boxscore"]
+    assert pruned["gameData"] == {"status": {"abstractGameState": "Live"}}
+    assert pruned["metaData"] == {"timeStamp": "20250601_190000"}
+
+@pytest.mark.parametrize("pointer, retained", [
+    ("/liveData/linescore/outs", True),
+    ("/liveData/boxscore/teams/away/pitchers/0", True),
+    # Above a retained path: the value replaces (part of) what we keep
+    ("/liveData", True),
+    ("/liveData/boxscore/teams", True),
+    ("", True),
+    ("/liveData/boxscore/officials", False),
+    ("/liveData/boxscore/teams/home/coaches", False),
+    ("/gameData/venue/name", False),
+])
+def test_pointer_retention(pointer, retained):
+    assert path_is_retained(pointer, KEEP) is retained
+
+def test_operations_outside_retained_paths_are_skipped():
+    store = LiveFeedStore(4, KEEP)
+    store.put(777008, full_feed(), 100)
+    patch = [{"diff": [
+        # Pruned from the stored feed; applied as is, it would fail
+        {"op": "replace", "path": "/gameData/venue/name", "value": "Truist Park"},
+        {"op": "replace", "path": "/liveData/linescore/outs", "value": 2},
+    ]}]
+
+    feed = store.apply(777008, patch, 100).feed
+
+    assert feed["liveData"]["linescore"]["outs"] == 2
+    assert "venue" not in feed["gameData"]
+
+def test_replaced_parent_is_pruned_again():
+    store = LiveFeedStore(4, KEEP)
+    store.put(777008, full_feed(), 100)
+    replacement = full_feed()["liveData"]
+    replacement["linescore"] = {"outs": 2}
+    patch = [{"diff": [{"op": "replace", "path": "/liveData", "value": replacement}]}]
+
+    feed = store.apply(777008, patch, 100).feed
+
+    assert feed["liveData"]["linescore"] == {"outs": 2}
+    assert "officials" not in feed["liveData"]["boxscore"]
+    assert "coaches" not in feed["liveData"]["boxscore"]["teams"]["home"]
+
+def test_pruned_patch_source_raises():
+    store = LiveFeedStore(4, KEEP)
+    stored = store.put(777008, full_feed(), 100).feed
+    patch = [{"diff": [{"op": "copy", "from": "/gameData/venue", "path": "/liveData/linescore/venue"}]}]
+
+    with pytest.raises(PatchError):
+        store.apply(777008, patch, 100)
+
+    assert store.get(777008).feed is stored
+
+def test_pruned_feed_formats_like_the_full_feed():
+    game = build_games("2025-06-01", [146], ["Live"])[0]
+    feed = build_feed(game, poll=1)
+
+    details = []
+    for live_feed_data in (feed, extract_paths(feed, KEEP)):
+        base_states.clear()
+        live_data = live_feed_data["liveData"]
+        details.append(build_in_progress_details(game, "Park", live_feed_data, live_data["boxscore"], live_data["plays"]))
+    base_states.clear()
+
+    assert details[0] == details[1]
+    assert details[0]["inning"] != "N/A"
@@ -0,0 +1,27 @@
+import logging
+import queue
+from app.utils.logging_utils import SnapshotQueueHandler, configure_logging, lazy, shutdown_logging
+
+def test_records_are_queued_unformatted_with_pinned_args():
+    log_queue = queue.SimpleQueue()
+    handler = SnapshotQueueHandler(log_queue)
+    keys = ["inning"]
+    record = logging.LogRecord("app.test", logging.DEBUG, __file__, 1, "keys %s (%s)", (keys, lazy(lambda: len(keys))), None)
+
+    handler.handle(record)
+    keys.append("outs")
+    queued = log_queue.get_nowait()
+
+    # Formatting is left to the listener thread
+    assert queued.msg == "keys %s (%s)"
+    assert queued.getMessage() == "keys ['inning'] (1)"
+    assert record.args[0] is keys
+
+def test_configured_logger_writes_from_listener(capsys):
+    configure_logging(level="DEBUG", sample_every=1)
+    try:
+        logging.getLogger("app.test").debug("polled %s games", 3)
+    finally:
+        shutdown_logging()
+
+    assert "DEBUG app.test: polled 3 games" in capsys.readouterr().err
@@ -0,0 +1,58 @@
+import re
+from app.services.metrics import Histogram, format_labels
+
+def scrape(client):
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    return response.text.splitlines()
+
+def samples(lines, prefix):
+    """
+    {labels: value} for the samples whose name and labels start with `prefix`.
+    """
+    found = {}
+    for line in lines:
+        if line.startswith(prefix):
+            labels, value = line.rsplit(" ", 1)
+            found[labels] = float(value)
+    return found
+
+def test_scrape_after_schedule(app_client):
+    assert app_client.get("/schedule?date=2025-07-20").status_code == 200
+
+    lines = scrape(app_client)
+
+    buckets = samples(lines, 'upstream_request_duration_seconds_bucket{endpoint="schedule",status="200",le=')
+    bounds = [re.search(r'le="([^"]+)"', labels).group(1) for labels in buckets]
+    counts = list(buckets.values())
+    assert bounds[-1] == "+Inf"
+    assert counts == sorted(counts) and counts[-1] >= 1
+    count = samples(lines, 'upstream_request_duration_seconds_count{endpoint="schedule",status="200"}')
+    assert list(count.values()) == [counts[-1]]
+    assert samples(lines, 'upstream_request_duration_seconds_count{endpoint="boxscore",status="200"}')
+    assert "# TYPE upstream_request_duration_seconds histogram" in lines
+
+    ratios = samples(lines, "cache_hit_ratio{")
+    assert set(ratios) >= {'cache_hit_ratio{cache="upstream_response"}', 'cache_hit_ratio{cache="rendered_schedule"}'}
+    assert all(0 <= ratio <= 1 for ratio in ratios.values())
+    assert "# TYPE cache_hit_ratio gauge" in lines
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram("demo_seconds", "Demo.", ("stage",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 5.0):
+        histogram.observe(value, "fetch")
+
+    lines = histogram.render()
+
+    assert lines[2:] == [
+        'demo_seconds_bucket{stage="fetch",le="0.1"} 1',
+        'demo_seconds_bucket{stage="fetch",le="1"} 3',
+        'demo_seconds_bucket{stage="fetch",le="+Inf"} 4',
+        'demo_seconds_sum{stage="fetch"} 6.05',
+        'demo_seconds_count{stage="fetch"} 4',
+    ]
+
+def test_label_values_are_escaped():
+    assert format_labels(("path",), ['a\\b"c"\nd']) == '{path="a\\\\b\\"c\\"\\nd"}'
+    assert format_labels((), ()) == ""
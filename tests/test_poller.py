@@ -0,0 +1,174 @@
+import asyncio
+import time
+from datetime import date
+import httpx
+from fastapi.testclient import TestClient
+import app.main
+from app.routes import schedule as schedule_routes
+from app.services import mlb_api, poller as poller_service
+from app.services.broadcast import ScheduleBroadcaster
+from app.services.http_client import create_http_client, set_http_client
+from app.services.mlb_api import response_cache
+from app.services.poller import LiveGamePoller
+from app.services.resilience import reset_circuit_breakers
+from tests.conftest import reset_caches
+from tests.fixtures.make_synthetic import build_games, mock_upstream
+
+TODAY = date.today().isoformat()
+
+def serve(games):
+    reset_caches()
+    set_http_client(create_http_client(mock_upstream([146], games)))
+
+def test_poll_builds_snapshot():
+    serve(build_games(TODAY, [146], ["Live", "Final", "Preview"]))
+    poller = LiveGamePoller(live_interval=5, idle_interval=60)
+
+    interval = asyncio.run(poller.poll_once())
+
+    snapshot = poller.get_snapshot(TODAY)
+    assert interval == 5
+    assert snapshot is not None and not snapshot.rendered.stale
+    states = sorted(game["game_state"] for game in snapshot.formatted.values() if game)
+    assert states == ["Completed", "In Progress", "Not Started"]
+    assert poller.get_snapshot("2000-01-01") is None
+    reset_caches()
+
+def test_only_due_games_are_refetched(monkeypatch):
+    games = build_games(TODAY, [146], ["Live", "Final", "Preview"])
+    serve(games)
+    fetched = []
+
+    async def fetch_game_details(due):
+        fetched.append(sorted(game["gamePk"] for game in due))
+        return await original(due)
+
+    original = poller_service.fetch_game_details
+    monkeypatch.setattr(poller_service, "fetch_game_details", fetch_game_details)
+    # Live games are due on every poll, Preview games after a minute, Final games never again
+    poller = LiveGamePoller(live_interval=0, idle_interval=60)
+    live, final, preview = (game["gamePk"] for game in games)
+
+    asyncio.run(poller.poll_once())
+    asyncio.run(poller.poll_once())
+    # A state change makes a game due straight away
+    games[2]["status"] = dict(games[0]["status"])
+    response_cache.clear()
+    asyncio.run(poller.poll_once())
+
+    assert fetched == [sorted([live, final, preview]), [live], sorted([live, preview])]
+    reset_caches()
+
+def test_stale_snapshot_served_as_stale(monkeypatch):
+    monkeypatch.setattr(app.main, "LIVE_POLLER_ENABLED", False)
+    monkeypatch.setattr(mlb_api, "backoff_delay", lambda attempt: 0)
+    monkeypatch.setattr(mlb_api, "GAME_STATE_CACHE_TTL_SECONDS", {"Final": 0.05, "Preview": 0.05, "Live": 0.05})
+    poller = LiveGamePoller(live_interval=5, idle_interval=60)
+    monkeypatch.setattr(schedule_routes, "live_poller", poller)
+    serve(build_games(TODAY, [146], ["Live", "Final", "Preview"]))
+    asyncio.run(poller.poll_once())
+    fresh = poller.snapshot
+
+    time.sleep(0.1)
+    set_http_client(create_http_client(httpx.MockTransport(lambda request: httpx.Response(503, json={}))))
+    asyncio.run(poller.poll_once())
+
+    assert poller.snapshot is not fresh and poller.snapshot.rendered.stale
+    with TestClient(app.main.app) as client:
+        response = client.get(f"/schedule?date={TODAY}")
+    assert response.status_code == 200
+    assert response.headers["Warning"] == '110 - "Response is Stale"'
+    assert response.content == fresh.rendered.body
+    reset_caches()
+
+def test_failed_details_retried_until_complete(monkeypatch):
+    monkeypatch.setattr(mlb_api, "backoff_delay", lambda attempt: 0)
+    games = build_games(TODAY, [146], ["Final"])
+    reset_caches()
+    mock = mock_upstream([146], games)
+
+    def failing(request):
+        if request.url.path.endswith("/boxscore"):
+            return httpx.Response(503, json={})
+        return mock.handle_request(request)
+
+    set_http_client(create_http_client(httpx.MockTransport(failing)))
+    # Final games are otherwise never fetched again
+    poller = LiveGamePoller(live_interval=0, idle_interval=0)
+    asyncio.run(poller.poll_once())
+    incomplete = poller.snapshot
+
+    reset_circuit_breakers()
+    set_http_client(create_http_client(mock))
+    asyncio.run(poller.poll_once())
+
+    assert incomplete.rendered.incomplete
+    assert incomplete.rendered.headers["Cache-Control"] == "no-cache"
+    assert not poller.snapshot.rendered.incomplete
+    details = [game["details"] for game in poller.snapshot.formatted.values() if game]
+    assert details[0]["winning_pitcher"] != "N/A"
+    reset_caches()
+
+def test_broadcast_fans_out_and_drops_slow_subscribers():
+    async def scenario():
+        broadcaster = ScheduleBroadcaster(queue_size=1)
+        fast, slow = broadcaster.subscribe(), broadcaster.subscribe()
+        broadcaster.publish({"event": "delta", "data": 1})
+        first = fast.queue.get_nowait()
+        broadcaster.publish({"event": "delta", "data": 2})
+        return broadcaster, fast, slow, first
+
+    broadcaster, fast, slow, first = asyncio.run(scenario())
+
+    assert first == {"event": "delta", "data": 1}
+    assert fast.queue.get_nowait() == {"event": "delta", "data": 2}
+    # The slow subscriber only gets the close marker
+    assert slow.closed and slow.queue.get_nowait() is None
+    assert broadcaster.dropped == 1
+    assert broadcaster.subscriber_count() == 1
+
+class DisconnectingRequest:
+    """
+    Stands in for the Starlette request: connected for `checks` disconnect checks, then gone.
+    """
+
+    def __init__(self, checks: int):
+        self.checks = checks
+
+    async def is_disconnected(self) -> bool:
+        self.checks -= 1
+        return self.checks < 0
+
+def stream_events(monkeypatch, poller, request, publish=()):
+    monkeypatch.setattr(schedule_routes, "live_poller", poller)
+    monkeypatch.setattr(schedule_routes, "STREAM_HEARTBEAT_SECONDS", 0.01)
+
+    async def scenario():
+        response = await schedule_routes.stream_schedule(request)
+        for event in publish:
+            poller.broadcaster.publish(event)
+        return [chunk async for chunk in response.body_iterator]
+
+    return asyncio.run(scenario())
+
+def test_stream_sends_events_and_heartbeats_until_disconnect(monkeypatch):
+    poller = LiveGamePoller()
+    delta = {"event": "delta", "data": {"team_id": 564, "changes": {"outs": "2"}}}
+
+    chunks = stream_events(monkeypatch, poller, DisconnectingRequest(checks=1), [delta])
+
+    assert chunks == [
+        'event: delta\ndata: {"team_id":564,"changes":{"outs":"2"}}\n\n',
+        ": keep-alive\n\n",
+    ]
+    assert poller.broadcaster.subscriber_count() == 0
+
+def test_stream_ends_on_overflow(monkeypatch):
+    poller = LiveGamePoller()
+    poller.broadcaster.queue_size = 1
+    events = [{"event": "delta", "data": {"team_id": 564, "changes": {}}}] * 2
+
+    chunks = stream_events(monkeypatch, poller, DisconnectingRequest(checks=10), events)
+
+    assert chunks == ["event: overflow\ndata: {}\n\n"]
+    assert poller.broadcaster.subscriber_count() == 0
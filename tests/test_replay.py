@@ -0,0 +1,34 @@
+import tracemalloc
+
+def test_schedule_replays_offline(replay_client, replay, scenario, baselines):
+    response = replay_client.get(scenario["path"])
+
+    assert response.status_code == 200
+    assert replay.misses == []
+    body = response.json()
+    schedules = body.values() if len(scenario["orgs"]) > 1 else [body]
+    games = [game for schedule in schedules for game in schedule.values() if game]
+    assert len(games) == len(scenario["games"])
+    # Upstream amplification: requests per cold /schedule call
+    baselines.check(scenario["name"], "upstream_requests", len(replay.requests), 0)
+
+def test_schedule_served_from_cache(replay_client, replay, scenario):
+    replay_client.get(scenario["path"])
+    replay.reset()
+
+    response = replay_client.get(scenario["path"])
+
+    assert response.status_code == 200
+    assert replay.requests == []
+
+def test_formatter_allocations(format_fetched, scenario, baselines):
+    # Warm up once so lazily built indexes count as steady state, not per-request cost
+    format_fetched()
+    tracemalloc.start()
+    try:
+        format_fetched()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    baselines.check(scenario["name"], "format_peak_bytes", peak, 0.25)
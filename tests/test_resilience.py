@@ -0,0 +1,181 @@
+import asyncio
+import os
+import time
+import httpx
+import pytest
+from app.services import mlb_api, schedule_cache
+from app.services.http_client import create_http_client, set_http_client
+from tools.replay import ReplayTransport, load_fixture
+from app.services.resilience import CircuitBreaker, CircuitOpenError, DeadlineExceeded, request_scope
+from tests.conftest import FIXTURE_DIR, reset_caches
+
+def failing_transport(calls):
+    def handler(request):
+        calls.append(str(request.url))
+        return httpx.Response(503, json={"message": "Service Unavailable"})
+    return httpx.MockTransport(handler)
+
+@pytest.fixture
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(mlb_api, "backoff_delay", lambda attempt: 0)
+
+def test_breaker_opens_then_lets_one_trial_through():
+    breaker = CircuitBreaker("schedule", failure_threshold=2, reset_timeout=0.05)
+    breaker.record_failure()
+    breaker.before_call()
+    breaker.record_failure()
+
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    time.sleep(0.06)
+    breaker.before_call()
+    # Only one trial while half-open
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+def test_fetch_upstream_retries_5xx(no_backoff):
+    reset_caches()
+    statuses = [503, 502, 200]
+
+    def handler(request):
+        return httpx.Response(statuses.pop(0), json={})
+
+    set_http_client(create_http_client(httpx.MockTransport(handler)))
+    response = asyncio.run(mlb_api.fetch_upstream("schedule", "https://statsapi.mlb.com/api/v1/schedule"))
+
+    assert response.status_code == 200
+    assert statuses == []
+
+def test_fetch_upstream_respects_deadline():
+    reset_caches()
+    calls = []
+    set_http_client(create_http_client(failing_transport(calls)))
+
+    async def call():
+        with request_scope(0):
+            await mlb_api.fetch_upstream("schedule", "https://statsapi.mlb.com/api/v1/schedule")
+
+    with pytest.raises(DeadlineExceeded):
+        asyncio.run(call())
+    assert calls == []
+
+def test_open_circuit_skips_upstream(no_backoff):
+    reset_caches()
+    calls = []
+    set_http_client(create_http_client(failing_transport(calls)))
+
+    for _ in range(3):
+        asyncio.run(mlb_api.get_game_boxscore(1, "Final"))
+    made = len(calls)
+    asyncio.run(mlb_api.get_game_boxscore(1, "Final"))
+
+    # Five consecutive failures open the circuit; later calls fail fast
+    assert made >= 5
+    assert len(calls) == made
+
+def slow_transport(delay):
+    async def handler(request):
+        await asyncio.sleep(delay)
+        return httpx.Response(200, json={})
+    return httpx.MockTransport(handler)
+
+def half_open_breaker(endpoint):
+    breaker = mlb_api.circuit_breaker(endpoint)
+    breaker.failure_threshold = 1
+    breaker.reset_timeout = 0
+    breaker.record_failure()
+    return breaker
+
+def timing_out_transport(calls):
+    def handler(request):
+        calls.append(str(request.url))
+        raise httpx.ReadTimeout("timed out", request=request)
+    return httpx.MockTransport(handler)
+
+def test_deadline_timeout_isnt_a_circuit_failure():
+    reset_caches()
+    calls = []
+    set_http_client(create_http_client(timing_out_transport(calls)))
+
+    async def call():
+        # Far less than HTTP_TIMEOUT_SECONDS, so the timeout was the deadline's
+        with request_scope(1):
+            await mlb_api.fetch_upstream("schedule", "https://statsapi.mlb.com/api/v1/schedule")
+
+    with pytest.raises(DeadlineExceeded):
+        asyncio.run(call())
+    breaker = mlb_api.circuit_breaker("schedule")
+    assert len(calls) == 1
+    assert breaker.failures == 0
+
+def test_full_timeout_is_a_circuit_failure(no_backoff):
+    reset_caches()
+    calls = []
+    set_http_client(create_http_client(timing_out_transport(calls)))
+
+    with pytest.raises(httpx.ReadTimeout):
+        asyncio.run(mlb_api.fetch_upstream("schedule", "https://statsapi.mlb.com/api/v1/schedule"))
+    assert mlb_api.circuit_breaker("schedule").failures == len(calls) == 3
+
+def test_expired_deadline_leaves_half_open_trial():
+    reset_caches()
+    breaker = half_open_breaker("schedule")
+
+    async def call():
+        with request_scope(0):
+            await mlb_api.fetch_upstream("schedule", "https://statsapi.mlb.com/api/v1/schedule")
+
+    with pytest.raises(DeadlineExceeded):
+        asyncio.run(call())
+    # The trial slot is still free
+    breaker.before_call()
+
+def test_cancelled_trial_is_released():
+    reset_caches()
+    breaker = half_open_breaker("schedule")
+    set_http_client(create_http_client(slow_transport(1)))
+
+    async def call():
+        task = asyncio.create_task(mlb_api.fetch_upstream("schedule", "https://statsapi.mlb.com/api/v1/schedule"))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(call())
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    breaker.before_call()
+
+MIXED = load_fixture(os.path.join(FIXTURE_DIR, "mixed.json.xz"))
+
+@pytest.fixture
+def short_ttls(monkeypatch):
+    # Expire everything almost immediately so the next request has to go upstream
+    short = {"Final": 0.05, "Preview": 0.05, "Live": 0.05}
+    monkeypatch.setattr(mlb_api, "GAME_STATE_CACHE_TTL_SECONDS", short)
+    monkeypatch.setattr(schedule_cache, "GAME_STATE_CACHE_TTL_SECONDS", short)
+
+@pytest.mark.parametrize("upstream_transport", [ReplayTransport(MIXED)], indirect=True)
+def test_schedule_served_stale_while_upstream_fails(app_client, short_ttls):
+    fresh = app_client.get(MIXED["path"])
+    assert fresh.status_code == 200
+    assert "Warning" not in fresh.headers
+
+    time.sleep(0.1)
+    set_http_client(create_http_client(failing_transport([])))
+    stale = app_client.get(MIXED["path"])
+
+    assert stale.status_code == 200
+    assert stale.headers["Warning"] == '110 - "Response is Stale"'
+    assert stale.json() == fresh.json()
+
+@pytest.mark.parametrize("upstream_transport", [ReplayTransport(MIXED)], indirect=True)
+def test_schedule_unavailable_without_stale_data(app_client):
+    set_http_client(create_http_client(failing_transport([])))
+
+    response = app_client.get(MIXED["path"])
+
+    assert response.status_code == 503
@@ -1 +1,211 @@
- 
\ No newline at end of file
+import asyncio
+import time
+import httpx
+import pytest
+from app.config import AFFILIATES_CACHE_TTL_SECONDS
+from app.services import cache, mlb_api, schedule_cache
+from app.services.mlb_api import affiliates_cache, get_affiliates_for_orgs
+from app.services.schedule_cache import etag_matches
+from app.services.resilience import reset_circuit_breakers
+from app.services.http_client import create_http_client, set_http_client
+from tests.conftest import SYNTHETIC_GAMES, Clock, reset_caches
+from tests.fixtures.make_synthetic import ORGS, build_games, mock_upstream
+
+def upstream(fail=lambda request: False, orgs=(146,), games=SYNTHETIC_GAMES):
+    """
+    The synthetic upstream, answering 503 to every request `fail` picks.
+    Returns the list the requested URLs are appended to.
+    """
+    mock = mock_upstream(list(orgs), games)
+    calls = []
+
+    async def handler(request):
+        calls.append(str(request.url))
+        if fail(request):
+            return httpx.Response(503, json={"message": "Service Unavailable"})
+        return await mock.handle_async_request(request)
+
+    set_http_client(create_http_client(httpx.MockTransport(handler)))
+    return calls
+
+def test_matching_etag_answered_without_upstream_calls(app_client):
+    first = app_client.get("/schedule?date=2025-07-20")
+    calls = upstream()
+
+    response = app_client.get("/schedule?date=2025-07-20", headers={"If-None-Match": first.headers["ETag"]})
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["ETag"] == first.headers["ETag"]
+    assert response.headers["Cache-Control"] == first.headers["Cache-Control"]
+    assert calls == []
+
+def test_changed_etag_gets_the_body(app_client):
+    first = app_client.get("/schedule?date=2025-07-20")
+
+    response = app_client.get("/schedule?date=2025-07-20", headers={"If-None-Match": '"0000"'})
+
+    assert response.status_code == 200
+    assert response.content == first.content
+
+def test_etag_matching():
+    etag = '"abc123"'
+
+    assert etag_matches('"abc123"', etag)
+    assert etag_matches('W/"abc123"', etag)
+    assert etag_matches('"other", W/"abc123"', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('"abc"', etag)
+    assert not etag_matches(None, etag)
+    assert not etag_matches("", etag)
+
+@pytest.mark.parametrize("upstream_transport, cache_control", [
+    (mock_upstream([146], build_games("2025-07-20", [146], ["Final"] * 4)), "public, max-age=86400"),
+    (mock_upstream([146], build_games("2025-07-20", [146], ["Final"] * 2 + ["Preview"] * 2)), "public, max-age=60"),
+    (mock_upstream([146], build_games("2025-07-20", [146], ["Final", "Preview", "Live"])), "public, max-age=5"),
+], indirect=["upstream_transport"])
+def test_cache_control_follows_most_volatile_game(app_client, cache_control):
+    response = app_client.get("/schedule?date=2025-07-20")
+
+    assert response.status_code == 200
+    assert response.headers["Cache-Control"] == cache_control
+    assert "Warning" not in response.headers
+
+def test_range_streams_every_day(app_client):
+    response = app_client.get("/schedule/range?start=2025-07-19&end=2025-07-21")
+
+    assert response.status_code == 200
+    body = response.json()
+    assert list(body) == ["2025-07-19", "2025-07-20", "2025-07-21"]
+    assert len(body["2025-07-20"]) == 6
+    assert "Warning" not in response.headers
+
+def test_range_unavailable_before_streaming(app_client):
+    upstream(fail=lambda request: True)
+
+    response = app_client.get("/schedule/range?start=2025-07-19&end=2025-07-21")
+
+    assert response.status_code == 503
+
+def test_range_ends_with_error_when_a_later_window_fails(app_client):
+    upstream(fail=lambda request: "startDate=2025-08-01" in str(request.url))
+
+    # Windows of 2025-07-01..07-31 and 2025-08-01..08-02
+    response = app_client.get("/schedule/range?start=2025-07-01&end=2025-08-02")
+
+    assert response.status_code == 200
+    body = response.json()
+    assert len(body) == 32
+    assert list(body)[-2:] == ["2025-07-31", "error"]
+    assert body["error"]["missing_from"] == "2025-08-01"
+
+def test_range_served_stale_while_upstream_fails(app_client, monkeypatch):
+    short = {"Final": 0.05, "Preview": 0.05, "Live": 0.05}
+    monkeypatch.setattr(mlb_api, "GAME_STATE_CACHE_TTL_SECONDS", short)
+    monkeypatch.setattr(schedule_cache, "GAME_STATE_CACHE_TTL_SECONDS", short)
+    fresh = app_client.get("/schedule/range?start=2025-07-19&end=2025-07-21").json()
+
+    time.sleep(0.1)
+    upstream(fail=lambda request: True)
+    response = app_client.get("/schedule/range?start=2025-07-19&end=2025-07-21")
+
+    assert response.status_code == 200
+    assert response.headers["Warning"] == '110 - "Response is Stale"'
+    body = response.json()
+    assert body.pop("stale") == ["2025-07-19", "2025-07-20", "2025-07-21"]
+    assert body == fresh
+
+def test_failed_details_are_not_cached(app_client):
+    final_games = build_games("2025-07-20", [146], ["Final"] * 4)
+    calls = upstream(fail=lambda request: request.url.path.endswith("/boxscore"), games=final_games)
+
+    degraded = app_client.get("/schedule?date=2025-07-20")
+    # The boxscore circuit opened; let its reset timeout pass
+    reset_circuit_breakers()
+    upstream(games=final_games)
+    recovered = app_client.get("/schedule?date=2025-07-20")
+
+    assert degraded.status_code == 200
+    assert degraded.headers["Cache-Control"] == "no-cache"
+    assert degraded.headers["Warning"] == '199 - "Incomplete game details"'
+    assert {game["details"]["winning_pitcher"] for game in degraded.json().values() if game} == {"N/A"}
+    assert any(url.endswith("/boxscore") for url in calls)
+    # Nothing was kept from the failed render: the boxscores are fetched again
+    assert "Warning" not in recovered.headers
+    assert recovered.headers["Cache-Control"] == "public, max-age=86400"
+    assert "N/A" not in {game["details"]["winning_pitcher"] for game in recovered.json().values() if game}
+
+def affiliate_requests(calls):
+    return [url.split("teamIds=")[1] for url in calls if "/teams/affiliates" in url]
+
+def test_missing_orgs_fetched_in_one_request():
+    reset_caches()
+    calls = upstream(orgs=(146, 147))
+
+    by_org = asyncio.run(get_affiliates_for_orgs([147, 146], 2025))
+
+    assert affiliate_requests(calls) == ["146,147&year=2025"]
+    # Split by parentOrgId; each MLB club is its own org
+    assert list(by_org) == [147, 146]
+    assert [team["id"] for team in by_org[146]] == [team[0] for team in ORGS[146]]
+    assert [team["id"] for team in by_org[147]] == [team[0] for team in ORGS[147]]
+    reset_caches()
+
+def test_only_uncached_orgs_are_requested():
+    reset_caches()
+    calls = upstream(orgs=(146, 147))
+    asyncio.run(get_affiliates_for_orgs([146], 2025))
+
+    by_org = asyncio.run(get_affiliates_for_orgs([146, 147], 2025))
+
+    assert affiliate_requests(calls) == ["146&year=2025", "147&year=2025"]
+    assert len(by_org[146]) == len(ORGS[146]) and len(by_org[147]) == len(ORGS[147])
+    reset_caches()
+
+def test_unknown_org_cached_as_empty_for_a_day(monkeypatch):
+    reset_caches()
+    clock = Clock()
+    monkeypatch.setattr(cache, "time", clock)
+    calls = upstream(orgs=(146,))
+
+    first = asyncio.run(get_affiliates_for_orgs([999], 2025))
+    clock.offset = AFFILIATES_CACHE_TTL_SECONDS - 60
+    cached = affiliates_cache.peek((999, 2025))
+    clock.offset = AFFILIATES_CACHE_TTL_SECONDS + 60
+    expired = affiliates_cache.peek((999, 2025))
+    asyncio.run(get_affiliates_for_orgs([999], 2025))
+
+    assert first == {999: []}
+    assert AFFILIATES_CACHE_TTL_SECONDS == 24 * 60 * 60
+    assert cached == [] and expired is None
+    assert len(affiliate_requests(calls)) == 2
+    reset_caches()
+
+def test_org_parameter_validation(app_client):
+    assert app_client.get("/schedule?date=2025-07-20&org=abc").status_code == 400
+    assert app_client.get("/schedule?date=2025-07-20&org=,").status_code == 400
+
+def test_unknown_org_not_found(app_client):
+    response = app_client.get("/schedule?date=2025-07-20&org=999")
+
+    assert response.status_code == 404
+    assert response.json() == {"detail": "No affiliates found."}
+
+def test_repeated_org_gives_single_org_shape(app_client):
+    response = app_client.get("/schedule?date=2025-07-20&org=146,146")
+
+    assert response.status_code == 200
+    assert set(response.json()) == {str(team[0]) for team in ORGS[146]}
+
+def test_multi_org_schedule(app_client):
+    games = build_games("2025-07-20", [146, 147], ["Final"] * 6 + ["Preview"] * 5)
+    upstream(orgs=(146, 147), games=games)
+
+    response = app_client.get("/schedule?date=2025-07-20&org=147,146")
+
+    assert response.status_code == 200
+    body = response.json()
+    assert list(body) == ["147", "146"]
+    assert set(body["147"]) == {str(team[0]) for team in ORGS[147]}
+    assert body["146"]["564"]["game_state"] == "Completed"
+    assert body["147"]["531"]["game_state"] == "Not Started"
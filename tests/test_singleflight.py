@@ -0,0 +1,98 @@
+import asyncio
+import pytest
+from app.services.singleflight import SingleFlight
+
+def counted_work(calls, started, release):
+    async def work():
+        calls.append(1)
+        started.set()
+        await release.wait()
+        return "result"
+    return work
+
+def test_waiters_share_one_call():
+    async def scenario():
+        flight, calls = SingleFlight(), []
+        started, release = asyncio.Event(), asyncio.Event()
+        work = counted_work(calls, started, release)
+        waiters = [asyncio.create_task(flight.do("key", work)) for _ in range(2)]
+        await started.wait()
+        assert flight.in_flight() == 1
+        release.set()
+        return await asyncio.gather(*waiters), calls, flight
+
+    results, calls, flight = asyncio.run(scenario())
+
+    assert results == ["result", "result"]
+    assert calls == [1]
+    assert flight.in_flight() == 0
+
+def test_cancelling_one_waiter_keeps_the_call_running():
+    async def scenario():
+        flight, calls = SingleFlight(), []
+        started, release = asyncio.Event(), asyncio.Event()
+        work = counted_work(calls, started, release)
+        first = asyncio.create_task(flight.do("key", work))
+        second = asyncio.create_task(flight.do("key", work))
+        await started.wait()
+        first.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second, calls
+
+    result, calls = asyncio.run(scenario())
+
+    assert result == "result"
+    assert calls == [1]
+
+def test_cancelling_every_waiter_cancels_the_call():
+    async def scenario():
+        flight = SingleFlight()
+        started, cancelled = asyncio.Event(), asyncio.Event()
+
+        async def work():
+            started.set()
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        waiters = [asyncio.create_task(flight.do("key", work)) for _ in range(2)]
+        await started.wait()
+        for waiter in waiters:
+            waiter.cancel()
+        await asyncio.gather(*waiters, return_exceptions=True)
+        await asyncio.wait_for(cancelled.wait(), 1)
+        await asyncio.sleep(0)
+        return flight
+
+    flight = asyncio.run(scenario())
+
+    assert flight.in_flight() == 0
+
+def test_errors_reach_every_waiter():
+    async def scenario():
+        flight, started = SingleFlight(), asyncio.Event()
+
+        async def work():
+            started.set()
+            await asyncio.sleep(0.01)
+            raise ValueError("upstream broke")
+
+        waiters = [asyncio.create_task(flight.do("key", work)) for _ in range(3)]
+        results = await asyncio.gather(*waiters, return_exceptions=True)
+        # The failure isn't cached: the next call runs the work again
+        started.clear()
+        retried = asyncio.create_task(flight.do("key", work))
+        await started.wait()
+        retried.cancel()
+        await asyncio.gather(retried, return_exceptions=True)
+        return results
+
+    results = asyncio.run(scenario())
+
+    assert len(results) == 3
+    assert all(isinstance(result, ValueError) for result in results)
@@ -0,0 +1,143 @@
+import asyncio
+import json
+from datetime import date
+import numpy as np
+import pytest
+from backfill_season import backfill_season
+from app.services import standings as standings_service
+from app.services.archive import load_archive
+from app.services.http_client import create_http_client, set_http_client
+from tools.replay import RecordingTransport
+from app.services.standings import RESULT_COLUMNS, SeasonStandings, compute_standings
+from tests.conftest import reset_caches
+from tests.fixtures.make_synthetic import build_games, mock_upstream
+
+def results(rows):
+    columns = list(zip(*rows))
+    return {name: np.array(values, dtype=dtype) for (name, dtype), values in zip(RESULT_COLUMNS.items(), columns)}
+
+def league_results(orgs=30, levels=5, games=140, seed=0):
+    """
+    A full season for every affiliate of `orgs` clubs: one row per team and game.
+    """
+    rng = np.random.default_rng(seed)
+    teams = orgs * levels
+    size = teams * games
+    columns = {
+        "team_id": np.repeat(np.arange(teams, dtype=np.int32), games),
+        "game_pk": np.arange(size, dtype=np.int64),
+        "date": np.tile(np.datetime64("2025-04-01") + np.arange(games), teams),
+        "is_home": rng.random(size) < 0.5,
+        "runs_for": rng.integers(0, 12, size, dtype=np.int32),
+        "runs_against": rng.integers(0, 12, size, dtype=np.int32),
+    }
+    level_names = ["MLB", "AAA", "AA", "A+", "A"]
+    team_info = {team: {"team_name": f"Team {team}", "level": level_names[team % levels], "org_id": team // levels} for team in range(teams)}
+    return columns, team_info
+
+def test_compute_standings():
+    # Listed out of date order; the streak and last 10 follow the dates
+    computed = compute_standings(results([
+        (1, 105, "2025-07-05", True, 3, 1),
+        (1, 101, "2025-07-01", True, 5, 2),
+        (1, 102, "2025-07-02", False, 1, 4),
+        (1, 103, "2025-07-03", False, 2, 2),
+        (1, 104, "2025-07-04", True, 6, 0),
+        (2, 101, "2025-07-01", False, 2, 5),
+    ]), {
+        1: {"team_name": "Jacksonville Jumbo Shrimp", "level": "AAA", "org_id": 146},
+        2: {"team_name": "Norfolk Tides", "level": "AAA", "org_id": 110},
+    })
+
+    team = computed["teams"]["1"]
+    assert (team["wins"], team["losses"], team["games"]) == (3, 1, 4)
+    assert team["run_differential"] == 17 - 9
+    assert team["home"] == {"wins": 3, "losses": 0}
+    assert team["away"] == {"wins": 0, "losses": 1}
+    assert team["streak"] == "W2"
+    assert team["last_10"] == {"wins": 3, "losses": 1}
+    assert computed["teams"]["2"]["streak"] == "L1"
+    assert computed["levels"]["AAA"] == {"wins": 3, "losses": 2, "win_pct": 0.6, "run_differential": 5}
+    assert computed["orgs"]["110"]["losses"] == 1
+
+def test_compute_matches_python_loop():
+    columns, team_info = league_results(orgs=2, games=30)
+    computed = compute_standings(columns, team_info)
+
+    for team in (0, 7):
+        mask = columns["team_id"] == team
+        runs_for, runs_against = columns["runs_for"][mask], columns["runs_against"][mask]
+        outcomes = [("W" if a > b else "L") for a, b in zip(runs_for, runs_against) if a != b]
+        streak = len(outcomes) - len("".join(outcomes).rstrip(outcomes[-1]))
+        row = computed["teams"][str(team)]
+        assert row["wins"] == outcomes.count("W")
+        assert row["last_10"]["wins"] == outcomes[-10:].count("W")
+        assert row["streak"] == f"{outcomes[-1]}{streak}"
+
+def test_empty_season():
+    computed = compute_standings({name: np.empty(0, dtype=dtype) for name, dtype in RESULT_COLUMNS.items()}, {})
+
+    assert computed == {"teams": {}, "levels": {}, "orgs": {}}
+
+def test_refresh_skips_closed_windows(monkeypatch):
+    reset_caches()
+    set_http_client(create_http_client(mock_upstream([146], build_games("2025-07-20", [146], ["Final"] * 6))))
+    windows = []
+
+    async def get_schedule_for_teams(team_ids, sport_ids, start_date=None, end_date=None):
+        windows.append(start_date)
+        return await original(team_ids, sport_ids, start_date=start_date, end_date=end_date)
+
+    original = standings_service.get_schedule_for_teams
+    monkeypatch.setattr(standings_service, "get_schedule_for_teams", get_schedule_for_teams)
+    standings = SeasonStandings(2025, (146,))
+
+    asyncio.run(standings.refresh(date(2025, 7, 21)))
+    first = standings.render()
+    fetched = len(windows)
+    asyncio.run(standings.refresh(date(2025, 7, 21)))
+
+    # Only the window still containing today is read again, and nothing new was added
+    assert windows[fetched:] == [windows[fetched - 1]]
+    assert standings.render() is first
+    assert len(standings.results["game_pk"]) == 6
+    reset_caches()
+
+@pytest.mark.parametrize("upstream_transport", [mock_upstream([146], build_games("2025-07-20", [146], ["Final"] * 6))], indirect=True)
+def test_standings_endpoint(app_client):
+    response = app_client.get("/standings?season=2025")
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["games"] == 6
+    assert len(body["teams"]) == 6
+    assert sum(team["wins"] for team in body["teams"].values()) == 6
+
+def test_past_season_read_from_archive(tmp_path, monkeypatch):
+    games = build_games("2025-07-20", [146], ["Final"] * 6)
+    reset_caches()
+    asyncio.run(backfill_season(2025, [146], str(tmp_path / "2025.npz"), rate=0, transport=mock_upstream([146], games)))
+    monkeypatch.setattr(standings_service, "ARCHIVE_DIR", str(tmp_path / "missing"))
+    expected = SeasonStandings(2025, (146,))
+    set_http_client(create_http_client(mock_upstream([146], games)))
+    asyncio.run(expected.refresh(date(2026, 3, 1)))
+
+    monkeypatch.setattr(standings_service, "ARCHIVE_DIR", str(tmp_path))
+    recorder = RecordingTransport(mock_upstream([146], games))
+    set_http_client(create_http_client(recorder))
+    standings = SeasonStandings(2025, (146,))
+    asyncio.run(standings.refresh(date(2026, 3, 1)))
+    asyncio.run(standings.refresh(date(2026, 3, 1)))
+
+    assert standings.archived
+    assert recorder.exchanges == []
+    assert json.loads(standings.render()) == json.loads(expected.render())
+    # Orgs the archive doesn't cover still come from the schedule
+    assert not SeasonStandings(2025, (146, 147)).load_archive(load_archive(str(tmp_path / "2025.npz")))
+    reset_caches()
+
+@pytest.mark.parametrize("season", ["-1", "0", "1875", "10000", "abc"])
+def test_standings_rejects_invalid_seasons(app_client, season):
+    response = app_client.get(f"/standings?season={season}")
+
+    assert response.status_code == 422
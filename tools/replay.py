@@ -0,0 +1,107 @@
+import hashlib
+import json
+import lzma
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+import httpx
+
+# Headers that no longer describe a body once httpx has decoded it
+_DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """
+    Wraps a real transport and keeps every exchange (URL, status, decoded body)
+    so a session can be saved as a fixture and replayed without the network.
+    """
+
+    def __init__(self, inner: Optional[httpx.AsyncBaseTransport] = None):
+        self.inner = inner or httpx.AsyncHTTPTransport()
+        self.exchanges: List[Dict[str, Any]] = []
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        response = await self.inner.handle_async_request(request)
+        # Read through an httpx.Response so gzip/brotli bodies are stored decoded
+        received = httpx.Response(response.status_code, headers=response.headers, stream=response.stream, request=request)
+        body = await received.aread()
+        await received.aclose()
+        self.exchanges.append({
+            "method": request.method,
+            "url": str(request.url),
+            "status": response.status_code,
+            "content_type": response.headers.get("content-type", "application/json"),
+            "body": body,
+        })
+        headers = [(name, value) for name, value in response.headers.items() if name.lower() not in _DROPPED_HEADERS]
+        return httpx.Response(response.status_code, headers=headers, content=body, request=request)
+
+    async def aclose(self) -> None:
+        await self.inner.aclose()
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """
+    Serves recorded exchanges by URL. A URL recorded several times (a live feed polled
+    during the session) is replayed in order and then repeats its last response.
+    Unrecorded URLs get a 404 and are listed in `misses`.
+    """
+
+    def __init__(self, fixture: Dict[str, Any]):
+        self.fixture = fixture
+        self._responses: Dict[Tuple[str, str], List[Tuple[int, str, bytes]]] = {}
+        for exchange in fixture["exchanges"]:
+            body = fixture["bodies"][exchange["body"]].encode("utf-8")
+            key = (exchange["method"], exchange["url"])
+            self._responses.setdefault(key, []).append((exchange["status"], exchange["content_type"], body))
+        self._served: Dict[Tuple[str, str], int] = {}
+        self.requests: List[str] = []
+        self.misses: List[str] = []
+
+    def reset(self) -> None:
+        """
+        Forget which responses were served, so the session replays from the start.
+        """
+        self._served.clear()
+        self.requests.clear()
+        self.misses.clear()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        url = str(request.url)
+        self.requests.append(url)
+        responses = self._responses.get((request.method, url))
+        if not responses:
+            self.misses.append(url)
+            return httpx.Response(404, json={"message": "Not recorded"}, request=request)
+
+        served = self._served.get((request.method, url), 0)
+        self._served[(request.method, url)] = served + 1
+        status, content_type, body = responses[min(served, len(responses) - 1)]
+        return httpx.Response(status, headers={"content-type": content_type}, content=body, request=request)
+
+def build_fixture(exchanges: List[Dict[str, Any]], **meta: Any) -> Dict[str, Any]:
+    """
+    Build a fixture document; identical bodies (e.g. one boxscore served twice) are stored once.
+    """
+    bodies: Dict[str, str] = {}
+    recorded = []
+    for exchange in exchanges:
+        text = exchange["body"].decode("utf-8")
+        digest = hashlib.sha256(exchange["body"]).hexdigest()[:16]
+        bodies[digest] = text
+        recorded.append({**exchange, "body": digest})
+    return {
+        **meta,
+        "recorded_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "exchanges": recorded,
+        "bodies": bodies,
+    }
+
+def save_fixture(path: str, fixture: Dict[str, Any]) -> None:
+    """
+    Write a fixture as xz-compressed JSON; its large window folds the boxscore that
+    every feed embeds down to almost nothing.
+    """
+    with lzma.open(path, "wt", encoding="utf-8") as f:
+        json.dump(fixture, f, separators=(",", ":"))
+
+def load_fixture(path: str) -> Dict[str, Any]:
+    with lzma.open(path, "rt", encoding="utf-8") as f:
+        return json.load(f)